@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the desktop pet's tick, render and input paths.
+Reports ns/op and memory per op, and compares against a stored baseline
+so regressions are flagged.
+
+    python3 benchmark_pet.py                 # Headless core (+ Tk if a display is available)
+    python3 benchmark_pet.py --xvfb          # Start a virtual X display for the Tk benchmarks
+    python3 benchmark_pet.py --save          # Store these results as the new baseline
+    python3 benchmark_pet.py --check         # Exit non-zero if anything regressed
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pet_core import PetSimulation, DESKTOP_PROFILE, TICK_SECONDS, FRAME_SECONDS
+from pet_flock import make_flock, np
+from pet_headless import HeadlessPets
+from pet_renderers import NullRenderer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Slower than baseline by more than this factor counts as a regression
+REGRESSION_FACTOR = 2.0
+
+# Timing takes the best of several runs to filter out scheduler noise
+REPEATS = 5
+
+# Slow benchmarks run this many times fewer iterations, by name prefix
+ITERATION_DIVISORS = {'tk.': 10, 'flock.': 1000}
+
+
+class FakeEvent:
+    """Just enough of a Tk event for the mouse handlers"""
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+class Discard:
+    """Stand-in for stdout that throws text away"""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def measure(func, iterations):
+    """Time func and sample its memory use, returning (ns/op, bytes/op, blocks/op)"""
+    # Warm up caches and lazy state first
+    for _ in range(min(iterations, 1000)):
+        func()
+
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    ns_per_op = best / iterations
+
+    # Memory is measured in a separate, shorter pass since tracing slows everything down
+    samples = max(1, min(iterations, 2000))
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    peak = 0
+    for _ in range(samples):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peak += tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'filename')
+                   if stat.count_diff > 0)
+    return ns_per_op, peak / samples, retained / samples
+
+
+def headless_benchmarks():
+    """Benchmarks on the pure simulation, no display needed"""
+    rng = random.Random(1)
+    sim = PetSimulation(500, 400, 16, DESKTOP_PROFILE, rng)
+    sim.set_cursor(300, 250)
+
+    walker = PetSimulation(500, 400, 16, DESKTOP_PROFILE, rng)
+
+    def update_position():
+        # Keep the pet walking back and forth so every call does real work
+        if walker.state != "walking":
+            walker.set_target(450 if walker.x < 250 else 50, 200)
+        walker.update_position(TICK_SECONDS)
+
+    dragger = PetSimulation(500, 400, 16, DESKTOP_PROFILE, rng)
+    dragger.is_dragging = True
+    drag_steps = [(3, 1), (-3, -1)]
+    drag_index = [0]
+
+    def drag_by():
+        drag_index[0] ^= 1
+        dragger.drag_by(*drag_steps[drag_index[0]])
+
+    benchmarks = {
+        'update_behavior': lambda: sim.step(TICK_SECONDS),
+        'follow_cursor': sim.follow_cursor,
+        'update_position': update_position,
+        'decide': sim.decide,
+        'drag_pet': drag_by,
+        'render_position': lambda: sim.render_position(0.05),
+    }
+
+    # One full frame of logic and animation for a small colony, with rendering switched off
+    colony = HeadlessPets(NullRenderer(), 500, 400, pet_count=5, seed=1)
+    benchmarks['null_render.frame[5]'] = lambda: colony.advance(FRAME_SECONDS)
+
+    # Whole-population steering, vectorized when NumPy is available
+    flock = make_flock(1000, 1600, 1000, seed=1)
+    engine = 'numpy' if np is not None else 'python'
+    benchmarks[f'flock.step[1000,{engine}]'] = lambda: flock.step(TICK_SECONDS)
+    return benchmarks
+
+
+def tk_benchmarks(pet_count=1):
+    """Benchmarks on a real DesktopPet (needs a display, e.g. Xvfb)"""
+    import desktop_pet
+
+    pet = desktop_pet.DesktopPet(pet_count=pet_count)
+    pet.root.update()
+
+    drag_event = FakeEvent()
+
+    def drag_pet():
+        # Wiggle the pointer by a few pixels around the pet
+        drag_event.x = pet.drag_start_x + (3 if drag_event.x <= pet.drag_start_x else -3)
+        drag_event.y = pet.drag_start_y
+        pet.drag_pet(drag_event)
+        pet.apply_drag()  # Force the coalesced update so every call moves the pet
+
+    discard = Discard()
+
+    def calculate_container_size():
+        # Its two startup prints would otherwise be most of what gets timed
+        with contextlib.redirect_stdout(discard):
+            pet.calculate_container_size()
+
+    pet.dragged = pet.pets[0]
+    pet.sim.is_dragging = True
+    pet.drag_start_x, pet.drag_start_y = int(pet.sim.x), int(pet.sim.y)
+
+    benchmarks = {
+        'tk.update_behavior': pet.update_behavior,
+        'tk.follow_cursor': pet.follow_cursor,
+        'tk.animate': pet.animate,
+        'tk.draw': pet.draw,
+        'tk.drag_pet': drag_pet,
+        'tk.calculate_container_size': calculate_container_size,
+    }
+    return pet, benchmarks
+
+
+def start_xvfb():
+    """Start a private Xvfb server and point DISPLAY at it"""
+    xvfb = shutil.which('Xvfb')
+    if not xvfb:
+        print("! Xvfb not found, skipping Tk benchmarks")
+        return None
+    display = ':97'
+    process = subprocess.Popen([xvfb, display, '-screen', '0', '1920x1080x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ['DISPLAY'] = display
+    return process
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run(iterations, use_tk, pet_count=1):
+    """Run every benchmark, returning {name: {ns_per_op, bytes_per_op, blocks_per_op}}"""
+    benchmarks = headless_benchmarks()
+    pet = None
+    if use_tk:
+        try:
+            pet, tk_benches = tk_benchmarks(pet_count)
+            if pet_count > 1:
+                # Keep multi-pet results apart from the single-pet baseline
+                tk_benches = {f"{name}[{pet_count}]": func for name, func in tk_benches.items()}
+            benchmarks.update(tk_benches)
+        except Exception as e:
+            print(f"! Tk benchmarks skipped (no display?): {e}")
+
+    results = {}
+    # Tk calls and whole-flock steps are far slower than one pet's logic; keep their runs short
+    for name, func in benchmarks.items():
+        count = iterations
+        for prefix, divisor in ITERATION_DIVISORS.items():
+            if name.startswith(prefix):
+                count = iterations // divisor
+        ns, peak, retained = measure(func, max(1, count))
+        results[name] = {'ns_per_op': ns, 'bytes_per_op': peak, 'blocks_per_op': retained}
+
+    if pet is not None:
+        pet.root.destroy()
+    return results
+
+
+def report(results, baseline, factor=REGRESSION_FACTOR):
+    """Print results next to the baseline and return the regressed names"""
+    regressions = []
+    print(f"{'benchmark':<30}{'ns/op':>12}{'B/op':>10}{'blocks/op':>11}{'vs base':>10}")
+    for name, result in results.items():
+        line = (f"{name:<30}{result['ns_per_op']:>12.0f}"
+                f"{result['bytes_per_op']:>10.0f}{result['blocks_per_op']:>11.2f}")
+        if name in baseline:
+            ratio = result['ns_per_op'] / max(baseline[name]['ns_per_op'], 1e-9)
+            line += f"{ratio:>9.2f}x"
+            if ratio > factor:
+                line += "  ✗ REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desktop pet microbenchmarks")
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--headless', action='store_true', help="Skip the Tk benchmarks")
+    parser.add_argument('--xvfb', action='store_true', help="Run the Tk benchmarks under Xvfb")
+    parser.add_argument('--pets', type=int, default=1, help="Pets in the Tk benchmarks")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="Store results as the baseline")
+    parser.add_argument('--check', action='store_true', help="Exit 1 on regressions")
+    parser.add_argument('--factor', type=float, default=REGRESSION_FACTOR,
+                        help="Slowdown vs baseline that counts as a regression")
+    args = parser.parse_args()
+
+    print("=== Desktop Pet Benchmarks ===")
+    xvfb = start_xvfb() if args.xvfb and not args.headless else None
+    use_tk = not args.headless and bool(os.environ.get('DISPLAY') or sys.platform in ('darwin', 'win32'))
+    try:
+        results = run(args.iterations, use_tk, max(1, args.pets))
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    baseline = load_baseline(args.baseline)
+    regressions = report(results, baseline, args.factor)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"✓ Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"! {len(regressions)} benchmark(s) slower than {args.factor}x baseline")
+        if args.check:
+            sys.exit(1)
+    elif baseline:
+        print("✓ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
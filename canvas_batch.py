@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Batched canvas updates for the desktop pet.
+Position and sprite changes for every pet are queued during a tick and
+applied with a single Tcl call instead of one coords/itemconfig round trip
+per item.
+"""
+
+# Defined once per interpreter; walks flat lists of changes on the Tcl side
+BATCH_PROC = """
+proc ::desktop_pet_batch {canvas moves configs} {
+    foreach {item x y} $moves {
+        $canvas coords $item $x $y
+    }
+    foreach {item option value} $configs {
+        $canvas itemconfigure $item $option $value
+    }
+}
+"""
+
+
+class CanvasBatch:
+    """Queues coords/itemconfigure changes and applies them in one call"""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.path = str(canvas)
+        self.moves = []
+        self.configs = []
+        canvas.tk.eval(BATCH_PROC)
+
+    def coords(self, item, x, y):
+        """Queue moving an item's anchor point"""
+        self.moves.extend((item, x, y))
+
+    def itemconfig(self, item, option, value):
+        """Queue changing one item option, e.g. image or text"""
+        self.configs.extend((item, '-' + option, str(value)))
+
+    def flush(self):
+        """Apply everything queued since the last flush"""
+        if self.moves or self.configs:
+            self.canvas.tk.call('::desktop_pet_batch', self.path,
+                                tuple(self.moves), tuple(self.configs))
+            self.moves.clear()
+            self.configs.clear()
@@ -6,6 +6,8 @@ Demo script to show what the desktop pet looks like
 import time
 import random
 
+from pet_core import PET_SPRITES, ANIMATIONS
+
 def demo_pet_animation():
     """Show a simple text-based demo of the pet animations"""
     
@@ -14,25 +16,11 @@ def demo_pet_animation():
     print("Here's what your desktop pet will look like:")
     print()
     
-    # Pet sprites
-    sprites = {
-        'idle1': '🐱',
-        'idle2': '😺', 
-        'walk1': '🐾',
-        'walk2': '🐱',
-        'sleep': '😴',
-        'play': '😸'
-    }
-    
-    # Animation sequences
-    animations = {
-        'idle': ['idle1', 'idle2', 'idle1', 'idle1'],
-        'walk': ['walk1', 'walk2', 'walk1', 'walk2'],
-        'sleep': ['sleep', 'sleep', 'sleep', 'sleep'],
-        'play': ['play', 'idle1', 'play', 'idle2']
-    }
+    # Same sprites and animation sequences as the real pet
+    sprites = PET_SPRITES
+    animations = ANIMATIONS
     
-    states = ['idle', 'walk', 'play', 'sleep']
+    states = ['idle', 'walking', 'play', 'sleep']
     
     for state in states:
         print(f"--- {state.upper()} animation ---")
@@ -64,6 +52,7 @@ def demo_pet_animation():
     print()
     print("💡 Want to try it first? Run: python3 test_interactive.py")
     print("   This opens a test window where you can play with the pet!")
+    print("   No display? Run: python3 pet_headless.py  (the pet lives in your terminal)")
 
 if __name__ == "__main__":
     demo_pet_animation()
\ No newline at end of file
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Keeps the pet's window at desktop level (below every other window).
+The platform strategy is picked once at startup and any platform handles
+(win32 modules, the window's hwnd) are resolved once. The window is only
+re-levelled when a stacking change has actually been seen: from Tk events
+on macOS and X11, and from a cheap z-order check on Windows.
+"""
+
+import platform
+import tkinter as tk
+
+# How covered the window is, from Tk's <Visibility> event state
+OBSCURED_LEVELS = {
+    'VisibilityUnobscured': 0,
+    'VisibilityPartiallyObscured': 1,
+    'VisibilityFullyObscured': 2,
+}
+
+
+def was_raised(old_state, new_state):
+    """True if a visibility change means the window may have come up in the stack"""
+    return OBSCURED_LEVELS.get(new_state, 2) < OBSCURED_LEVELS.get(old_state, 2)
+
+
+class DesktopLevel:
+    """Keeps a window below all others; subclasses know how for one platform"""
+
+    polls = False  # True if stacking changes must be polled for instead of seen in events
+
+    def __init__(self, root):
+        self.root = root
+        self.dirty = False
+        self.applied = 0  # Re-levels done, for diagnostics and tests
+
+    def setup(self):
+        """One-time window attributes"""
+
+    def lower(self):
+        """Push the window down to desktop level"""
+
+    def stacking_changed(self):
+        """Cheap check for polling backends: has anything moved below us?"""
+        return False
+
+    def mark_dirty(self):
+        """An event suggested the window was raised"""
+        self.dirty = True
+
+    def check(self):
+        """Re-level only if the stacking changed since last time; True if it did"""
+        if not (self.dirty or self.stacking_changed()):
+            return False
+        self.dirty = False
+        self.lower()
+        self.applied += 1
+        return True
+
+
+class NullDesktopLevel(DesktopLevel):
+    """Does nothing to the window; used when no platform support is available"""
+
+
+class MacDesktopLevel(DesktopLevel):
+    """macOS window level attribute"""
+
+    def setup(self):
+        try:
+            self.root.call('wm', 'attributes', '.', '-topmost', False)
+        except tk.TclError:
+            pass
+
+    def lower(self):
+        try:
+            # This puts the window at desktop level on macOS
+            self.root.call('wm', 'attributes', '.', '-level', 'desktop')
+        except tk.TclError:
+            # Fallback: just don't stay on top
+            pass
+
+
+class X11DesktopLevel(DesktopLevel):
+    """Desktop window type hint, plus lowering if the window gets raised anyway"""
+
+    def setup(self):
+        try:
+            self.root.attributes('-type', 'desktop')
+        except tk.TclError:
+            pass
+
+    def lower(self):
+        self.root.lower()
+
+
+class WindowsDesktopLevel(DesktopLevel):
+    """SetWindowPos(HWND_BOTTOM), re-done only when the z-order below us changes"""
+
+    polls = True
+
+    def __init__(self, root, win32gui=None, win32con=None):
+        super().__init__(root)
+        if win32gui is None or win32con is None:
+            import win32gui
+            import win32con
+        self.win32gui = win32gui
+        self.win32con = win32con
+        self.hwnd = int(root.wm_frame(), 16)
+        self.flags = win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
+        self.below = None  # Window under ours right after the last re-level
+
+    def window_below(self):
+        return self.win32gui.GetWindow(self.hwnd, self.win32con.GW_HWNDNEXT)
+
+    def lower(self):
+        self.win32gui.SetWindowPos(self.hwnd, self.win32con.HWND_BOTTOM, 0, 0, 0, 0, self.flags)
+        self.below = self.window_below()
+
+    def stacking_changed(self):
+        return self.window_below() != self.below
+
+
+def make_desktop_level(root, os_type=None):
+    """Pick the desktop-level strategy for this platform, once"""
+    os_type = os_type or platform.system()
+    if os_type == "Darwin":
+        return MacDesktopLevel(root)
+    if os_type == "Windows":
+        try:
+            return WindowsDesktopLevel(root)
+        except ImportError:
+            # If win32gui not available, just don't stay on top
+            print("Note: Install pywin32 for better Windows desktop integration")
+            return NullDesktopLevel(root)
+    return X11DesktopLevel(root)
@@ -7,34 +7,125 @@ Only visible when all applications are minimized to desktop.
 
 import tkinter as tk
 from tkinter import PhotoImage
-import random
-import math
+import argparse
+import os
 import platform
+import random
 import sys
+import time
+
+from pet_scheduler import TickScheduler
+from pet_metrics import TickMetrics
+from sprite_cache import SpriteCache
+from pet_renderers import TkCanvasRenderer
+from spatial_index import SpatialHash
+from pet_navigation import NavGrid
+from desktop_level import make_desktop_level, was_raised
+from pet_control import InstanceLock, make_control_server
+from pet_worker import DecisionWorker
+from pet_trace import TraceRecorder, STEP, PRESS, DRAG, RELEASE, DOUBLE, OBSTACLE
+from pet_core import (PetSimulation, Animation, WakeDetector, DESKTOP_PROFILE, PET_SPRITES,
+                      ANIMATIONS, TICK_SECONDS, FRAME_SECONDS, HIDDEN_TICK_SECONDS)
+
+class PetView:
+    """One simulated pet and its animation clock"""
+    def __init__(self, index, sim, animation):
+        self.index = index  # Position in DesktopPet.pets, renderer id and spatial index id
+        self.sim = sim
+        self.animation = animation
+        self.drawn_position = None
 
 class DesktopPet:
-    def __init__(self):
+    def __init__(self, show_hud=False, pet_count=1, decision_worker=None, seed=None,
+                 record=None, clock=time.monotonic):
         self.root = tk.Tk()
+        self.clock = clock  # Monotonic seconds; a soak test can pass a faster one
         self.calculate_container_size()
         self.setup_window()
         self.setup_pet()
         self.setup_animations()
         
-        # Pet state
-        self.target_x = self.container_width // 2
-        self.target_y = self.container_height // 2
-        self.current_x = self.container_width // 2
-        self.current_y = self.container_height // 2
-        self.is_dragging = False
+        # One seeded random source for the whole colony, so a recorded session replays exactly
+        if seed is None:
+            seed = random.getrandbits(64)
+        seed %= 2**64  # Traces store 64 bits; use exactly what a replay will
+        self.rng = random.Random(seed)
+        
+        # Pet state lives in the headless simulation; this class only renders it.
+        # Each pet in the colony has its own state machine.
+        self.pets = []
+        for index in range(pet_count):
+            sim = PetSimulation(self.container_width, self.container_height,
+                                self.pet_radius, DESKTOP_PROFILE, self.rng)
+            sim.navigator = self.navigator
+            if index > 0:
+                # Spread the rest of the colony around the container
+                margin = self.pet_radius + 20
+                sim.place(self.rng.randint(margin, self.container_width - margin),
+                          self.rng.randint(margin, self.container_height - margin))
+                self.renderer.add_pet(index, sim.x, sim.y, 'idle1')
+            self.pets.append(PetView(index, sim, Animation(animations=self.animations)))
+        self.sim = self.pets[0].sim  # The first pet, for single-pet callers
+        self.sims = [view.sim for view in self.pets]  # Built once; the tick path reuses it
+        
+        # Optionally record every input that changes the pets, for pet_trace.py to replay
+        self.recorder = None
+        if record:
+            self.recorder = TraceRecorder(record, self.container_width, self.container_height,
+                                          pet_count, self.pet_radius, seed)
+            if 'house' in self.navigator.obstacles:
+                self.recorder.record(OBSTACLE, *self.navigator.obstacles['house'])
+        
+        # Optionally make behavior decisions in a worker thread or process
+        self.worker = None
+        if decision_worker:
+            self.worker = DecisionWorker(self.container_width, self.container_height,
+                                         self.pet_radius, DESKTOP_PROFILE,
+                                         use_processes=decision_worker == 'process',
+                                         notify=self.decisions_ready)
+            self.root.bind('<<PetDecisions>>', self.apply_decisions)
+            for view in self.pets:
+                view.sim.decide_inline = False
+        
+        # Grid index over pet positions for click hit-testing (ids are indexes into pets)
+        self.pet_index = SpatialHash(self.pet_radius * 4)
+        for view in self.pets:
+            self.pet_index.insert(view.index, view.sim.x, view.sim.y)
+        
+        self.dragged = None
+        self.pointer_inside = False  # While True, <Motion> events keep the cursor current
         self.drag_start_x = 0
         self.drag_start_y = 0
-        self.animation_frame = 0
-        self.idle_counter = 0
-        self.state = "idle"  # idle, walking, sleeping, playing
-        
-        # Start the main loops
-        self.animate()
-        self.update_behavior()
+        self.drag_pointer = None  # Latest motion not yet applied to the pet
+        self.drag_pointer_time = 0.0
+        self.last_drag_draw = 0.0
+        self.last_step_time = self.last_frame_time = self.clock()
+        self.wake_detector = WakeDetector()
+        self.rendering = False
+        
+        # Drawing stops while the window is unmapped or completely covered
+        self.mapped = True
+        self.obscured = False
+        self.visibility_state = 'VisibilityUnobscured'
+        self.visible = True
+        
+        # Start the main loops, all serviced by one scheduler timer
+        self.metrics = TickMetrics()
+        self.scheduler = TickScheduler(self.root.after, self.root.after_cancel,
+                                       clock=self.clock, metrics=self.metrics)
+        self.scheduler.register('animate', 0.5, self.animate)
+        self.scheduler.register('behavior', TICK_SECONDS, self.update_behavior)
+        if self.desktop_level.polls:
+            # Windows can't report being raised, so check the z-order now and then
+            self.scheduler.register('desktop_level', 5.0, self.ensure_desktop_level, delay=5.0)
+        
+        # Optional timing overlay for diagnosing lag
+        self.hud = None
+        self.control = None  # Command socket, started by serve_control()
+        if show_hud:
+            self.hud = self.canvas.create_text(10, 10, text='', anchor='nw',
+                                               font=('Courier', 8), fill='#888')
+            self.scheduler.register('hud', 1.0, self.update_hud, delay=1.0)
         
     def calculate_container_size(self):
         """Calculate container size as 1/8 of screen area"""
@@ -73,44 +164,13 @@ class DesktopPet:
         self.os_type = platform.system()
         
         # Configure window to stay on desktop background (below other apps)
-        if self.os_type == "Darwin":  # macOS
-            # On macOS, use level -1 to stay below normal windows
-            self.root.attributes('-alpha', 0.85)  # Slight transparency for container
-            self.root.overrideredirect(True)  # Remove window decorations
-            # Set window level to desktop level (below normal windows)
-            try:
-                # This puts the window at desktop level on macOS
-                self.root.call('wm', 'attributes', '.', '-topmost', False)
-                self.root.call('wm', 'attributes', '.', '-level', 'desktop')
-            except:
-                # Fallback: just don't stay on top
-                pass
-                
-        elif self.os_type == "Windows":  # Windows
-            # On Windows, use specific attributes to stay on desktop
-            self.root.overrideredirect(True)  # Remove window decorations
-            self.root.attributes('-alpha', 0.85)  # Slight transparency for container
-            # Try to set window to desktop level
-            try:
-                # Import Windows-specific modules if available
-                import win32gui
-                import win32con
-                # Get window handle and set it below normal windows
-                hwnd = int(self.root.wm_frame(), 16)
-                win32gui.SetWindowPos(hwnd, win32con.HWND_BOTTOM, 0, 0, 0, 0, 
-                                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE)
-            except ImportError:
-                # If win32gui not available, just don't stay on top
-                print("Note: Install pywin32 for better Windows desktop integration")
-                pass
-        else:  # Linux and others
-            self.root.overrideredirect(True)
-            self.root.attributes('-alpha', 0.85)
-            # Try to stay below other windows
-            try:
-                self.root.attributes('-type', 'desktop')
-            except:
-                pass
+        self.root.overrideredirect(True)  # Remove window decorations
+        self.root.attributes('-alpha', 0.85)  # Slight transparency for container
+        
+        # How to stay at desktop level is decided once for this platform
+        self.desktop_level = make_desktop_level(self.root, self.os_type)
+        self.desktop_level.setup()
+        self.desktop_level.lower()
         
         # Set a subtle background for the container
         # Use a very light color that blends with most wallpapers
@@ -131,254 +191,386 @@ class DesktopPet:
                                    fill='#f8f8f8', outline='#e0e0e0', width=1)
         
         # Add a small label in the corner
-        self.canvas.create_text(self.container_width-10, 10, text='🏠', 
-                              font=('Arial', 12), anchor='ne', fill='#c0c0c0')
+        house = self.canvas.create_text(self.container_width-10, 10, text='🏠', 
+                                        font=('Arial', 12), anchor='ne', fill='#c0c0c0')
         
         # Create simple pet sprite (we'll use text/shapes since we don't have image files)
-        self.pet_sprites = {
-            'idle1': '🐱',
-            'idle2': '😺', 
-            'walk1': '🐾',
-            'walk2': '🐱',
-            'sleep': '😴',
-            'play': '😸'
-        }
+        self.pet_sprites = dict(PET_SPRITES)
         
         # Create the pet on canvas (start in center)
         pet_size = 32
         self.pet_start_x = self.container_width // 2
         self.pet_start_y = self.container_height // 2
         
-        self.pet = self.canvas.create_text(self.pet_start_x, self.pet_start_y, 
-                                         text=self.pet_sprites['idle1'], 
-                                         font=('Arial', pet_size), anchor='center')
+        # Rasterize each sprite once when possible instead of drawing emoji text every frame
+        self.sprite_cache = SpriteCache(self.root, self.pet_sprites, pet_size)
+        sheet_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sprites.png')
+        if os.path.exists(sheet_path):
+            # One row of square frames, in the same order as pet_sprites
+            self.sprite_cache.load_sheet(sheet_path, list(self.pet_sprites))
+        
+        # All canvas updates for a tick go to Tk in one batched call
+        self.renderer = TkCanvasRenderer(self.canvas, self.pet_sprites, self.sprite_cache, pet_size)
+        self.use_images = self.renderer.use_images
         
         # Store pet bounds for collision detection
         self.pet_size = pet_size
         self.pet_radius = pet_size // 2
         
+        self.pet = self.renderer.add_pet(0, self.pet_start_x, self.pet_start_y, 'idle1')
+        
+        # Pets walk around the label instead of over it
+        self.navigator = NavGrid(self.container_width, self.container_height, self.pet_radius)
+        bbox = self.canvas.bbox(house)
+        if bbox:
+            self.navigator.set_obstacle('house', *bbox)
+        
         # Bind mouse events to the entire canvas
         self.canvas.bind('<Button-1>', self.start_drag)
         self.canvas.bind('<B1-Motion>', self.drag_pet)
         self.canvas.bind('<ButtonRelease-1>', self.end_drag)
         self.canvas.bind('<Double-Button-1>', self.pet_interaction)
         
+        # Notice when the container is minimized, hidden or fully covered
+        self.root.bind('<Map>', self.on_map)
+        self.root.bind('<Unmap>', self.on_unmap)
+        self.root.bind('<FocusIn>', self.stacking_changed)
+        self.canvas.bind('<Visibility>', self.on_visibility)
+        
+        # Track the cursor from events while it's over the container
+        self.canvas.bind('<Motion>', self.track_mouse)
+        self.canvas.bind('<Enter>', self.mouse_enter)
+        self.canvas.bind('<Leave>', self.mouse_leave)
+        
     def setup_animations(self):
         """Setup animation sequences"""
-        self.animations = {
-            'idle': ['idle1', 'idle2', 'idle1', 'idle1'],
-            'walk': ['walk1', 'walk2', 'walk1', 'walk2'],
-            'sleep': ['sleep', 'sleep', 'sleep', 'sleep'],
-            'play': ['play', 'idle1', 'play', 'idle2']
-        }
+        self.animations = dict(ANIMATIONS)
+        
+    @property
+    def state(self):
+        """Current pet state (idle, walking, sleep, play)"""
+        return self.sim.state
+        
+    @state.setter
+    def state(self, value):
+        self.sim.state = value
+        
+    @property
+    def is_dragging(self):
+        return self.sim.is_dragging
+        
+    def draw(self):
+        """Draw every pet at its simulated position in one batched call"""
+        elapsed = self.clock() - self.last_step_time
+        for view in self.pets:
+            x, y = view.sim.render_position(elapsed)
+            position = (x, y + view.animation.bounce)  # Bounce is layered on at draw time only
+            if position != view.drawn_position:
+                view.drawn_position = position
+                self.renderer.move_pet(view.index, *position)
+        self.renderer.flush()
+        
+    def render(self):
+        """Redraw at frame rate while any pet walks, then stop"""
+        self.draw()
+        if not any(view.sim.is_moving() for view in self.pets):
+            self.rendering = False
+            self.scheduler.unregister('render')
+        
+    def on_map(self, event):
+        """Window was shown or restored"""
+        if event.widget is self.root:  # Children's map events bubble up here too
+            self.mapped = True
+            self.update_visibility()
+            self.stacking_changed()
+        
+    def on_unmap(self, event):
+        """Window was hidden or minimized"""
+        if event.widget is self.root:
+            self.mapped = False
+            self.update_visibility()
+        
+    def on_visibility(self, event):
+        """Canvas became covered or uncovered by other windows"""
+        if was_raised(self.visibility_state, event.state):
+            self.stacking_changed()
+        self.visibility_state = event.state
+        self.obscured = event.state == 'VisibilityFullyObscured'
+        self.update_visibility()
+        
+    def update_visibility(self):
+        """Suspend or resume drawing when the container can or can't be seen"""
+        visible = self.mapped and not self.obscured
+        if visible == self.visible:
+            return
+        self.visible = visible
+        if visible:
+            self.resume()
+        else:
+            self.suspend()
+        
+    def suspend(self):
+        """Stop drawing and slow the behavior tick while nobody can see the pets"""
+        self.scheduler.unregister('animate')
+        self.scheduler.unregister('render')
+        self.scheduler.unregister('hud')
+        self.rendering = False
+        self.scheduler.reschedule('behavior', HIDDEN_TICK_SECONDS)
+        
+    def resume(self):
+        """Catch the pets up and redraw right away"""
+        self.scheduler.register('animate', 0.5, self.animate)
+        if self.hud is not None:
+            self.scheduler.register('hud', 1.0, self.update_hud)
+        self.wake()
+        
+    def pet_at(self, x, y, slop):
+        """The topmost pet near a point, or None"""
+        hits = self.pet_index.query_radius(x, y, self.pet_radius + slop)
+        if not hits:
+            return None
+        return self.pets[max(hits)]  # Later pets are drawn on top
         
     def start_drag(self, event):
         """Start dragging the pet"""
-        # Check if click is near the pet
-        pet_coords = self.canvas.coords(self.pet)
-        if pet_coords:
-            pet_x, pet_y = pet_coords[0], pet_coords[1]
-            distance = ((event.x - pet_x)**2 + (event.y - pet_y)**2)**0.5
-            
-            if distance <= self.pet_radius + 10:  # Allow some margin for clicking
-                self.is_dragging = True
-                self.drag_start_x = event.x
-                self.drag_start_y = event.y
+        if self.recorder:
+            self.recorder.record(PRESS, event.x, event.y)
+        # Check if click is near a pet
+        view = self.pet_at(event.x, event.y, 10)  # Allow some margin for clicking
+        if view and view.sim.start_drag(event.x, event.y):
+            self.dragged = view
+            self.drag_start_x = event.x
+            self.drag_start_y = event.y
+            self.wake()
         
     def drag_pet(self, event):
         """Handle pet dragging"""
-        if self.is_dragging:
-            # Calculate new pet position within container
-            dx = event.x - self.drag_start_x
-            dy = event.y - self.drag_start_y
+        if self.dragged:
+            if self.drag_pointer is None:
+                # Coalesce motion to one pet update per display frame; after a pause
+                # the first update goes out right away
+                self.drag_pointer_time = self.clock()
+                delay = self.last_drag_draw + FRAME_SECONDS - self.drag_pointer_time
+                self.scheduler.register('drag', FRAME_SECONDS, self.apply_drag,
+                                        delay=max(0.0, delay))
+            self.drag_pointer = (event.x, event.y)
             
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords:
-                new_x = pet_coords[0] + dx
-                new_y = pet_coords[1] + dy
-                
-                # Keep pet within container bounds
-                margin = self.pet_radius + 5
-                new_x = max(margin, min(new_x, self.container_width - margin))
-                new_y = max(margin, min(new_y, self.container_height - margin))
-                
-                # Move the pet
-                self.canvas.coords(self.pet, new_x, new_y)
-                
-                # Update drag start position for smooth dragging
-                self.drag_start_x = event.x
-                self.drag_start_y = event.y
+    def apply_drag(self):
+        """Move the dragged pet to the latest pointer position"""
+        self.scheduler.unregister('drag')
+        if self.drag_pointer is None or not self.dragged:
+            return
+        started = self.clock()
+        x, y = self.drag_pointer
+        self.drag_pointer = None
+        if self.recorder:
+            self.recorder.record(DRAG, x, y)
+        
+        # Move the pet within container bounds, from its logical position
+        sim = self.dragged.sim
+        sim.drag_by(x - self.drag_start_x, y - self.drag_start_y)
+        self.pet_index.move(self.dragged.index, sim.x, sim.y)
+        self.draw()
+        
+        # Update drag start position for smooth dragging
+        self.drag_start_x = x
+        self.drag_start_y = y
+        
+        # Pointer-to-pixel latency: oldest coalesced motion event to the canvas update
+        self.last_drag_draw = self.clock()
+        self.metrics.record('drag_latency', self.drag_pointer_time, self.last_drag_draw,
+                            self.last_drag_draw - started)
             
     def end_drag(self, event):
         """End dragging"""
-        self.is_dragging = False
+        if self.dragged:
+            self.apply_drag()  # Don't drop the last motion
+            if self.recorder:
+                self.recorder.record(RELEASE, event.x, event.y)
+            self.dragged.sim.end_drag()
+            self.dragged = None
         
     def pet_interaction(self, event):
         """Handle double-click interaction"""
-        # Check if double-click is near the pet
-        pet_coords = self.canvas.coords(self.pet)
-        if pet_coords:
-            pet_x, pet_y = pet_coords[0], pet_coords[1]
-            distance = ((event.x - pet_x)**2 + (event.y - pet_y)**2)**0.5
-            
-            if distance <= self.pet_radius + 15:  # Allow some margin
-                self.state = "play"
-                self.idle_counter = 0
+        if self.recorder:
+            self.recorder.record(DOUBLE, event.x, event.y)
+        # Check if double-click is near a pet
+        view = self.pet_at(event.x, event.y, 15)  # Allow some margin
+        if view:
+            view.sim.trigger("play")
+            self.wake()
+        
+    def track_mouse(self, event):
+        """Track mouse movement over the container"""
+        self.set_cursor(event.x, event.y)
+        
+    def mouse_enter(self, event):
+        """Mouse entered the container"""
+        self.pointer_inside = True
+        self.set_cursor(event.x, event.y)
+        self.wake()
+        
+    def mouse_leave(self, event):
+        """Mouse left the container; fall back to polling near the edge"""
+        self.pointer_inside = False
+        self.set_cursor(event.x, event.y)
+        
+    def set_cursor(self, cursor_x, cursor_y):
+        """Give every pet the cursor position relative to the container"""
+        if self.recorder:
+            self.recorder.cursor(cursor_x, cursor_y)
+        for view in self.pets:
+            view.sim.set_cursor(cursor_x, cursor_y)
         
     def get_cursor_position(self):
         """Get mouse cursor position"""
         try:
-            x = self.root.winfo_pointerx()
-            y = self.root.winfo_pointery()
-            return x, y
+            # One round trip to the X server instead of separate x and y queries
+            x, y = self.root.winfo_pointerxy()
         except:
-            return self.current_x, self.current_y
+            return None
+        if x == -1 and y == -1:
+            return None  # Pointer is on another screen
+        return x, y
+            
+    def stacking_changed(self, event=None):
+        """Something may have raised the window; re-level it shortly"""
+        self.desktop_level.mark_dirty()
+        # A short delay lets a burst of events share one re-level
+        self.scheduler.register('desktop_level', 5.0, self.ensure_desktop_level, delay=0.2)
             
     def ensure_desktop_level(self):
-        """Ensure the window stays at desktop level (platform-specific)"""
+        """Ensure the window stays at desktop level, only touching it if it was raised"""
         try:
-            if self.os_type == "Darwin":  # macOS
-                # Periodically ensure we stay at desktop level
-                self.root.call('wm', 'attributes', '.', '-level', 'desktop')
-            elif self.os_type == "Windows":  # Windows
-                try:
-                    import win32gui
-                    import win32con
-                    hwnd = int(self.root.wm_frame(), 16)
-                    win32gui.SetWindowPos(hwnd, win32con.HWND_BOTTOM, 0, 0, 0, 0, 
-                                        win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE)
-                except ImportError:
-                    pass
-        except:
+            self.desktop_level.check()
+        except Exception:
             pass
+        if not self.desktop_level.polls:
+            self.scheduler.unregister('desktop_level')  # Wait for the next stacking event
             
     def follow_cursor(self):
-        """Make pet follow cursor when idle"""
-        if self.is_dragging or self.state != "idle":
-            return
-            
-        # Get cursor position relative to container
-        try:
-            cursor_screen_x, cursor_screen_y = self.get_cursor_position()
-            # Convert to container-relative coordinates
-            cursor_x = cursor_screen_x - self.container_x
-            cursor_y = cursor_screen_y - self.container_y
-            
-            # Only follow if cursor is within or near the container
-            if (-50 <= cursor_x <= self.container_width + 50 and 
-                -50 <= cursor_y <= self.container_height + 50):
-                
-                pet_coords = self.canvas.coords(self.pet)
-                if pet_coords:
-                    pet_x, pet_y = pet_coords[0], pet_coords[1]
-                    
-                    # Calculate distance to cursor
-                    distance = math.sqrt((cursor_x - pet_x)**2 + (cursor_y - pet_y)**2)
-                    
-                    # Follow if cursor is close but not too close
-                    if 30 < distance < 150:
-                        # Set target within container bounds
-                        margin = self.pet_radius + 10
-                        self.target_x = max(margin, min(cursor_x, self.container_width - margin))
-                        self.target_y = max(margin, min(cursor_y, self.container_height - margin))
-                        self.state = "walking"
-        except:
-            pass
-            
-    def update_position(self):
-        """Smoothly move pet towards target"""
-        if self.state == "walking" and not self.is_dragging:
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords:
-                current_pet_x, current_pet_y = pet_coords[0], pet_coords[1]
-                
-                # Move towards target
-                dx = self.target_x - current_pet_x
-                dy = self.target_y - current_pet_y
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                if distance > 3:
-                    # Move step by step
-                    step_size = min(1.5, distance / 8)
-                    new_x = current_pet_x + (dx / distance) * step_size
-                    new_y = current_pet_y + (dy / distance) * step_size
-                    
-                    # Keep within container bounds
-                    margin = self.pet_radius + 5
-                    new_x = max(margin, min(new_x, self.container_width - margin))
-                    new_y = max(margin, min(new_y, self.container_height - margin))
-                    
-                    # Move the pet
-                    self.canvas.coords(self.pet, new_x, new_y)
-                else:
-                    self.state = "idle"
+        """Feed the cursor position (relative to the container) to the pets"""
+        if self.pointer_inside:
+            return  # Motion events are already keeping it current
+        for sim in self.sims:
+            if sim.wants_cursor():
+                break
+        else:
+            return  # Nobody would react, so skip the X server round trip
+        cursor = self.get_cursor_position()
+        if cursor is None:
+            self.set_cursor(None, None)
+        else:
+            self.set_cursor(cursor[0] - self.container_x, cursor[1] - self.container_y)
                 
     def update_behavior(self):
         """Update pet behavior and state"""
-        self.idle_counter += 1
-        
-        # Ensure we stay at desktop level every few cycles
-        if self.idle_counter % 50 == 0:  # Every 5 seconds
-            self.ensure_desktop_level()
-        
-        # Random behavior changes
-        if self.idle_counter > 100:  # About 10 seconds
-            if self.state == "idle":
-                # Occasionally do something random
-                rand = random.random()
-                if rand < 0.2:
-                    self.state = random.choice(["sleep", "play"])
-                elif rand < 0.4:  # Random wandering
-                    self.wander_randomly()
-            elif self.state in ["sleep", "play"]:
-                # Return to idle after a while
-                if random.random() < 0.1:
-                    self.state = "idle"
-            self.idle_counter = 0
-            
-        # Follow cursor behavior
-        self.follow_cursor()
-        
-        # Update position
-        self.update_position()
-        
-        # Schedule next behavior update
-        self.root.after(100, self.update_behavior)
-        
-    def wander_randomly(self):
-        """Make pet wander to a random spot in the container"""
-        if not self.is_dragging:
-            margin = self.pet_radius + 20
-            self.target_x = random.randint(margin, self.container_width - margin)
-            self.target_y = random.randint(margin, self.container_height - margin)
-            self.state = "walking"
+        if self.visible:
+            self.follow_cursor()
+        
+        if self.worker:
+            self.worker.collect(self.sims)
+        
+        # Advance the simulations by the time elapsed since the last update
+        now = self.clock()
+        dt = now - self.last_step_time
+        self.last_step_time = now
+        # After a suspend the pets skip ahead in closed form rather than replaying ticks
+        dt += self.wake_detector.missed(dt)
+        if self.recorder:
+            self.recorder.record(STEP, dt)
+        for view in self.pets:
+            view.sim.step(dt)
+            self.pet_index.move(view.index, view.sim.x, view.sim.y)
+        self.navigator.update_pets(self.sims)
+        
+        if self.worker:
+            # Decisions for these positions arrive while the UI carries on
+            self.worker.submit(self.sims, self.rng.getrandbits(32))
+        
+        if not self.visible:
+            # Pets keep living, but nothing is drawn and the cursor isn't watched
+            return HIDDEN_TICK_SECONDS
+        
+        # Back off while every pet is sleeping or the cursor is far away; one plain
+        # loop rather than any()/min() generators, since this runs every tick
+        interval = HIDDEN_TICK_SECONDS
+        moving = False
+        for sim in self.sims:
+            if sim.tick_interval() < interval:
+                interval = sim.tick_interval()
+            if sim.is_moving():
+                moving = True
+        
+        # Interpolate between ticks at frame rate while walking
+        if moving and not self.rendering:
+            self.rendering = True
+            self.scheduler.register('render', FRAME_SECONDS, self.render)
+        return interval
+        
+    def wake(self):
+        """Return to the full behavior tick rate right away"""
+        self.scheduler.reschedule('behavior')
+        
+    def decisions_ready(self):
+        """Called on the worker side: ask the Tk thread to pick up the results
+
+        Only for Tk's own mainloop; pet_async swaps in a notify that goes
+        through the asyncio loop.
+        """
+        try:
+            self.root.event_generate('<<PetDecisions>>', when='tail')
+        except (RuntimeError, tk.TclError):
+            pass  # Tcl without thread support; results are collected on the next tick
+        
+    def apply_decisions(self, event=None):
+        """Adopt finished decisions straight away instead of waiting for a resting tick"""
+        if self.worker.collect(self.sims):
+            self.wake()
+        
+    def update_hud(self):
+        """Show tick lateness and callback duration percentiles on the canvas"""
+        self.canvas.itemconfig(self.hud, text=self.metrics.hud_text())
+        
+    def serve_control(self):
+        """Accept commands from petctl.py"""
+        self.control = make_control_server(self.root, self.handle_command)
+        
+    def handle_command(self, command):
+        """Answer one control command with a JSON-friendly reply"""
+        if command in ('play', 'sleep'):
+            if self.recorder:
+                self.recorder.command(command)
+            for view in self.pets:
+                view.sim.trigger(command)
+            self.wake()
+            return {'ok': True}
+        if command == 'status':
+            return {'visible': self.visible,
+                    'pets': [{'state': view.sim.state, 'x': round(view.sim.x, 1),
+                              'y': round(view.sim.y, 1)} for view in self.pets]}
+        if command == 'stats':
+            return self.metrics.summary()
+        if command == 'quit':
+            self.root.after_idle(self.root.destroy)  # After this reply has gone out
+            return {'ok': True}
+        return {'error': f"unknown command: {command}"}
         
     def animate(self):
-        """Animate the pet sprite"""
-        # Get current animation sequence
-        current_animation = self.animations.get(self.state, self.animations['idle'])
+        """Animate the pet sprites"""
+        # Pick frames from elapsed time so a stalled loop doesn't slow the animation
+        now = self.clock()
+        elapsed = now - self.last_frame_time
+        self.last_frame_time = now
         
-        # Update animation frame
-        sprite_name = current_animation[self.animation_frame % len(current_animation)]
-        sprite = self.pet_sprites[sprite_name]
+        for view in self.pets:
+            # Update pet display only when the sprite actually changes
+            if view.animation.advance(view.sim.state, elapsed):
+                self.renderer.set_sprite(view.index, view.animation.sprite)
+        self.draw()
         
-        # Update pet display
-        self.canvas.itemconfig(self.pet, text=sprite)
-        
-        # Add a subtle bounce effect when walking
-        if self.state == "walking" and self.animation_frame % 4 < 2:
-            # Slight vertical offset for bounce
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords and len(pet_coords) >= 2:
-                bounce_offset = 2 if self.animation_frame % 4 == 0 else -2
-                self.canvas.coords(self.pet, pet_coords[0], pet_coords[1] + bounce_offset)
-        
-        # Advance animation frame
-        self.animation_frame += 1
-        
-        # Schedule next frame (slower for sleep)
-        delay = 800 if self.state == "sleep" else 500
-        self.root.after(delay, self.animate)
+        # Next frame is slower when everyone sleeps
+        return min(view.animation.frame_duration(view.sim.state) for view in self.pets)
         
     def run(self):
         """Start the pet application"""
@@ -387,8 +579,47 @@ class DesktopPet:
         self.root.geometry(geometry)
         
         # Start the main loop
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.control is not None:
+                self.control.close()
+            if self.worker is not None:
+                self.worker.close()
+            if self.recorder is not None:
+                self.recorder.close()
 
 if __name__ == "__main__":
-    pet = DesktopPet()
-    pet.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Desktop pet")
+    parser.add_argument('--hud', action='store_true', help="Show tick timing overlay")
+    parser.add_argument('--pets', type=int, default=1, help="Number of pets in the container")
+    parser.add_argument('--decision-worker', choices=['thread', 'process'],
+                        help="Make behavior decisions off the UI thread")
+    parser.add_argument('--asyncio', action='store_true',
+                        help="Drive Tk from an asyncio event loop instead of mainloop()")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument('--record', metavar='PATH',
+                        help="Record inputs to a trace for pet_trace.py to replay")
+    args = parser.parse_args()
+    if args.record and args.decision_worker:
+        parser.error("--record needs decisions made inline (drop --decision-worker)")
+    
+    # Only one pet per user; later starts just leave the running one alone
+    lock = InstanceLock()
+    if not lock.acquire():
+        print("Desktop Pet is already running (stop it with: python3 petctl.py quit)")
+        sys.exit(0)
+    
+    pet = DesktopPet(show_hud=args.hud, pet_count=max(1, args.pets),
+                     decision_worker=args.decision_worker, seed=args.seed, record=args.record)
+    if args.asyncio:
+        import asyncio
+        from pet_async import run_async
+        asyncio.run(run_async(pet))
+    else:
+        try:
+            pet.serve_control()
+        except OSError as e:
+            print(f"Note: control socket unavailable ({e}); petctl.py won't reach this pet")
+        pet.run()
+    lock.release()
\ No newline at end of file
@@ -41,7 +41,7 @@ echo "Your desktop pet is now installed and will start automatically when you lo
 echo
 echo "Manual Controls:"
 echo "• To start the pet manually: ./start_pet.sh"
-echo "• To stop the pet: killall Python (or use Activity Monitor)"
+echo "• To stop the pet: python3 petctl.py quit"
 echo "• To uninstall: ./uninstall.sh"
 echo
 echo "Pet Features:"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Asyncio main-loop mode for the desktop pet.
+An asyncio event loop drives Tk instead of root.mainloop(): the pet's
+scheduler timers become loop.call_later handles, Tk's window events are
+pumped with dooneevent, and the control socket is an asyncio server, so
+other async tasks can share the pet's thread.
+
+Tk has no file descriptor to hand to the loop on every platform, so its
+events are pumped whenever a scheduler job runs (which is also when the
+pet has something new to draw), and polled at frame rate while the pointer
+is over the pets, a few times a second otherwise.
+
+    python3 desktop_pet.py --asyncio
+
+or, from your own async code:
+
+    pet = DesktopPet()
+    await run_async(pet)
+"""
+
+import asyncio
+import sys
+
+import _tkinter
+
+from pet_core import FRAME_SECONDS
+from pet_control import AsyncControlServer, PipeControlServer
+
+# Clicks, motion and drags only arrive when Tk is pumped, and no scheduler job drives them
+POINTER_PUMP_SECONDS = FRAME_SECONDS
+
+# Otherwise poll often enough that a click or a Map/Expose is handled without a visible lag
+IDLE_PUMP_SECONDS = 0.1
+HIDDEN_PUMP_SECONDS = 0.25
+
+
+def pump_interval(pet):
+    """Longest Tk may wait for a pump; scheduler jobs wake it sooner"""
+    if pet.pointer_inside or pet.dragged:
+        return POINTER_PUMP_SECONDS
+    if not pet.visible:
+        return HIDDEN_PUMP_SECONDS  # Just notice being shown again
+    return IDLE_PUMP_SECONDS
+
+
+async def pump_tk(pet, closed, wake):
+    """Process pending Tk events whenever woken (or polled), until the window closes"""
+    tkapp = pet.root.tk
+    flags = _tkinter.ALL_EVENTS | _tkinter.DONT_WAIT
+    while not closed.done():
+        wake.clear()
+        while tkapp.dooneevent(flags):
+            pass
+        if closed.done():
+            break
+        try:
+            await asyncio.wait_for(wake.wait(), pump_interval(pet))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_control(pet):
+    """Command socket on this loop (Windows keeps its pipe thread)"""
+    if sys.platform == 'win32':
+        # Tk isn't in its mainloop, so the pipe thread hands commands over through the loop
+        loop = asyncio.get_running_loop()
+        pet.control = PipeControlServer(pet.root, pet.handle_command,
+                                        notify=loop.call_soon_threadsafe)
+        return pet.control
+    return await AsyncControlServer(pet.handle_command).start()
+
+
+async def run_async(pet, serve_control=True):
+    """Run the pet on the current asyncio loop until its window is closed"""
+    loop = asyncio.get_running_loop()
+
+    wake = asyncio.Event()
+
+    def call_later(ms, func):
+        def fire():
+            func()
+            wake.set()  # Let Tk draw what the jobs changed and take in new input
+        return loop.call_later(ms / 1000, fire)
+
+    # Scheduler deadlines now wake the asyncio loop instead of Tk's
+    pet.scheduler.set_timer(call_later, lambda handle: handle.cancel())
+
+    closed = loop.create_future()
+
+    def on_destroy(event):
+        if event.widget is pet.root and not closed.done():
+            closed.set_result(None)
+            wake.set()
+
+    pet.root.bind('<Destroy>', on_destroy, add='+')
+
+    if pet.worker is not None:
+        # event_generate from the worker side stalls while Tk isn't in its mainloop
+        def decisions_ready():
+            try:
+                loop.call_soon_threadsafe(pet.apply_decisions)
+            except RuntimeError:
+                pass  # Loop already closed; nothing left to apply them to
+
+        pet.worker.notify = decisions_ready
+
+    control = None
+    if serve_control:
+        try:
+            control = await start_control(pet)
+        except OSError as e:
+            print(f"Note: control socket unavailable ({e}); petctl.py won't reach this pet")
+    try:
+        await pump_tk(pet, closed, wake)
+    finally:
+        pet.scheduler.clear()  # The window is gone; don't let timers touch it
+        if pet.worker is not None:
+            pet.worker.close()
+        if pet.recorder is not None:
+            pet.recorder.close()
+        if control is not None:
+            control.close()
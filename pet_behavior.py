@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Table-driven behavior model for the pet.
+Behaviors are a Markov chain loaded from behaviors.json: every state has a
+dwell time (seconds between decisions) and a row of transition
+probabilities. Rows are compiled into alias tables so picking the next
+state costs one random number and one lookup however many states there
+are, and the chain's long-run behavior can be computed exactly instead of
+by simulation.
+
+"walking" is special: the pet enters it by wandering to a random spot and
+leaves it by arriving (back to idle), so it needs no transition row.
+"""
+
+import json
+import math
+import os
+
+BEHAVIORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'behaviors.json')
+
+# States left by motion rather than by a decision, and where they go
+MOTION_EXITS = {'walking': 'idle'}
+
+
+def alias_table(weights):
+    """Vose's alias method: (probability, alias) lists for O(1) sampling"""
+    count = len(weights)
+    scaled = [weight * count for weight in weights]
+    probability = [1.0] * count
+    alias = list(range(count))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        probability[low] = scaled[low]
+        alias[low] = high
+        scaled[high] += scaled[low] - 1.0
+        (small if scaled[high] < 1.0 else large).append(high)
+    return probability, alias
+
+
+def solve(matrix, vector):
+    """Solve a small linear system by Gaussian elimination with partial pivoting"""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(rows[r][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for r in range(size):
+            if r != column and rows[r][column]:
+                factor = rows[r][column] / rows[column][column]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[column])]
+    return [rows[i][size] / rows[i][i] for i in range(size)]
+
+
+def multiply(a, b):
+    """Product of two small matrices given as lists of rows"""
+    columns = list(zip(*b))
+    return [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in a]
+
+
+def mean_rectangle_distance(width, height):
+    """Mean distance between two uniformly random points in a width x height box"""
+    a, b = float(width), float(height)
+    d = math.hypot(a, b)
+    return (a ** 3 / b ** 2 + b ** 3 / a ** 2 + d * (3 - a ** 2 / b ** 2 - b ** 2 / a ** 2)
+            + 2.5 * (b ** 2 / a * math.log((a + d) / b) + a ** 2 / b * math.log((b + d) / a))) / 15
+
+
+def walk_seconds(width, height, walk_speed, ease_seconds, arrive_distance=3.0):
+    """Expected length of a random wander across a width x height area
+
+    Full stride until within walk_speed * ease_seconds of the target, then
+    an exponential ease down to arrive_distance.
+    """
+    distance = mean_rectangle_distance(width, height)
+    ease_distance = walk_speed * ease_seconds
+    if distance <= ease_distance:
+        return ease_seconds * math.log(max(distance, arrive_distance) / arrive_distance)
+    return (distance - ease_distance) / walk_speed + ease_seconds * math.log(ease_distance / arrive_distance)
+
+
+class BehaviorModel:
+    """Markov chain over pet states, compiled for O(1) sampling"""
+
+    def __init__(self, dwell_seconds, transitions):
+        self.dwell_seconds = dict(dwell_seconds)
+        self.transitions = {state: dict(row) for state, row in transitions.items()}
+        self.states = list(self.dwell_seconds)
+        self.stationary_cache = None  # The model never changes, so solve it once
+        self.squares = {}  # Chain name -> [P, P^2, P^4, ...] as far as needed so far
+
+        self.tables = {}  # State -> (next states, probabilities, aliases)
+        for state in self.states:
+            row = self.transitions.get(state)
+            if row is None:
+                if state not in MOTION_EXITS:
+                    raise ValueError(f"state {state!r} has no transitions")
+                row = {state: 1.0}  # Only motion ends it; decisions keep it
+            unknown = set(row) - set(self.states)
+            if unknown:
+                raise ValueError(f"{state!r} moves to unknown states {sorted(unknown)}")
+            if abs(sum(row.values()) - 1.0) > 1e-6:
+                raise ValueError(f"transitions from {state!r} sum to {sum(row.values())}, not 1")
+            names = [name for name, p in row.items() if p > 0]
+            probability, alias = alias_table([row[name] for name in names])
+            self.tables[state] = (names, probability, alias)
+
+    @classmethod
+    def load(cls, name, path=BEHAVIORS_PATH):
+        """Read one named model from the behaviors config"""
+        with open(path) as f:
+            config = json.load(f)[name]
+        return cls(config['dwell_seconds'], config['transitions'])
+
+    def sample(self, state, u):
+        """Next state for a uniform random u in [0, 1)"""
+        names, probability, alias = self.tables[state]
+        scaled = u * len(names)
+        index = int(scaled)
+        # The fractional part is a second uniform number for the alias coin flip
+        if scaled - index < probability[index]:
+            return names[index]
+        return names[alias[index]]
+
+    def probability(self, state, next_state):
+        return self.transitions.get(state, {}).get(next_state, 0.0)
+
+    def rate(self, state, next_state):
+        """Chance per second of moving from state to next_state"""
+        return self.probability(state, next_state) / self.dwell_seconds[state]
+
+    def jump_matrix(self):
+        """Per-decision transition matrix, with motion exits in place of decisions"""
+        matrix = []
+        for state in self.states:
+            if state in MOTION_EXITS and state not in self.transitions:
+                row = {MOTION_EXITS[state]: 1.0}
+            else:
+                row = self.transitions[state]
+            matrix.append([row.get(other, 0.0) for other in self.states])
+        return matrix
+
+    def stationary(self):
+        """Long-run share of decisions made in each state"""
+        if self.stationary_cache is None:
+            self.stationary_cache = self.solve_stationary()
+        return self.stationary_cache
+
+    def solve_stationary(self):
+        matrix = self.jump_matrix()
+        size = len(self.states)
+        # pi (P - I) = 0 with sum(pi) = 1; the last balance equation is redundant
+        system = [[matrix[j][i] - (1.0 if i == j else 0.0) for j in range(size)]
+                  for i in range(size - 1)]
+        system.append([1.0] * size)
+        pi = solve(system, [0.0] * (size - 1) + [1.0])
+        return dict(zip(self.states, pi))
+
+    def sojourn_seconds(self, state, walk_time):
+        """Time spent per step of the jump chain in a state"""
+        if state in MOTION_EXITS and state not in self.transitions:
+            return walk_time
+        return self.dwell_seconds[state]
+
+    def expected_visit_seconds(self, state, walk_time=0.0):
+        """Expected unbroken time in a state once entered"""
+        stay = self.probability(state, state) if state in self.transitions else 0.0
+        return self.sojourn_seconds(state, walk_time) / (1.0 - stay)
+
+    def time_fractions(self, walk_time):
+        """Long-run share of time spent in each state (cursor following aside)
+
+        walk_time is the expected length of one wander, e.g. from walk_seconds().
+        """
+        pi = self.stationary()
+        weights = {state: pi[state] * self.sojourn_seconds(state, walk_time)
+                   for state in self.states}
+        total = sum(weights.values())
+        return {state: weight / total for state, weight in weights.items()}
+
+    def mean_jump_seconds(self, walk_time):
+        """Long-run average time between steps of the jump chain"""
+        pi = self.stationary()
+        return sum(pi[state] * self.sojourn_seconds(state, walk_time) for state in self.states)
+
+    def outlook(self, state, jumps, walk_time):
+        """Where the chain may be after some jumps from state, in closed form
+
+        Returns (chance of being in each state, chance no walk happened on
+        the way). States are weighted by how long a stay in each lasts, so
+        many jumps settle on time_fractions().
+        """
+        start = self.states.index(state)
+        row = self.after_jumps('jumps', start, jumps)
+        weights = [p * self.sojourn_seconds(name, walk_time) for name, p in zip(self.states, row)]
+        total = sum(weights)
+        never_walked = sum(self.after_jumps('no_walks', start, jumps))
+        return dict(zip(self.states, (weight / total for weight in weights))), never_walked
+
+    def after_jumps(self, chain, start, jumps):
+        """Row start of a chain's matrix to the power jumps, by binary powers"""
+        squares = self.squares.get(chain)
+        if squares is None:
+            matrix = self.jump_matrix()
+            if chain == 'no_walks':
+                # The same chain with every way into a walk removed: what's left never walked
+                matrix = [[0.0 if name in MOTION_EXITS else p for name, p in zip(self.states, row)]
+                          for row in matrix]
+            squares = self.squares[chain] = [matrix]
+        row = [1.0 if i == start else 0.0 for i in range(len(self.states))]
+        bit = 0
+        while jumps:
+            if bit == len(squares):
+                squares.append(multiply(squares[-1], squares[-1]))
+            if jumps & 1:
+                row = multiply([row], squares[bit])[0]
+            jumps >>= 1
+            bit += 1
+        return row
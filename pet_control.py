@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Single-instance lock and local control channel for the running pet.
+The first pet to start holds a lock file; it then listens on a Unix-domain
+socket (a named pipe on Windows) for one-line commands such as play, sleep,
+status, stats and quit, answering each with one JSON reply.
+"""
+
+import asyncio
+import errno
+import getpass
+import json
+import os
+import queue
+import socket
+import sys
+import tempfile
+import threading
+import tkinter as tk
+
+try:
+    import fcntl
+except ImportError:
+    # Windows locks with msvcrt instead
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+COMMANDS = ['play', 'sleep', 'status', 'stats', 'quit']
+
+# Clients send their command straight away; one that doesn't is dropped after this long
+CLIENT_TIMEOUT_MS = 1000
+
+
+def runtime_path(suffix):
+    """Per-user path for the lock file or socket"""
+    if sys.platform == 'win32':
+        name = f"desktop-pet-{getpass.getuser()}{suffix}"
+        return os.path.join(tempfile.gettempdir(), name)
+    runtime = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime, f"desktop-pet-{os.getuid()}{suffix}")
+
+
+def control_address():
+    """Where the running pet listens for commands"""
+    if sys.platform == 'win32':
+        return r'\\.\pipe\desktop-pet-' + getpass.getuser()
+    return runtime_path('.sock')
+
+
+class InstanceLock:
+    """Exclusive lock file held for as long as the pet runs"""
+
+    def __init__(self, path=None):
+        self.path = path or runtime_path('.lock')
+        self.file = None
+
+    def acquire(self):
+        """Take the lock; False if another pet already holds it
+
+        A lock file that can't be opened at all (permissions, a missing
+        runtime directory) is reported and the pet runs without the lock;
+        its control server still won't take over a live pet's socket.
+        """
+        try:
+            self.file = open(self.path, 'a+')
+        except OSError as e:
+            print(f"Note: can't open the instance lock {self.path} ({e}); "
+                  f"not checking for another running pet")
+            return True
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            self.file.close()
+            self.file = None
+            return False
+        return True
+
+    def release(self):
+        # Closing the file drops the lock
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def remove_stale_socket(path):
+    """Delete a socket file nobody listens on; OSError if a pet still does
+
+    Normally only the lock holder gets this far, but a pet that couldn't
+    open its lock file may be a second instance.
+    """
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(0.5)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)  # Left behind by a pet that is gone
+        return
+    except OSError:
+        pass  # Busy or slow to accept, but there
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "another pet is listening on", path)
+
+
+def reply_bytes(handler, command):
+    """Run a command through the handler and encode its reply"""
+    try:
+        reply = handler(command.strip())
+    except Exception as e:
+        reply = {'error': str(e)}
+    return json.dumps(reply).encode()
+
+
+class ControlClient:
+    """One connection to the Unix socket, read as its bytes arrive so Tk never waits"""
+
+    def __init__(self, server, conn):
+        self.server = server
+        self.conn = conn
+        self.data = b''
+        conn.setblocking(False)
+        server.root.tk.createfilehandler(conn, tk.READABLE, self.on_readable)
+        self.timer = server.root.after(CLIENT_TIMEOUT_MS, self.close)
+
+    def on_readable(self, conn, mask):
+        try:
+            chunk = conn.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b''
+        self.data += chunk
+        if chunk and b"\n" not in self.data:
+            return  # The rest of the line is still on its way
+        if self.data:
+            command = self.data.split(b"\n", 1)[0].decode(errors='replace')
+            try:
+                conn.sendall(reply_bytes(self.server.handler, command) + b"\n")
+            except OSError:
+                pass  # Client gone, or not reading its reply
+        self.close()
+
+    def close(self):
+        if self.conn is None:
+            return
+        self.server.root.after_cancel(self.timer)
+        self.server.root.tk.deletefilehandler(self.conn)
+        self.conn.close()
+        self.conn = None
+        self.server.clients.discard(self)
+
+
+class UnixControlServer:
+    """Unix socket watched by Tk's own event loop, so no thread or polling"""
+
+    def __init__(self, root, handler, path=None):
+        self.root = root
+        self.handler = handler  # command string -> JSON-serializable reply
+        self.path = path or control_address()
+
+        remove_stale_socket(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.sock.listen(4)
+        self.sock.setblocking(False)
+        self.clients = set()
+        root.tk.createfilehandler(self.sock, tk.READABLE, self.on_readable)
+
+    def on_readable(self, sock, mask):
+        """Accept one client; its command is answered once it has arrived"""
+        try:
+            conn, _ = self.sock.accept()
+        except BlockingIOError:
+            return
+        self.clients.add(ControlClient(self, conn))
+
+    def close(self):
+        for client in list(self.clients):
+            client.close()
+        self.root.tk.deletefilehandler(self.sock)
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class PipeControlServer:
+    """Windows named pipe served by a thread that hands commands to the Tk thread"""
+
+    def __init__(self, root, handler, address=None, notify=None):
+        from multiprocessing.connection import Listener
+        self.root = root
+        self.handler = handler
+        self.listener = Listener(address or control_address(), family='AF_PIPE')
+        self.requests = queue.Queue()
+        # Called from the pipe thread with on_command, to have it run on the UI thread.
+        # Tk's event_generate only works while Tk's mainloop runs; an asyncio loop
+        # passes its own call_soon_threadsafe instead
+        self.notify = notify or self.generate_event
+        root.bind('<<PetCommand>>', self.on_command)
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return  # Listener closed
+            with conn:
+                try:
+                    reply = queue.Queue(maxsize=1)
+                    self.requests.put((conn.recv_bytes().decode(errors='replace'), reply))
+                    self.notify(self.on_command)
+                    conn.send_bytes(reply.get(timeout=5.0))
+                except (EOFError, OSError, queue.Empty, RuntimeError, tk.TclError):
+                    pass  # This client goes unanswered; keep serving the next one
+
+    def generate_event(self, callback):
+        """Wake the Tk thread, which runs on_command for <<PetCommand>>"""
+        self.root.event_generate('<<PetCommand>>', when='tail')
+
+    def on_command(self, event=None):
+        """Run queued commands on the Tk thread"""
+        while True:
+            try:
+                command, reply = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            reply.put(reply_bytes(self.handler, command))
+
+    def close(self):
+        self.listener.close()
+
+
+class AsyncControlServer:
+    """Unix socket served by a running asyncio loop, for the asyncio main-loop mode"""
+
+    def __init__(self, handler, path=None):
+        self.handler = handler
+        self.path = path or control_address()
+        self.server = None
+
+    async def start(self):
+        remove_stale_socket(self.path)
+        self.server = await asyncio.start_unix_server(self.on_client, self.path)
+        os.chmod(self.path, 0o600)
+        return self
+
+    async def on_client(self, reader, writer):
+        """Answer one client"""
+        try:
+            command = await asyncio.wait_for(reader.readline(), 1.0)
+            writer.write(reply_bytes(self.handler, command.decode(errors='replace')) + b"\n")
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.server.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def make_control_server(root, handler, address=None):
+    """Listen for commands the way this platform supports"""
+    if sys.platform == 'win32':
+        return PipeControlServer(root, handler, address)
+    return UnixControlServer(root, handler, address)
+
+
+def send_command(command, address=None, timeout=2.0):
+    """Send one command to the running pet and return its reply
+
+    Raises OSError if no pet is running.
+    """
+    address = address or control_address()
+    if sys.platform == 'win32':
+        from multiprocessing.connection import Client
+        with Client(address, family='AF_PIPE') as conn:
+            conn.send_bytes(command.encode())
+            return json.loads(conn.recv_bytes())
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall(command.encode() + b"\n")
+        data = sock.makefile('rb').readline()
+    if not data:
+        raise ConnectionError("the pet closed the connection without replying")
+    return json.loads(data)
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+Headless simulation core for the desktop pet.
+Owns the pet's position, target and state as plain attributes and advances
+with step(dt), so all behavior runs without a Tk display.
+"""
+
+import math
+import random
+import time
+
+from pet_behavior import BehaviorModel, walk_seconds
+
+# Logic runs on a fixed timestep (the original 100 ms behavior loop)
+TICK_SECONDS = 0.1
+
+# Behavior wakeups back off to this while nothing can react (sleeping, cursor far away)
+RESTING_TICK_SECONDS = 2.0
+
+# Behavior wakeups while the container can't be seen at all (covered, minimized)
+HIDDEN_TICK_SECONDS = 10.0
+
+# A gap this long (suspend, a stalled machine) is skipped in closed form, not replayed tick by tick
+CATCH_UP_SECONDS = 3 * HIDDEN_TICK_SECONDS
+
+# Timers may fire a little early; treat a tick this close to due as due
+TICK_TOLERANCE = 0.002
+
+# Redraw rate used to interpolate between logic ticks while the pet moves
+FRAME_SECONDS = 1 / 30
+
+# Integer codes for the built-in states (a behavior model may add more after these)
+STATES = ['idle', 'walking', 'sleep', 'play']
+IDLE, WALKING, SLEEP, PLAY = range(4)
+
+# Sprites (emoji) and animation sequences shared by every front end
+PET_SPRITES = {
+    'idle1': '🐱',
+    'idle2': '😺',
+    'walk1': '🐾',
+    'walk2': '🐱',
+    'sleep': '😴',
+    'play': '😸'
+}
+
+ANIMATIONS = {
+    'idle': ['idle1', 'idle2', 'idle1', 'idle1'],
+    'walking': ['walk1', 'walk2', 'walk1', 'walk2'],
+    'sleep': ['sleep', 'sleep', 'sleep', 'sleep'],
+    'play': ['play', 'idle1', 'play', 'idle2']
+}
+
+# Tunables for the installed desktop pet
+DESKTOP_PROFILE = {
+    'behavior': BehaviorModel.load('desktop'),  # State changes, from behaviors.json
+    'follow_states': ('idle',),
+    'follow_band': 50,          # Cursor must be this close to the container
+    'wake_margin': 100,         # Resume full rate once the cursor is this close to the band
+    'follow_min': 30,
+    'follow_max': 150,
+    'walk_speed': 15.0,         # Pixels per second at full stride
+    'ease_seconds': 0.8,        # Slow down over roughly this long when arriving
+}
+
+# Tunables for the interactive test window
+INTERACTIVE_PROFILE = dict(
+    DESKTOP_PROFILE,
+    behavior=BehaviorModel.load('interactive'),
+    follow_states=('idle', 'walking'),
+    follow_max=100,
+    walk_speed=20.0,
+    ease_seconds=0.6,
+)
+
+
+def bounce_offset(state, frame, height):
+    """Vertical draw offset for the walking bounce
+
+    Purely cosmetic: added when drawing, never to the simulated position,
+    so it stays within +/-height however long the pet walks.
+    """
+    if state != "walking":
+        return 0
+    phase = frame % 4
+    if phase == 0:
+        return height
+    if phase == 1:
+        return -height
+    return 0
+
+
+class Animation:
+    """Frame clock for one pet's sprite animation, driven by elapsed time"""
+
+    def __init__(self, frame_seconds=0.5, sleep_frame_seconds=0.8, bounce_height=2,
+                 animations=None):
+        self.frame_seconds = frame_seconds
+        self.sleep_frame_seconds = sleep_frame_seconds  # Slower for sleep
+        self.bounce_height = bounce_height
+        self.animations = animations or ANIMATIONS
+        self.phase = 0.0
+        self.frame = 0
+        self.sprite = 'idle1'
+        self.bounce = 0
+
+    def frame_duration(self, state):
+        return self.sleep_frame_seconds if state == "sleep" else self.frame_seconds
+
+    def advance(self, state, elapsed):
+        """Move the animation on by elapsed seconds; True if the sprite changed"""
+        # Frames come from elapsed time so a stalled loop doesn't slow the animation
+        self.phase += elapsed / self.frame_duration(state)
+        self.frame = round(self.phase)
+
+        sequence = self.animations.get(state, self.animations['idle'])
+        sprite = sequence[self.frame % len(sequence)]
+        self.bounce = bounce_offset(state, self.frame, self.bounce_height)
+
+        changed = sprite != self.sprite
+        self.sprite = sprite
+        return changed
+
+
+class WakeDetector:
+    """Notices time the machine spent suspended
+
+    time.monotonic() stops during suspend on Linux and macOS, so a wake-up
+    only shows as the wall clock jumping further than the monotonic clock.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.last = clock()
+
+    def missed(self, elapsed):
+        """Suspended seconds on top of elapsed monotonic seconds (0 for small drift)"""
+        now = self.clock()
+        missed = now - self.last - elapsed
+        self.last = now
+        return missed if missed >= CATCH_UP_SECONDS else 0.0
+
+
+class PetSimulation:
+    """Pure-Python pet state machine, driven by step(dt)
+
+    Slotted, with the state held as an integer code (state is the name, for
+    callers), and the per-tick path touches only these slots: a pet living
+    for weeks doesn't churn the heap or give the GC anything to do.
+    """
+
+    __slots__ = ('container_width', 'container_height', 'pet_radius', 'profile', 'rng',
+                 'behavior', 'state_names', 'state_codes', 'decision_ticks', 'follows',
+                 'walk_speed', 'ease_seconds', 'follow_band', 'follow_min', 'follow_max',
+                 'reach', 'right', 'bottom', 'target_right', 'target_bottom', 'follow_box',
+                 'reach_box', 'x', 'y', 'target_x', 'target_y', 'prev_x', 'prev_y', 'code',
+                 'idle_counter', 'is_dragging', 'cursor_x', 'cursor_y', 'ticks',
+                 'accumulator', 'resting', 'decide_inline', 'navigator', 'waypoints',
+                 'route_request')
+
+    def __init__(self, container_width, container_height, pet_radius=16,
+                 profile=None, rng=None):
+        self.container_width = container_width
+        self.container_height = container_height
+        self.pet_radius = pet_radius
+        self.profile = dict(DESKTOP_PROFILE, **(profile or {}))
+        self.rng = rng or random
+        self.behavior = self.profile['behavior']
+
+        # States by code, plus per-code lookups for the tick path
+        self.state_names = STATES + [name for name in self.behavior.states if name not in STATES]
+        self.state_codes = {name: code for code, name in enumerate(self.state_names)}
+        dwell = self.behavior.dwell_seconds
+        # Ticks between decisions in each state
+        self.decision_ticks = [round(dwell.get(name, 0.0) / TICK_SECONDS)
+                               for name in self.state_names]
+        self.follows = [name in self.profile['follow_states'] for name in self.state_names]
+
+        # Tunables read every tick, copied out of the profile dict
+        self.walk_speed = self.profile['walk_speed']
+        self.ease_seconds = self.profile['ease_seconds']
+        self.follow_band = self.profile['follow_band']
+        self.follow_min = self.profile['follow_min']
+        self.follow_max = self.profile['follow_max']
+        self.reach = self.follow_band + self.profile['wake_margin']
+
+        # Edges worked out once: ints outside -5..256 are new objects every time they're computed
+        self.right = container_width - (pet_radius + 5)  # Farthest move_to goes
+        self.bottom = container_height - (pet_radius + 5)
+        self.target_right = container_width - (pet_radius + 10)  # Farthest set_target aims
+        self.target_bottom = container_height - (pet_radius + 10)
+        band, reach = self.follow_band, self.reach
+        self.follow_box = (-band, -band, container_width + band, container_height + band)
+        self.reach_box = (-reach, -reach, container_width + reach, container_height + reach)
+
+        # Pet state (start in center)
+        self.x = container_width // 2
+        self.y = container_height // 2
+        self.target_x = self.x
+        self.target_y = self.y
+        self.prev_x = self.x  # Position before the last tick, for interpolation
+        self.prev_y = self.y
+        self.code = IDLE  # Index into state_names
+        self.idle_counter = 0
+        self.is_dragging = False
+
+        # Last known cursor position in container coordinates (None if unknown)
+        self.cursor_x = None
+        self.cursor_y = None
+
+        self.ticks = 0
+        self.accumulator = 0.0
+        self.resting = False
+
+        # False when a DecisionWorker makes the behavior decisions off the UI thread
+        self.decide_inline = True
+
+        # Optional NavGrid: walk around obstacles through waypoints instead of straight
+        self.navigator = None
+        self.waypoints = []  # Corners still to pass, ending at the target (reused)
+        self.route_request = None  # Target the current route was planned for
+
+    @property
+    def state(self):
+        """Current state name: idle, walking, sleep, play, or one from the behavior model"""
+        return self.state_names[self.code]
+
+    @state.setter
+    def state(self, name):
+        self.code = self.state_codes[name]
+
+    def step(self, dt):
+        """Advance the simulation by dt seconds, returning the ticks run"""
+        if dt >= CATCH_UP_SECONDS:
+            self.fast_forward(dt)
+            return 0
+        self.accumulator += dt
+        ticks = 0
+        while self.accumulator >= TICK_SECONDS - TICK_TOLERANCE:
+            self.accumulator -= TICK_SECONDS
+            self.tick()
+            ticks += 1
+            if self.resting and not self.is_resting():
+                # Woke up during a backed-off gap: carry on from now, don't replay the rest
+                self.accumulator = 0.0
+                break
+        self.resting = self.is_resting()
+        return ticks
+
+    def fast_forward(self, seconds):
+        """Skip a long gap in closed form: where the pet would likely be by now
+
+        A walk in progress finishes at its target; the rest of the gap is
+        sampled from the behavior model's jump chain (one matrix power, not
+        one tick per 100 ms), so waking from suspend costs next to nothing.
+        """
+        self.accumulator = 0.0
+        if self.is_dragging:
+            return  # The pointer still holds the pet; nothing to catch up
+
+        if self.code == WALKING:
+            distance = math.hypot(self.target_x - self.x, self.target_y - self.y)
+            seconds -= distance / self.walk_speed
+            self.move_to(self.target_x, self.target_y)
+            self.waypoints.clear()
+            self.code = IDLE
+            self.idle_counter = 0
+
+        margin = 2 * (self.pet_radius + 20)
+        walk_time = walk_seconds(self.container_width - margin, self.container_height - margin,
+                                 self.walk_speed, self.ease_seconds)
+        # Time already spent in this state counts toward its next decision
+        waited = self.idle_counter * TICK_SECONDS + max(0.0, seconds)
+        jump_seconds = self.behavior.mean_jump_seconds(walk_time)
+        jumps = int(waited / jump_seconds)
+        if jumps:
+            chances, never_walked = self.behavior.outlook(self.state, jumps, walk_time)
+            if self.rng.random() >= never_walked:
+                # It wandered off at some point: end up somewhere random
+                margin = self.pet_radius + 20
+                self.place(self.rng.randint(margin, self.container_width - margin),
+                           self.rng.randint(margin, self.container_height - margin))
+            u = self.rng.random()
+            for state, chance in chances.items():
+                u -= chance
+                if u < 0:
+                    break
+            if state == "walking":
+                self.wander_randomly()
+            else:
+                self.state = state
+            waited -= jumps * jump_seconds
+        self.idle_counter = min(int(waited / TICK_SECONDS), self.decision_ticks[self.code])
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.resting = self.is_resting()
+
+    def is_resting(self):
+        """True when nothing but the next random decision can change the pet"""
+        if self.is_dragging or self.code == WALKING:
+            return False
+        if not self.follows[self.code]:
+            return True
+        return not self.cursor_near()
+
+    def cursor_near(self):
+        """Check if the cursor is close enough that the pet may soon follow it"""
+        if self.cursor_x is None:
+            return False
+        left, top, right, bottom = self.reach_box
+        return left <= self.cursor_x <= right and top <= self.cursor_y <= bottom
+
+    def wants_cursor(self):
+        """True if the pet could react to the cursor on its next tick"""
+        return not self.is_dragging and self.follows[self.code]
+
+    def tick_interval(self):
+        """How long the driver may wait before the next step"""
+        return RESTING_TICK_SECONDS if self.resting else TICK_SECONDS
+
+    def is_moving(self):
+        """True while the pet walks on its own and needs smooth redraws"""
+        return self.code == WALKING and not self.is_dragging
+
+    def render_position(self, elapsed=0.0):
+        """Position to draw, blended between the last two ticks
+
+        elapsed is the time since the last step() call.
+        """
+        alpha = (self.accumulator + elapsed) / TICK_SECONDS
+        if alpha >= 1.0:
+            return self.x, self.y
+        if alpha <= 0.0:
+            return self.prev_x, self.prev_y
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def tick(self):
+        """Run one fixed logic tick"""
+        self.ticks += 1
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.decide_inline:
+            self.decide()
+            self.follow_cursor()
+        else:
+            self.idle_counter += 1  # The worker decides once the interval has passed
+        self.update_position(TICK_SECONDS)
+
+    def decide(self):
+        """Random behavior changes"""
+        self.idle_counter += 1
+
+        if self.idle_counter > self.decision_ticks[self.code]:
+            self.choose()
+            self.idle_counter = 0
+
+    def choose(self):
+        """Pick the next behavior once the state's dwell time has passed"""
+        code = self.state_codes[self.behavior.sample(self.state, self.rng.random())]
+        if code == self.code:
+            return
+        if code == WALKING:
+            self.wander_randomly()
+        else:
+            self.code = code
+
+    def snapshot(self, index):
+        """Inputs the decision layer needs, as a plain (picklable) tuple"""
+        return (index, self.x, self.y, self.state, self.target_x, self.target_y,
+                self.idle_counter, self.cursor_x, self.cursor_y, self.is_dragging)
+
+    def think(self, snapshot):
+        """Make one tick's decisions for a snapshot, returning the outcome
+
+        Runs on a scratch simulation in the worker; the result is applied to
+        the real pet with apply_decision().
+        """
+        (index, self.x, self.y, self.state, self.target_x, self.target_y,
+         self.idle_counter, self.cursor_x, self.cursor_y, self.is_dragging) = snapshot
+        decided = self.idle_counter > self.decision_ticks[self.code]
+        if decided:
+            self.choose()
+        self.follow_cursor()
+        # The decision only holds if the pet's state and target are still what we saw
+        basis = snapshot[3:6]
+        return (index,) + basis + (self.state, self.target_x, self.target_y, decided)
+
+    def apply_decision(self, decision):
+        """Adopt a worker's decision; True if it changed what the pet is doing"""
+        _, state, target_x, target_y, new_state, new_x, new_y, decided = decision
+        if (self.is_dragging or self.state != state or
+                self.target_x != target_x or self.target_y != target_y):
+            return False  # Pet changed since the snapshot (drag, trigger, arrival); stale
+        if decided:
+            self.idle_counter = 0
+        if (new_state, new_x, new_y) == (state, target_x, target_y):
+            return False
+        self.state = new_state
+        self.target_x = new_x
+        self.target_y = new_y
+        if new_state == "walking":
+            self.plan_route()
+        return True
+
+    def set_cursor(self, x, y):
+        """Record the cursor position relative to the container"""
+        self.cursor_x = x
+        self.cursor_y = y
+
+    def follow_cursor(self):
+        """Make pet follow cursor when idle"""
+        if self.is_dragging or not self.follows[self.code]:
+            return
+        if self.cursor_x is None:
+            return
+
+        cursor_x, cursor_y = self.cursor_x, self.cursor_y
+        left, top, right, bottom = self.follow_box
+
+        # Only follow if cursor is within or near the container
+        if left <= cursor_x <= right and top <= cursor_y <= bottom:
+            distance = math.hypot(cursor_x - self.x, cursor_y - self.y)
+
+            # Follow if cursor is close but not too close
+            if self.follow_min < distance < self.follow_max:
+                self.set_target(cursor_x, cursor_y)
+
+    def update_position(self, dt):
+        """Smoothly move pet towards target over dt seconds"""
+        if self.code != WALKING or self.is_dragging:
+            return
+
+        if len(self.waypoints) > 1:
+            # A corner on the way around an obstacle: full stride, no easing
+            waypoint_x, waypoint_y = self.waypoints[0]
+            dx = waypoint_x - self.x
+            dy = waypoint_y - self.y
+            distance = math.hypot(dx, dy)
+            step_size = self.walk_speed * dt
+            if distance <= step_size:
+                self.move_to(waypoint_x, waypoint_y)
+                del self.waypoints[0]
+            else:
+                self.move_to(self.x + (dx / distance) * step_size,
+                             self.y + (dy / distance) * step_size)
+            return
+
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        distance = math.hypot(dx, dy)
+
+        if distance > 3:
+            # Walk at a steady speed, easing off near the target
+            speed = distance / self.ease_seconds
+            if speed > self.walk_speed:
+                speed = self.walk_speed  # Not min(): its argument tuple is an allocation per tick
+            step_size = speed * dt
+            self.move_to(self.x + (dx / distance) * step_size,
+                         self.y + (dy / distance) * step_size)
+        else:
+            self.code = IDLE
+            self.idle_counter = 0  # Idle's dwell time starts on arrival
+
+    def clamp(self, x, y, margin):
+        """Clamp a point to the container, keeping margin from the edges"""
+        x = max(margin, min(x, self.container_width - margin))
+        y = max(margin, min(y, self.container_height - margin))
+        return x, y
+
+    def place(self, x, y):
+        """Put the pet somewhere and stand still there"""
+        self.move_to(x, y)
+        self.prev_x = self.target_x = self.x
+        self.prev_y = self.target_y = self.y
+
+    def move_to(self, x, y):
+        """Place the pet, keeping it within container bounds"""
+        # clamp() inlined: this runs every tick while walking
+        margin = self.pet_radius + 5
+        right = self.right
+        bottom = self.bottom
+        self.x = margin if x < margin else right if x > right else x
+        self.y = margin if y < margin else bottom if y > bottom else y
+
+    def set_target(self, x, y):
+        """Set specific target coordinates and start walking"""
+        # clamp() inlined: this runs every tick while following the cursor
+        margin = self.pet_radius + 10
+        x = margin if x < margin else self.target_right if x > self.target_right else x
+        y = margin if y < margin else self.target_bottom if y > self.target_bottom else y
+        request = self.route_request
+        if self.code == WALKING and request is not None:
+            if x == request[0] and y == request[1]:
+                return  # Already on the way (following a still cursor); keep the route
+            if (self.waypoints and self.waypoints[-1] is request and
+                    self.navigator.same_cell(x, y, request[0], request[1])):
+                # The cursor moved within the goal cell: same corners, only the end moves
+                self.target_x = x
+                self.target_y = y
+                self.route_request = self.waypoints[-1] = (x, y)
+                return
+        self.target_x = x
+        self.target_y = y
+        self.code = WALKING
+        self.plan_route()
+
+    def plan_route(self):
+        """Route to the target around obstacles (a straight line without a navigator)"""
+        if self.navigator is None:
+            return
+        self.route_request = (self.target_x, self.target_y)
+        self.navigator.find_path(self.x, self.y, self.target_x, self.target_y, self.waypoints)
+        if self.waypoints[-1] == self.route_request:
+            self.waypoints[-1] = self.route_request  # Shared, so set_target can spot it
+        else:
+            # A target inside an obstacle is moved to the nearest free spot
+            self.target_x, self.target_y = self.waypoints[-1]
+
+    def wander_randomly(self):
+        """Make pet wander to a random spot in the container"""
+        if not self.is_dragging:
+            margin = self.pet_radius + 20
+            self.target_x = self.rng.randint(margin, self.container_width - margin)
+            self.target_y = self.rng.randint(margin, self.container_height - margin)
+            self.code = WALKING
+            self.plan_route()
+
+    def trigger(self, state):
+        """Force a state such as play or sleep"""
+        self.state = state
+        self.idle_counter = 0
+
+    def hit_test(self, x, y, slop=10):
+        """Check if a point is near the pet"""
+        distance = math.hypot(x - self.x, y - self.y)
+        return distance <= self.pet_radius + slop
+
+    def start_drag(self, x, y):
+        """Start dragging if the point is on the pet"""
+        if self.hit_test(x, y, 10):  # Allow some margin for clicking
+            self.is_dragging = True
+        return self.is_dragging
+
+    def drag_by(self, dx, dy):
+        """Move the pet while dragging"""
+        if self.is_dragging:
+            self.move_to(self.x + dx, self.y + dy)
+            # Dragging snaps, there is nothing to interpolate
+            self.prev_x = self.x
+            self.prev_y = self.y
+
+    def end_drag(self):
+        """End dragging"""
+        self.is_dragging = False
+        if self.code == WALKING:
+            self.plan_route()  # Dropped somewhere else; the old route starts elsewhere
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Steering engine for large pet populations.
+Keeps every pet's position, velocity and target in NumPy arrays and
+computes seek, separation and boundary clamping for the whole population
+in a handful of vectorized operations per tick. Falls back to a pure-Python
+engine with the same interface when NumPy isn't installed.
+"""
+
+import math
+import random
+
+from pet_core import DESKTOP_PROFILE
+from spatial_index import SpatialHash
+
+try:
+    import numpy as np
+except ImportError:
+    # Install numpy for large headless populations; small flocks work without it
+    np = None
+
+# Pets closer than this many radii push each other apart
+SEPARATION_RADII = 2.0
+
+# Neighbour cells checked for separation: the pet's own cell and the eight around it
+NEIGHBOUR_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+class FlockBase:
+    """Shared setup for both engines"""
+
+    def __init__(self, count, width, height, pet_radius=16, profile=None, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.pet_radius = pet_radius
+        self.profile = dict(DESKTOP_PROFILE, **(profile or {}))
+        self.margin = pet_radius + 5          # Same clamp as PetSimulation.move_to
+        self.target_margin = pet_radius + 20  # Same as PetSimulation.wander_randomly
+        self.separation_distance = pet_radius * SEPARATION_RADII
+        self.separation_speed = self.profile['walk_speed']
+        # Per pet per second; flock pets only idle or walk, so every idle decision wanders
+        self.wander_chance = 1.0 / self.profile['behavior'].dwell_seconds['idle']
+
+
+class NumpyFlock(FlockBase):
+    """Struct-of-arrays flock stepped with NumPy"""
+
+    def __init__(self, count, width, height, pet_radius=16, profile=None, seed=None):
+        super().__init__(count, width, height, pet_radius, profile, seed)
+        self.rng = np.random.default_rng(seed)
+        self.positions = self.random_points(count)
+        self.targets = self.positions.copy()
+        self.velocities = np.zeros((count, 2))
+        self.walking = np.zeros(count, dtype=bool)
+
+    def random_points(self, count):
+        low = self.target_margin
+        high = np.array([self.width, self.height]) - self.target_margin
+        return self.rng.uniform(low, high, size=(count, 2))
+
+    def set_target(self, index, x, y):
+        """Send one pet walking to a point"""
+        self.targets[index] = (x, y)
+        self.walking[index] = True
+
+    def step(self, dt):
+        """Advance every pet by dt seconds"""
+        profile = self.profile
+
+        # Idle pets occasionally pick somewhere new to wander to
+        idle = ~self.walking
+        wander = idle & (self.rng.random(self.count) < self.wander_chance * dt)
+        if wander.any():
+            self.targets[wander] = self.random_points(int(wander.sum()))
+            self.walking |= wander
+
+        # Seek: full speed far away, easing off near the target
+        offset = self.targets - self.positions
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        arrived = distance <= 3
+        self.walking &= ~arrived
+        speed = np.minimum(profile['walk_speed'], distance / profile['ease_seconds'])
+        speed[~self.walking] = 0.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.velocities = np.where(distance[:, None] > 0,
+                                       offset * (speed / distance)[:, None], 0.0)
+
+        self.velocities += self.separation()
+        self.positions += self.velocities * dt
+
+        # Keep everyone inside the container
+        np.clip(self.positions[:, 0], self.margin, self.width - self.margin,
+                out=self.positions[:, 0])
+        np.clip(self.positions[:, 1], self.margin, self.height - self.margin,
+                out=self.positions[:, 1])
+
+    def separation(self):
+        """Push velocity away from pets that are too close
+
+        Pets are bucketed into a grid of separation-sized cells, so only pairs
+        in neighbouring cells are compared instead of every pet with every pet.
+        """
+        positions = self.positions
+        limit = self.separation_distance
+        columns = int(self.width // limit) + 3
+        cells = (positions // limit).astype(np.int64) + 1
+        keys = cells[:, 1] * columns + cells[:, 0]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # For each pet and neighbour offset, the run of sorted pets in that cell
+        shifts = np.array([dy * columns + dx for dx, dy in NEIGHBOUR_OFFSETS])
+        neighbour_keys = (keys[None, :] + shifts[:, None]).ravel()
+        starts = np.searchsorted(sorted_keys, neighbour_keys, 'left')
+        counts = np.searchsorted(sorted_keys, neighbour_keys, 'right') - starts
+        owners = np.tile(np.arange(self.count), len(shifts))
+
+        # Expand the runs into flat (i, j) candidate pairs
+        total = int(counts.sum())
+        run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        i = np.repeat(owners, counts)
+        j = order[np.repeat(starts, counts) + run_offsets]
+
+        delta = positions[i] - positions[j]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        close = (distance < limit) & (distance > 0)
+        # Stronger the closer they are, zero at the separation distance
+        weight = np.zeros_like(distance)
+        weight[close] = (limit - distance[close]) / (limit * distance[close])
+
+        push = np.empty_like(positions)
+        push[:, 0] = np.bincount(i, weights=delta[:, 0] * weight, minlength=self.count)
+        push[:, 1] = np.bincount(i, weights=delta[:, 1] * weight, minlength=self.count)
+        return push * self.separation_speed
+
+    def position(self, index):
+        return float(self.positions[index, 0]), float(self.positions[index, 1])
+
+
+class PyFlock(FlockBase):
+    """Pure-Python flock with the same behavior, for when NumPy is absent"""
+
+    def __init__(self, count, width, height, pet_radius=16, profile=None, seed=None):
+        super().__init__(count, width, height, pet_radius, profile, seed)
+        self.rng = random.Random(seed)
+        self.positions = [self.random_point() for _ in range(count)]
+        self.targets = [list(p) for p in self.positions]
+        self.velocities = [[0.0, 0.0] for _ in range(count)]
+        self.walking = [False] * count
+        self.index = SpatialHash(self.separation_distance)
+
+    def random_point(self):
+        return [self.rng.uniform(self.target_margin, self.width - self.target_margin),
+                self.rng.uniform(self.target_margin, self.height - self.target_margin)]
+
+    def set_target(self, index, x, y):
+        """Send one pet walking to a point"""
+        self.targets[index] = [x, y]
+        self.walking[index] = True
+
+    def step(self, dt):
+        """Advance every pet by dt seconds"""
+        profile = self.profile
+        for i in range(self.count):
+            if not self.walking[i] and self.rng.random() < self.wander_chance * dt:
+                self.targets[i] = self.random_point()
+                self.walking[i] = True
+
+            (x, y), (tx, ty) = self.positions[i], self.targets[i]
+            dx, dy = tx - x, ty - y
+            distance = math.hypot(dx, dy)
+            velocity = self.velocities[i]
+            velocity[0] = velocity[1] = 0.0
+            if distance <= 3:
+                self.walking[i] = False
+            elif self.walking[i]:
+                speed = min(profile['walk_speed'], distance / profile['ease_seconds'])
+                velocity[0] = dx / distance * speed
+                velocity[1] = dy / distance * speed
+
+        self.add_separation()
+        for (position, velocity) in zip(self.positions, self.velocities):
+            position[0] = max(self.margin, min(position[0] + velocity[0] * dt,
+                                               self.width - self.margin))
+            position[1] = max(self.margin, min(position[1] + velocity[1] * dt,
+                                               self.height - self.margin))
+
+    def add_separation(self):
+        """Push velocity away from pets that are too close"""
+        limit = self.separation_distance
+        index = self.index
+        for i, (x, y) in enumerate(self.positions):
+            index.insert(i, x, y)
+
+        for i, (x, y) in enumerate(self.positions):
+            push_x = push_y = 0.0
+            for j in index.query_radius(x, y, limit):
+                ox, oy = self.positions[j]
+                dx, dy = x - ox, y - oy
+                distance = math.hypot(dx, dy)
+                if 0 < distance < limit:
+                    weight = (limit - distance) / (limit * distance)
+                    push_x += dx * weight
+                    push_y += dy * weight
+            self.velocities[i][0] += push_x * self.separation_speed
+            self.velocities[i][1] += push_y * self.separation_speed
+
+    def position(self, index):
+        x, y = self.positions[index]
+        return x, y
+
+
+def make_flock(count, width, height, pet_radius=16, profile=None, seed=None, use_numpy=None):
+    """Create the fastest available flock engine"""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise ImportError("numpy is required for the vectorized flock engine")
+    engine = NumpyFlock if use_numpy else PyFlock
+    return engine(count, width, height, pet_radius, profile, seed)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Run the desktop pet without Tk.
+Drives the shared simulation and animation with any renderer backend, so
+the pet can live in a terminal over SSH or run with rendering switched off
+to measure pure logic cost.
+
+    python3 pet_headless.py                        # Pets in this terminal
+    python3 pet_headless.py --pets 5 --seconds 30
+    python3 pet_headless.py --renderer null --fast --seconds 3600
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from pet_core import PetSimulation, Animation, DESKTOP_PROFILE, PET_SPRITES, FRAME_SECONDS
+from pet_renderers import NullRenderer, TerminalRenderer
+
+
+class HeadlessPets:
+    """A colony of simulated pets drawn through a renderer"""
+
+    def __init__(self, renderer, width=400, height=300, pet_count=1, pet_radius=16,
+                 profile=None, seed=None):
+        self.renderer = renderer
+        self.rng = random.Random(seed)
+        self.sims = []
+        self.animations = []
+        margin = pet_radius + 20
+        for index in range(pet_count):
+            sim = PetSimulation(width, height, pet_radius, profile or DESKTOP_PROFILE, self.rng)
+            if index:
+                # Spread the rest of the colony around the container
+                sim.place(self.rng.randint(margin, width - margin),
+                          self.rng.randint(margin, height - margin))
+            animation = Animation()
+            self.sims.append(sim)
+            self.animations.append(animation)
+            renderer.add_pet(index, sim.x, sim.y, animation.sprite)
+
+    def advance(self, dt):
+        """Step every pet by dt seconds and draw the result"""
+        renderer = self.renderer
+        for index, (sim, animation) in enumerate(zip(self.sims, self.animations)):
+            sim.step(dt)
+            if animation.advance(sim.state, dt):
+                renderer.set_sprite(index, animation.sprite)
+            x, y = sim.render_position(0.0)
+            renderer.move_pet(index, x, y + animation.bounce)
+        renderer.flush()
+
+
+def make_renderer(name, width, height, stream=None):
+    if name == 'terminal':
+        return TerminalRenderer(width, height, PET_SPRITES, stream=stream)
+    return NullRenderer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desktop pet without a window")
+    parser.add_argument('--renderer', choices=['terminal', 'null'], default='terminal')
+    parser.add_argument('--pets', type=int, default=1, help="Number of pets in the container")
+    parser.add_argument('--seconds', type=float, default=None, help="Stop after this long")
+    parser.add_argument('--fast', action='store_true', help="Don't wait for real time")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible runs")
+    args = parser.parse_args()
+
+    if args.fast and args.seconds is None:
+        parser.error("--fast needs --seconds")
+
+    width, height = 400, 300
+    renderer = make_renderer(args.renderer, width, height)
+    pets = HeadlessPets(renderer, width, height, max(1, args.pets), seed=args.seed)
+
+    frames = None if args.seconds is None else int(args.seconds / FRAME_SECONDS)
+    started = time.perf_counter()
+    frame = 0
+    try:
+        while frames is None or frame < frames:
+            pets.advance(FRAME_SECONDS)
+            frame += 1
+            if not args.fast:
+                # Sleep until this frame's slot rather than a fixed delay, so drawing doesn't drift
+                time.sleep(max(0.0, started + frame * FRAME_SECONDS - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        renderer.close()
+
+    if isinstance(renderer, NullRenderer):
+        elapsed = time.perf_counter() - started
+        print(f"{frame} frames in {elapsed:.3f}s ({elapsed / max(frame, 1) * 1e6:.1f} µs/frame), "
+              f"{renderer.moves} moves, {renderer.sprite_changes} sprite changes")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Frame-time and tick-latency instrumentation for the desktop pet.
+Records, per scheduled job, how late each callback fired and how long it
+ran, in fixed-size ring buffers, and reports percentiles.
+"""
+
+
+class RingBuffer:
+    """Fixed-size buffer of floats that overwrites its oldest sample"""
+
+    def __init__(self, size):
+        self.samples = [0.0] * size
+        self.size = size
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def values(self):
+        """Samples currently held, oldest first"""
+        if self.count < self.size:
+            return self.samples[:self.count]
+        return self.samples[self.index:] + self.samples[:self.index]
+
+    def __len__(self):
+        return self.count
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class TickMetrics:
+    """Scheduled vs actual firing time and callback duration for each job"""
+
+    def __init__(self, size=512):
+        self.size = size
+        self.lateness = {}  # Job name -> RingBuffer of seconds late
+        self.duration = {}  # Job name -> RingBuffer of seconds spent in the callback
+
+    def record(self, name, scheduled, started, duration):
+        """Record one callback run (times in seconds, same clock)"""
+        if name not in self.lateness:
+            self.lateness[name] = RingBuffer(self.size)
+            self.duration[name] = RingBuffer(self.size)
+        self.lateness[name].append(max(0.0, started - scheduled))
+        self.duration[name].append(duration)
+
+    def percentiles(self, name, fractions=(0.5, 0.95, 0.99)):
+        """{'late': {p50, p95, p99}, 'duration': {...}} in milliseconds for a job"""
+        result = {}
+        for label, buffers in (('late', self.lateness), ('duration', self.duration)):
+            values = sorted(buffers[name].values()) if name in buffers else []
+            result[label] = {f"p{round(f * 100)}": percentile(values, f) * 1000
+                             for f in fractions}
+        return result
+
+    def summary(self):
+        """Percentiles for every job seen so far"""
+        return {name: self.percentiles(name) for name in self.lateness}
+
+    def hud_text(self):
+        """One compact line per job for the on-canvas overlay"""
+        lines = []
+        for name in sorted(self.lateness):
+            stats = self.percentiles(name, (0.5, 0.99))
+            lines.append(f"{name}: late {stats['late']['p50']:.1f}/{stats['late']['p99']:.1f}ms "
+                         f"run {stats['duration']['p50']:.2f}/{stats['duration']['p99']:.2f}ms")
+        return "\n".join(lines)
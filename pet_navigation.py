@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Coarse navigation grid for walking around obstacles inside the container.
+Obstacles (the corner label, resting pets) are rasterized into an occupancy
+grid, grown by the walker's radius so routes can treat the pet as a point.
+Routes come from A* over the grid, or from a distance field once a goal
+has been asked for often enough, and are smoothed to a few corner
+waypoints. Both are cached until an obstacle actually changes, so a pet
+walking the same way again costs a dictionary lookup.
+"""
+
+import heapq
+import math
+
+# Eight neighbour moves and their costs (diagonals are sqrt(2) cells long)
+MOVES = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+         (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)),
+         (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2))]
+
+# Routes toward the same goal from this many starts get a distance field instead of A*
+FLOW_FIELD_AFTER = 3
+
+# Forget cached routes past this many (cursor-following can ask for a lot of goals)
+MAX_ROUTES = 4096
+
+NO_OWNERS = frozenset()
+
+
+def octile(a, b):
+    """Grid distance between two cells when diagonal moves are allowed"""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+
+class NavGrid:
+    """Occupancy grid with cached routes, rebuilt only when obstacles change"""
+
+    def __init__(self, width, height, pet_radius=16, cell_size=None):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size or pet_radius
+        self.padding = pet_radius  # Obstacles grow by this so pets can be routed as points
+        self.columns = math.ceil(width / self.cell_size)
+        self.rows = math.ceil(height / self.cell_size)
+
+        # Cells whose centers the pet can stand on (PetSimulation.move_to's margin)
+        margin = pet_radius + 5
+        self.column_range = (math.ceil((margin - self.cell_size / 2) / self.cell_size),
+                             math.floor((width - margin - self.cell_size / 2) / self.cell_size))
+        self.row_range = (math.ceil((margin - self.cell_size / 2) / self.cell_size),
+                          math.floor((height - margin - self.cell_size / 2) / self.cell_size))
+
+        self.obstacles = {}  # name -> (x1, y1, x2, y2) as given
+        self.footprints = {}  # name -> set of cells it blocks
+        self.owners = {}  # cell -> frozenset of obstacle names blocking it
+        self.version = 0  # Bumped whenever the blocked cells change
+
+        self.routes = {}  # (start, goal, ignored) -> tuple of waypoints
+        self.fields = {}  # (goal, ignored) -> {cell: distance to goal}
+        self.goal_requests = {}  # (goal, ignored) -> routes computed toward it
+        self.searches = 0  # A* runs and distance fields built, for tests and stats
+
+        # update_pets: obstacle name per pet, and where it is if it's currently an obstacle
+        self.pet_names = []
+        self.pet_spots = []
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def same_cell(self, x0, y0, x1, y1):
+        """True if two points fall in the same cell (without building either cell)"""
+        size = self.cell_size
+        return x0 // size == x1 // size and y0 // size == y1 // size
+
+    def center(self, cell):
+        return ((cell[0] + 0.5) * self.cell_size, (cell[1] + 0.5) * self.cell_size)
+
+    def set_obstacle(self, name, x1, y1, x2, y2):
+        """Add or move a rectangular obstacle; a no-op if it hasn't changed"""
+        rect = (x1, y1, x2, y2)
+        if self.obstacles.get(name) == rect:
+            return
+        self.obstacles[name] = rect
+        pad = self.padding
+        first = self.cell_of(max(0, x1 - pad), max(0, y1 - pad))
+        last = self.cell_of(min(self.width - 1, x2 + pad), min(self.height - 1, y2 + pad))
+        cells = {(column, row)
+                 for column in range(first[0], last[0] + 1)
+                 for row in range(first[1], last[1] + 1)}
+        if cells != self.footprints.get(name):
+            self.remove_footprint(name)
+            self.footprints[name] = cells
+            for cell in cells:
+                self.owners[cell] = self.owners.get(cell, NO_OWNERS) | {name}
+            self.invalidate()
+
+    def remove_obstacle(self, name):
+        if self.obstacles.pop(name, None) is not None and self.remove_footprint(name):
+            self.invalidate()
+
+    def remove_footprint(self, name):
+        cells = self.footprints.pop(name, None)
+        if not cells:
+            return False
+        for cell in cells:
+            owners = self.owners[cell] - {name}
+            if owners:
+                self.owners[cell] = owners
+            else:
+                del self.owners[cell]
+        return True
+
+    def update_pets(self, sims):
+        """Resting pets block walking ones; re-route the walkers if that changed anything"""
+        version = self.version
+        if len(sims) > 1:
+            while len(self.pet_names) < len(sims):
+                self.pet_names.append(('pet', len(self.pet_names)))
+                self.pet_spots.append(None)
+            for index, sim in enumerate(sims):
+                name = self.pet_names[index]
+                if sim.is_dragging or sim.is_moving():
+                    if self.pet_spots[index] is not None:
+                        self.pet_spots[index] = None
+                        self.remove_obstacle(name)
+                else:
+                    # Resting pets rarely move, so only re-rasterize when one settles somewhere
+                    spot = self.pet_spots[index]
+                    if spot is not None and spot[0] == sim.x and spot[1] == sim.y:
+                        continue
+                    self.pet_spots[index] = (sim.x, sim.y)
+                    r = sim.pet_radius
+                    self.set_obstacle(name, sim.x - r, sim.y - r, sim.x + r, sim.y + r)
+        if self.version != version:
+            for sim in sims:
+                if sim.is_moving():
+                    sim.plan_route()
+
+    def invalidate(self):
+        """Obstacles changed: every cached route and field may be wrong"""
+        self.version += 1
+        self.routes.clear()
+        self.fields.clear()
+        self.goal_requests.clear()
+
+    def passable(self, cell, ignored=NO_OWNERS):
+        """True if a pet can stand in a cell (obstacles in ignored don't count)"""
+        column, row = cell
+        if not (self.column_range[0] <= column <= self.column_range[1] and
+                self.row_range[0] <= row <= self.row_range[1]):
+            return False
+        owners = self.owners.get(cell)
+        return not owners or owners <= ignored
+
+    def neighbors(self, cell, ignored):
+        """Cells one move away, without cutting across blocked corners"""
+        column, row = cell
+        for dx, dy, cost in MOVES:
+            near = (column + dx, row + dy)
+            if not self.passable(near, ignored):
+                continue
+            if dx and dy and not (self.passable((column + dx, row), ignored) and
+                                  self.passable((column, row + dy), ignored)):
+                continue
+            yield near, cost
+
+    def find_path(self, x0, y0, x1, y1, waypoints=None):
+        """Waypoints from (x0, y0) to (x1, y1) around obstacles, ending at the goal
+
+        A goal inside an obstacle moves to the nearest free cell. A pet
+        standing inside an obstacle (its own body, or dropped on the label)
+        may walk out of it. Pass a list as waypoints to have it refilled
+        rather than a new one made.
+        """
+        if waypoints is None:
+            waypoints = []
+        start = self.cell_of(x0, y0)
+        ignored = self.owners.get(start, NO_OWNERS)
+        target = self.cell_of(x1, y1)
+        goal = target if self.passable(target, ignored) else self.nearest_passable(target, ignored)
+        if goal is None:
+            waypoints[:] = ((x1, y1),)  # Nowhere free to go; walk straight as before
+            return waypoints
+        waypoints[:] = self.route(start, goal, ignored)
+        waypoints.append((x1, y1) if goal == target else self.center(goal))
+        return waypoints
+
+    def route(self, start, goal, ignored):
+        """Corner waypoints between two cells, cached until obstacles change"""
+        key = (start, goal, ignored)
+        waypoints = self.routes.get(key)
+        if waypoints is not None:
+            return waypoints
+
+        if start == goal or self.visible(self.center(start), self.center(goal), start, ignored):
+            waypoints = ()
+        else:
+            goal_key = (goal, ignored)
+            self.goal_requests[goal_key] = self.goal_requests.get(goal_key, 0) + 1
+            field = self.fields.get(goal_key)
+            if field is None and self.goal_requests[goal_key] >= FLOW_FIELD_AFTER:
+                # A popular goal: one field answers every later start with no search
+                field = self.fields[goal_key] = self.distance_field(goal, ignored)
+            if field is not None:
+                cells = self.descend(field, start, goal, ignored)
+            else:
+                cells = self.astar(start, goal, ignored)
+            # Unreachable goals fall back to walking straight
+            waypoints = self.smooth(start, cells, ignored) if cells else ()
+
+        if len(self.routes) >= MAX_ROUTES:
+            self.routes.clear()
+        self.routes[key] = waypoints
+        return waypoints
+
+    def astar(self, start, goal, ignored):
+        """Cells from start to goal, or None if the goal can't be reached"""
+        self.searches += 1
+        came_from = {start: None}
+        cost = {start: 0.0}
+        frontier = [(octile(start, goal), 0, start)]
+        pushed = 0
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell == goal:
+                path = []
+                while cell is not None:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return path[::-1]
+            for near, step in self.neighbors(cell, ignored):
+                new_cost = cost[cell] + step
+                if new_cost < cost.get(near, math.inf):
+                    cost[near] = new_cost
+                    came_from[near] = cell
+                    pushed += 1  # Tie-breaker so cells themselves are never compared
+                    heapq.heappush(frontier, (new_cost + octile(near, goal), pushed, near))
+        return None
+
+    def distance_field(self, goal, ignored):
+        """Walking distance from every reachable cell to the goal (Dijkstra)"""
+        self.searches += 1
+        distance = {goal: 0.0}
+        frontier = [(0.0, goal)]
+        while frontier:
+            cell_distance, cell = heapq.heappop(frontier)
+            if cell_distance > distance[cell]:
+                continue
+            for near, step in self.neighbors(cell, ignored):
+                new_distance = cell_distance + step
+                if new_distance < distance.get(near, math.inf):
+                    distance[near] = new_distance
+                    heapq.heappush(frontier, (new_distance, near))
+        return distance
+
+    def descend(self, field, start, goal, ignored):
+        """Follow a distance field downhill from start to its goal"""
+        path = [start]
+        cell = start
+        while cell != goal:
+            best = None
+            best_distance = field.get(cell, math.inf)
+            for near, step in self.neighbors(cell, ignored):
+                near_distance = field.get(near, math.inf)
+                if near_distance < best_distance:
+                    best, best_distance = near, near_distance
+            if best is None:
+                return None  # Start is cut off from the goal
+            path.append(best)
+            cell = best
+        return path
+
+    def nearest_passable(self, target, ignored):
+        """Closest free cell to a blocked one (breadth-first), or None"""
+        seen = {target}
+        frontier = [target]
+        while frontier:
+            next_frontier = []
+            for column, row in frontier:
+                for dx, dy, _ in MOVES:
+                    near = (column + dx, row + dy)
+                    if near in seen or not (0 <= near[0] < self.columns and
+                                            0 <= near[1] < self.rows):
+                        continue
+                    if self.passable(near, ignored):
+                        return near
+                    seen.add(near)
+                    next_frontier.append(near)
+            frontier = next_frontier
+        return None
+
+    def visible(self, a, b, start, ignored):
+        """True if the straight line from a to b crosses no blocked cell"""
+        steps = int(math.dist(a, b) / (self.cell_size / 4)) + 1
+        for i in range(1, steps + 1):
+            t = i / steps
+            cell = self.cell_of(a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+            if cell != start and not self.passable(cell, ignored):
+                return False
+        return True
+
+    def smooth(self, start, cells, ignored):
+        """Cut a cell path down to the corners a pet actually has to turn at"""
+        points = [self.center(cell) for cell in cells]
+        waypoints = []
+        anchor = 0
+        while anchor < len(points) - 1:
+            # Farthest point still in a straight line of sight
+            reach = len(points) - 1
+            while reach > anchor + 1 and not self.visible(points[anchor], points[reach],
+                                                          start, ignored):
+                reach -= 1
+            waypoints.append(points[reach])
+            anchor = reach
+        return tuple(waypoints[:-1])  # The goal itself is added by find_path
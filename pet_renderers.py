@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Renderer backends for the desktop pet.
+The same simulation and animation code can draw to a Tk canvas, to a
+terminal (ANSI escapes, only rewriting cells that changed), or to nothing
+at all for measuring pure logic cost.
+"""
+
+import sys
+
+from canvas_batch import CanvasBatch
+
+
+class Renderer:
+    """Interface every backend implements; pets are identified by small ints"""
+
+    def add_pet(self, pet_id, x, y, sprite):
+        """Start showing a pet at (x, y) with the named sprite"""
+
+    def move_pet(self, pet_id, x, y):
+        """Queue moving a pet"""
+
+    def set_sprite(self, pet_id, sprite):
+        """Queue changing a pet's sprite"""
+
+    def flush(self):
+        """Show everything queued since the last flush"""
+
+    def close(self):
+        """Release the output"""
+
+
+class NullRenderer(Renderer):
+    """Draws nothing; counts calls so benchmarks can see the work requested"""
+
+    def __init__(self):
+        self.moves = 0
+        self.sprite_changes = 0
+        self.flushes = 0
+
+    def move_pet(self, pet_id, x, y):
+        self.moves += 1
+
+    def set_sprite(self, pet_id, sprite):
+        self.sprite_changes += 1
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TkCanvasRenderer(Renderer):
+    """Canvas items updated through one batched Tcl call per flush"""
+
+    def __init__(self, canvas, sprites, sprite_cache=None, font_size=32):
+        self.canvas = canvas
+        self.sprites = sprites
+        self.sprite_cache = sprite_cache
+        self.font_size = font_size
+        self.use_images = sprite_cache is not None and sprite_cache.available()
+        self.batch = CanvasBatch(canvas)
+        self.items = {}  # Pet id -> canvas item
+
+    def add_pet(self, pet_id, x, y, sprite):
+        if self.use_images:
+            item = self.canvas.create_image(x, y, image=self.sprite_cache.get(sprite),
+                                            anchor='center')
+        else:
+            item = self.canvas.create_text(x, y, text=self.sprites[sprite],
+                                           font=('Arial', self.font_size), anchor='center')
+        self.items[pet_id] = item
+        return item
+
+    def move_pet(self, pet_id, x, y):
+        self.batch.coords(self.items[pet_id], x, y)
+
+    def set_sprite(self, pet_id, sprite):
+        if self.use_images:
+            self.batch.itemconfig(self.items[pet_id], 'image', self.sprite_cache.get(sprite))
+        else:
+            self.batch.itemconfig(self.items[pet_id], 'text', self.sprites[sprite])
+
+    def flush(self):
+        self.batch.flush()
+
+
+class TerminalRenderer(Renderer):
+    """Draws the container as a character grid, rewriting only changed cells"""
+
+    def __init__(self, width, height, sprites, columns=40, rows=16, stream=None):
+        self.width = width
+        self.height = height
+        self.sprites = sprites
+        self.columns = columns
+        self.rows = rows
+        self.stream = stream or sys.stdout
+        self.pets = {}       # Pet id -> [x, y, sprite]
+        self.drawn = {}      # (row, column) -> text currently on screen
+        self.started = False
+
+    def cell(self, x, y):
+        column = min(self.columns - 1, max(0, int(x * self.columns / self.width)))
+        row = min(self.rows - 1, max(0, int(y * self.rows / self.height)))
+        return row, column
+
+    def add_pet(self, pet_id, x, y, sprite):
+        self.pets[pet_id] = [x, y, sprite]
+
+    def move_pet(self, pet_id, x, y):
+        pet = self.pets[pet_id]
+        pet[0] = x
+        pet[1] = y
+
+    def set_sprite(self, pet_id, sprite):
+        self.pets[pet_id][2] = sprite
+
+    def move_cursor(self, row, column):
+        # Inside the border; every grid cell is two characters wide for emoji
+        return f"\x1b[{row + 2};{column * 2 + 2}H"
+
+    def draw_border(self):
+        """Clear the screen and draw the container outline, once"""
+        inner = "─" * (self.columns * 2)
+        lines = ["\x1b[?25l\x1b[2J\x1b[H┌" + inner + "┐"]
+        lines += ["│" + " " * (self.columns * 2) + "│"] * self.rows
+        lines.append("└" + inner + "┘")
+        self.stream.write("\n".join(lines))
+
+    def flush(self):
+        if not self.started:
+            self.draw_border()
+            self.started = True
+
+        frame = {}
+        for x, y, sprite in self.pets.values():
+            frame[self.cell(x, y)] = self.sprites[sprite]
+
+        # Blank cells that emptied, then write cells whose contents changed
+        output = []
+        for position in self.drawn.keys() - frame.keys():
+            output.append(self.move_cursor(*position) + "  ")
+        for position, text in frame.items():
+            if self.drawn.get(position) != text:
+                output.append(self.move_cursor(*position) + text)
+        self.drawn = frame
+
+        if output:
+            output.append(self.move_cursor(self.rows, 0))
+            self.stream.write("".join(output))
+            self.stream.flush()
+
+    def close(self):
+        """Restore the cursor below the container"""
+        if self.started:
+            self.stream.write(self.move_cursor(self.rows + 1, 0) + "\x1b[?25h\n")
+            self.stream.flush()
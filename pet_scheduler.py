@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Single tick scheduler for the desktop pet.
+All periodic jobs (animation, behavior, desktop level) live in one heap of
+monotonic deadlines serviced by a single Tk after() callback, which sleeps
+exactly until the next job is due.
+"""
+
+import heapq
+import itertools
+import time
+
+
+class PeriodicJob:
+    """A named callback that runs every interval seconds"""
+
+    def __init__(self, name, interval, callback):
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.deadline = 0.0
+        self.active = True
+
+
+class TickScheduler:
+    """Heap of job deadlines driven by one after() timer"""
+
+    def __init__(self, after, after_cancel, clock=time.monotonic, metrics=None):
+        # after(ms, func) / after_cancel(id) are usually root.after / root.after_cancel
+        self.after = after
+        self.after_cancel = after_cancel
+        self.clock = clock
+        self.metrics = metrics  # Optional TickMetrics recording lateness and duration
+        self.jobs = {}
+        self.heap = []
+        self.counter = itertools.count()
+        self.timer = None
+        self.timer_deadline = None
+        self.running = False
+
+    def set_timer(self, after, after_cancel):
+        """Hand the timer to another event loop (e.g. asyncio), keeping every deadline"""
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        self.after = after
+        self.after_cancel = after_cancel
+        self.timer = None
+        self.timer_deadline = None
+        self._arm()
+
+    def register(self, name, interval, callback, delay=0.0):
+        """Add a periodic job; the callback may return its next interval"""
+        self.unregister(name)
+        job = PeriodicJob(name, interval, callback)
+        self.jobs[name] = job
+        self._push(job, self.clock() + delay)
+        return job
+
+    def unregister(self, name):
+        """Remove a job (its stale heap entry is skipped later)"""
+        job = self.jobs.pop(name, None)
+        if job:
+            job.active = False
+
+    def clear(self):
+        """Drop every job and the pending timer"""
+        for name in list(self.jobs):
+            self.unregister(name)
+        self.heap = []
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        self.timer = None
+        self.timer_deadline = None
+
+    def reschedule(self, name, delay=0.0):
+        """Move a job's next run to delay seconds from now"""
+        job = self.jobs.get(name)
+        if job:
+            self._push(job, self.clock() + delay)
+
+    def set_interval(self, name, interval):
+        """Change how often a job runs from its next run onwards"""
+        job = self.jobs.get(name)
+        if job:
+            job.interval = interval
+
+    def next_deadline(self):
+        """Monotonic time of the next due job, or None"""
+        while self.heap:
+            deadline, _, job = self.heap[0]
+            if job.active and job.deadline == deadline:
+                return deadline
+            heapq.heappop(self.heap)  # Stale entry
+        return None
+
+    def run_due(self):
+        """Run every job whose deadline has passed, then re-arm the timer"""
+        self.timer = None
+        self.timer_deadline = None
+        self.running = True
+        now = self.clock()
+
+        try:
+            while True:
+                deadline = self.next_deadline()
+                # after() only has millisecond resolution, so allow firing a touch early
+                if deadline is None or deadline > now + 0.001:
+                    break
+                _, _, job = heapq.heappop(self.heap)
+
+                started = self.clock()
+                interval = job.callback()
+                if self.metrics is not None:
+                    self.metrics.record(job.name, deadline, started, self.clock() - started)
+                if interval is None:
+                    interval = job.interval
+                if not job.active or job.deadline != deadline:
+                    continue  # Callback unregistered or rescheduled itself
+
+                # Keep a fixed cadence so jobs stay in phase, but never burst to catch up
+                next_run = deadline + interval
+                if next_run <= now:
+                    next_run = now + interval
+                self._push(job, next_run)
+        finally:
+            self.running = False
+            self._arm()
+
+    def _push(self, job, deadline):
+        job.deadline = deadline
+        heapq.heappush(self.heap, (deadline, next(self.counter), job))
+        if not self.running and (self.timer_deadline is None or deadline < self.timer_deadline):
+            self._arm()
+
+    def _arm(self):
+        """Sleep until the earliest deadline with a single after() timer"""
+        deadline = self.next_deadline()
+        if deadline is None or deadline == self.timer_deadline:
+            return
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        delay_ms = max(0, round((deadline - self.clock()) * 1000))
+        self.timer = self.after(delay_ms, self.run_due)
+        self.timer_deadline = deadline
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Record a desktop pet session and replay it headless.
+A trace holds the random seed and every input that changes the pets: the
+elapsed time of each behavior update, cursor samples, mouse presses, drags,
+releases, double-clicks and play/sleep commands. Replaying it rebuilds the
+colony from the same seed and feeds the inputs back as fast as possible, so
+a slow session from one machine can be re-run anywhere and tick cost can be
+compared across versions on the exact same workload.
+
+    python3 desktop_pet.py --record session.trace   # Record while using the pet
+    python3 pet_trace.py session.trace              # Replay it and report tick cost
+"""
+
+import argparse
+import random
+import struct
+import sys
+import time
+
+from pet_core import PetSimulation, DESKTOP_PROFILE
+from pet_navigation import NavGrid
+from spatial_index import SpatialHash
+
+MAGIC = b'PETTRACE'
+VERSION = 1
+
+# magic, version, container width and height, pet count, pet radius, seed
+HEADER = struct.Struct('<8sHHHHHQ')
+
+# Record kinds; each record is one kind byte followed by its payload
+STEP, CURSOR, NO_CURSOR, PRESS, DRAG, RELEASE, DOUBLE, COMMAND, OBSTACLE = range(9)
+
+PAYLOADS = {
+    STEP: struct.Struct('<d'),         # Seconds since the last behavior update
+    CURSOR: struct.Struct('<ii'),      # Cursor relative to the container
+    NO_CURSOR: struct.Struct(''),      # Cursor on another screen
+    PRESS: struct.Struct('<ii'),       # <Button-1>
+    DRAG: struct.Struct('<ii'),        # <B1-Motion>, as applied after coalescing
+    RELEASE: struct.Struct('<ii'),     # <ButtonRelease-1>
+    DOUBLE: struct.Struct('<ii'),      # <Double-Button-1>
+    COMMAND: struct.Struct('<B'),      # Index into TRACE_COMMANDS
+    OBSTACLE: struct.Struct('<iiii'),  # A fixed obstacle's bounding box
+}
+
+# Control commands that change the pets
+TRACE_COMMANDS = ['play', 'sleep']
+
+# Records reach the disk at least this often, so a killed pet leaves a usable trace
+FLUSH_SECONDS = 1.0
+
+
+class TraceRecorder:
+    """Appends records to a binary trace file"""
+
+    def __init__(self, path, width, height, pet_count, pet_radius, seed):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, width, height, pet_count, pet_radius, seed))
+        self.last_cursor = None
+        self.records = 0
+        self.flushed = time.monotonic()
+
+    def record(self, kind, *values):
+        self.file.write(bytes((kind,)) + PAYLOADS[kind].pack(*values))
+        self.records += 1
+        now = time.monotonic()
+        if now - self.flushed >= FLUSH_SECONDS:
+            self.file.flush()
+            self.flushed = now
+
+    def cursor(self, x, y):
+        """Record a cursor sample, skipping repeats of the last one"""
+        if (x, y) == self.last_cursor:
+            return
+        self.last_cursor = (x, y)
+        if x is None:
+            self.record(NO_CURSOR)
+        else:
+            self.record(CURSOR, int(x), int(y))
+
+    def command(self, name):
+        self.record(COMMAND, TRACE_COMMANDS.index(name))
+
+    def close(self):
+        self.file.close()
+
+
+def read_trace(path):
+    """Header fields and the list of (kind, values) records in a trace file
+
+    A pet that was killed rather than closed can leave half a record at
+    the end; it is dropped and counted in the header's truncated field.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a version {VERSION} pet trace")
+    magic, version, width, height, pet_count, pet_radius, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} pet trace")
+    header = {'width': width, 'height': height, 'pet_count': pet_count,
+              'pet_radius': pet_radius, 'seed': seed, 'truncated': 0}
+
+    records = []
+    offset = HEADER.size
+    while offset < len(data):
+        kind = data[offset]
+        payload = PAYLOADS.get(kind)
+        if payload is None:
+            raise ValueError(f"{path}: unknown record kind {kind} at byte {offset}")
+        if offset + 1 + payload.size > len(data):
+            header['truncated'] = len(data) - offset
+            print(f"Note: {path} ends partway through a record "
+                  f"({header['truncated']} bytes ignored); was the pet stopped without closing it?")
+            break
+        records.append((kind, payload.unpack_from(data, offset + 1)))
+        offset += 1 + payload.size
+    return header, records
+
+
+class TraceReplay:
+    """The desktop pet's colony without Tk, driven by a recorded trace"""
+
+    def __init__(self, width, height, pet_count, pet_radius, seed):
+        # Built exactly as DesktopPet builds it, so the seed gives the same colony
+        self.pet_radius = pet_radius
+        self.rng = random.Random(seed)
+        self.navigator = NavGrid(width, height, pet_radius)
+        self.sims = []
+        for index in range(pet_count):
+            sim = PetSimulation(width, height, pet_radius, DESKTOP_PROFILE, self.rng)
+            sim.navigator = self.navigator
+            if index > 0:
+                margin = pet_radius + 20
+                sim.place(self.rng.randint(margin, width - margin),
+                          self.rng.randint(margin, height - margin))
+            self.sims.append(sim)
+        self.pet_index = SpatialHash(pet_radius * 4)
+        for index, sim in enumerate(self.sims):
+            self.pet_index.insert(index, sim.x, sim.y)
+        self.dragged = None
+        self.drag_start = (0, 0)
+        self.ticks = 0
+
+    def apply(self, kind, values):
+        """Feed one recorded input to the pets"""
+        if kind == STEP:
+            for index, sim in enumerate(self.sims):
+                self.ticks += sim.step(values[0])
+                self.pet_index.move(index, sim.x, sim.y)
+            self.navigator.update_pets(self.sims)
+        elif kind == CURSOR or kind == NO_CURSOR:
+            x, y = values or (None, None)
+            for sim in self.sims:
+                sim.set_cursor(x, y)
+        elif kind == PRESS:
+            index = self.pet_at(*values, 10)
+            if index is not None and self.sims[index].start_drag(*values):
+                self.dragged = index
+                self.drag_start = values
+        elif kind == DRAG:
+            if self.dragged is not None:
+                sim = self.sims[self.dragged]
+                sim.drag_by(values[0] - self.drag_start[0], values[1] - self.drag_start[1])
+                self.pet_index.move(self.dragged, sim.x, sim.y)
+                self.drag_start = values
+        elif kind == RELEASE:
+            if self.dragged is not None:
+                self.sims[self.dragged].end_drag()
+                self.dragged = None
+        elif kind == DOUBLE:
+            index = self.pet_at(*values, 15)
+            if index is not None:
+                self.sims[index].trigger("play")
+        elif kind == COMMAND:
+            for sim in self.sims:
+                sim.trigger(TRACE_COMMANDS[values[0]])
+        elif kind == OBSTACLE:
+            self.navigator.set_obstacle('house', *values)
+
+    def pet_at(self, x, y, slop):
+        """Index of the topmost pet near a point, or None"""
+        hits = self.pet_index.query_radius(x, y, self.pet_radius + slop)
+        return max(hits) if hits else None
+
+
+def replay(path):
+    """Replay a trace as fast as possible, returning (replay, records, seconds)"""
+    header, records = read_trace(path)
+    pets = TraceReplay(header['width'], header['height'], header['pet_count'],
+                       header['pet_radius'], header['seed'])
+    started = time.perf_counter()
+    for kind, values in records:
+        pets.apply(kind, values)
+    return pets, len(records), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded desktop pet session")
+    parser.add_argument('trace', help="Trace written by desktop_pet.py --record")
+    args = parser.parse_args()
+
+    pets, records, elapsed = replay(args.trace)
+    print(f"{records} records, {pets.ticks} ticks in {elapsed:.3f}s "
+          f"({elapsed / max(pets.ticks, 1) * 1e6:.1f} µs/tick)")
+    for index, sim in enumerate(pets.sims):
+        print(f"  pet {index}: {sim.state} at ({sim.x:.1f}, {sim.y:.1f})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Runs the pets' behavior decisions off the UI thread.
+The UI thread keeps stepping motion and drawing; once per behavior tick it
+hands the worker (a thread, or a process for heavy behaviors) snapshots of
+every pet. Finished decisions come back through a queue and are applied
+the next time the UI thread looks, so a slow decision never stalls a frame.
+"""
+
+import queue
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pet_core import PetSimulation
+
+
+def decide_batch(width, height, pet_radius, profile, snapshots, seed):
+    """Decisions for a batch of pet snapshots (module-level so process pools can run it)"""
+    brain = PetSimulation(width, height, pet_radius, profile, random.Random(seed))
+    return [brain.think(snapshot) for snapshot in snapshots]
+
+
+class DecisionWorker:
+    """One batch of decisions in flight at a time, results handed back through a queue"""
+
+    def __init__(self, width, height, pet_radius=16, profile=None, use_processes=False,
+                 notify=None):
+        self.config = (width, height, pet_radius, profile)
+        if use_processes:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1,
+                                               thread_name_prefix='pet-decisions')
+        self.results = queue.SimpleQueue()
+        self.pending = None
+        self.delivered = threading.Event()  # Set once the batch in flight is in results
+        self.notify = notify  # Called from the worker side when results are ready
+
+    def submit(self, sims, seed):
+        """Send snapshots of every pet, unless the last batch is still being worked on"""
+        if self.pending is not None and not self.pending.done():
+            return False  # Skip a tick rather than queue up stale work
+        snapshots = [sim.snapshot(index) for index, sim in enumerate(sims)]
+        self.delivered.clear()
+        self.pending = self.executor.submit(decide_batch, *self.config, snapshots, seed)
+        self.pending.add_done_callback(self.on_done)
+        return True
+
+    def on_done(self, future):
+        try:
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"! Behavior decisions failed: {future.exception()}")
+                return
+            for decision in future.result():
+                self.results.put(decision)
+        finally:
+            self.delivered.set()
+        if self.notify is not None:
+            self.notify()
+
+    def wait(self, timeout=None):
+        """Block until the batch in flight has been handed back; True if it has"""
+        return self.delivered.wait(timeout)
+
+    def collect(self, sims):
+        """Apply every finished decision; True if any pet changed what it's doing"""
+        changed = False
+        while True:
+            try:
+                decision = self.results.get_nowait()
+            except queue.Empty:
+                return changed
+            if sims[decision[0]].apply_decision(decision):
+                changed = True
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
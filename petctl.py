@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Control the running desktop pet from a terminal or script.
+
+    python3 petctl.py status     # State and position of each pet
+    python3 petctl.py play       # Make the pets play (or: sleep)
+    python3 petctl.py stats      # Tick timing percentiles as JSON
+    python3 petctl.py quit       # Stop the pet
+"""
+
+import argparse
+import json
+import sys
+
+from pet_control import COMMANDS, send_command
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control the running desktop pet")
+    parser.add_argument('command', choices=COMMANDS)
+    args = parser.parse_args()
+
+    try:
+        reply = send_command(args.command)
+    except OSError:
+        print("Desktop Pet is not running")
+        return 1
+
+    if 'error' in reply:
+        print(f"Error: {reply['error']}")
+        return 1
+    print(json.dumps(reply, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Soak test for the desktop pet: days of running squeezed into minutes.
+Drives the pets on a virtual clock through a made-up but busy workload
+(cursor wandering past, drags, double-clicks, play/sleep commands, the odd
+suspend) and samples memory, Tk canvas items, pending after() callbacks and
+pet positions as it goes. Fails if anything keeps growing or a pet leaves
+the container.
+
+    python3 soak_pet.py --days 3             # Headless core, no display needed
+    python3 soak_pet.py --tk --days 1        # A real DesktopPet (needs a display)
+    python3 soak_pet.py --xvfb --days 1      # A real DesktopPet under Xvfb
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+from pet_core import TICK_SECONDS
+from pet_navigation import MAX_ROUTES
+from pet_trace import TraceReplay, STEP, CURSOR, NO_CURSOR, PRESS, DRAG, RELEASE, DOUBLE, \
+    COMMAND, OBSTACLE, TRACE_COMMANDS
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module; RSS is read from /proc or skipped
+    resource = None
+
+DAY_SECONDS = 24 * 3600
+
+# Samples before this share of the run are warm-up (caches filling, first allocations)
+WARM_UP = 0.25
+
+# How much each metric may rise from the warm-up peak before it counts as unbounded growth
+GROWTH_SLACK = {
+    'rss_kb': 4096,
+    'objects': 2000,
+    'canvas_items': 0,
+    'after_callbacks': 2,
+    'scheduler_heap': 8,
+    'nav_fields': 0,
+}
+
+# Metrics with a hard ceiling of their own, checked on every sample
+LIMITS = {
+    'nav_routes': MAX_ROUTES,
+}
+
+
+def navigator_sample(navigator):
+    """Sizes of the navigation grid's caches"""
+    return {'nav_routes': len(navigator.routes), 'nav_fields': len(navigator.fields),
+            'nav_goals': len(navigator.goal_requests)}
+
+
+def rss_kb():
+    """Resident set size of this process in KB, or None if it can't be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # Peak rather than current, which still shows steady growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    return None
+
+
+class Workload:
+    """Seeded stream of user activity, at about the rate of someone at their desk"""
+
+    def __init__(self, width, height, seed):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.cursor = (width // 2, height * 3)  # Starts well away from the container
+
+    def actions(self, elapsed):
+        """Things the user did in the last elapsed seconds"""
+        rng = self.rng
+        actions = []
+        if rng.random() < elapsed / 5.0:
+            # The cursor drifts around the screen, now and then through the container
+            x, y = self.cursor
+            x = min(max(x + rng.randint(-80, 80), -3 * self.width), 3 * self.width)
+            y = min(max(y + rng.randint(-80, 80), -3 * self.height), 3 * self.height)
+            self.cursor = (x, y)
+            actions.append(('cursor', x, y))
+        if rng.random() < elapsed / 600.0:
+            actions.append(('drag', rng.randint(-60, 60), rng.randint(-60, 60)))
+        if rng.random() < elapsed / 900.0:
+            actions.append(('double',))
+        if rng.random() < elapsed / 3600.0:
+            actions.append(('command', rng.choice(TRACE_COMMANDS)))
+        if rng.random() < elapsed / (DAY_SECONDS / 2):
+            actions.append(('suspend', rng.uniform(600, 8 * 3600)))
+        return actions
+
+
+class HeadlessSoak:
+    """The pets' core (the same colony trace replays use), fed through its inputs"""
+
+    def __init__(self, pet_count, seed):
+        self.width, self.height = 600, 400
+        self.colony = TraceReplay(self.width, self.height, pet_count, 16, seed)
+        self.colony.apply(OBSTACLE, (560, 10, 590, 30))  # Where the corner label sits
+        self.sims = self.colony.sims
+        self.now = 0.0
+
+    def advance(self, actions):
+        """Apply the user's actions, then step the pets by their shortest tick interval"""
+        colony = self.colony
+        for action in actions:
+            kind = action[0]
+            if kind == 'cursor':
+                inside = (-200 <= action[1] <= self.width + 200 and
+                          -200 <= action[2] <= self.height + 200)
+                if inside:
+                    colony.apply(CURSOR, action[1:])
+                else:
+                    colony.apply(NO_CURSOR, ())  # Too far off to matter, as if on another screen
+            elif kind == 'drag':
+                sim = self.sims[0]
+                x, y = int(sim.x), int(sim.y)
+                colony.apply(PRESS, (x, y))
+                colony.apply(DRAG, (x + action[1], y + action[2]))
+                colony.apply(RELEASE, (x + action[1], y + action[2]))
+            elif kind == 'double':
+                sim = self.sims[-1]
+                colony.apply(DOUBLE, (int(sim.x), int(sim.y)))
+            elif kind == 'command':
+                colony.apply(COMMAND, (TRACE_COMMANDS.index(action[1]),))
+            elif kind == 'suspend':
+                colony.apply(STEP, (action[1],))
+                self.now += action[1]
+        interval = min(sim.tick_interval() for sim in self.sims)
+        colony.apply(STEP, (interval,))
+        self.now += interval
+        return interval
+
+    def sample(self):
+        return dict(navigator_sample(self.colony.navigator), objects=len(gc.get_objects()))
+
+    def close(self):
+        pass
+
+
+class VirtualClock:
+    """Monotonic seconds that only move when the soak says so"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeEvent:
+    """Just enough of a Tk event for the mouse handlers"""
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+class TkSoak:
+    """A real DesktopPet whose scheduler runs on a virtual clock"""
+
+    def __init__(self, pet_count, seed):
+        import desktop_pet
+        self.clock = VirtualClock()
+        self.pet = desktop_pet.DesktopPet(pet_count=pet_count, seed=seed, clock=self.clock)
+        self.pet.root.update()
+        self.sims = [view.sim for view in self.pet.pets]
+        self.width, self.height = self.pet.container_width, self.pet.container_height
+
+    @property
+    def now(self):
+        return self.clock.now
+
+    def advance(self, actions):
+        """Apply the user's actions, then jump the clock to the next job and run it"""
+        pet = self.pet
+        for action in actions:
+            kind = action[0]
+            if kind == 'cursor':
+                event = FakeEvent(action[1], action[2])
+                if 0 <= action[1] < self.width and 0 <= action[2] < self.height:
+                    if not pet.pointer_inside:
+                        pet.mouse_enter(event)
+                    pet.track_mouse(event)
+                elif pet.pointer_inside:
+                    pet.mouse_leave(event)
+            elif kind == 'drag':
+                sim = pet.sim
+                event = FakeEvent(int(sim.x), int(sim.y))
+                pet.start_drag(event)
+                event.x += action[1]
+                event.y += action[2]
+                pet.drag_pet(event)
+                pet.end_drag(event)
+            elif kind == 'double':
+                sim = pet.pets[-1].sim
+                pet.pet_interaction(FakeEvent(int(sim.x), int(sim.y)))
+            elif kind == 'command':
+                pet.handle_command(action[1])
+            elif kind == 'suspend':
+                self.clock.now += action[1]
+
+        before = self.clock.now
+        deadline = pet.scheduler.next_deadline()
+        if deadline is not None and deadline > self.clock.now:
+            self.clock.now = deadline
+        # Fire the scheduler's Tk timer now rather than waiting real time for it
+        if pet.scheduler.timer is not None:
+            pet.root.after_cancel(pet.scheduler.timer)
+        pet.scheduler.run_due()
+        pet.root.update()  # Let Tk process its own events and idle work
+        return self.clock.now - before
+
+    def sample(self):
+        pet = self.pet
+        return dict(navigator_sample(pet.navigator), **{
+            'objects': len(gc.get_objects()),
+            'canvas_items': len(pet.canvas.find_all()),
+            'after_callbacks': len(pet.root.tk.splitlist(pet.root.tk.call('after', 'info'))),
+            'scheduler_heap': len(pet.scheduler.heap),
+        })
+
+    def close(self):
+        self.pet.root.destroy()
+
+
+def soak(harness, days, seed=1, samples=200, progress=None):
+    """Run a harness for days of virtual time, returning its list of samples"""
+    workload = Workload(harness.width, harness.height, seed)
+    end = harness.now + days * DAY_SECONDS
+    every = days * DAY_SECONDS / samples
+    next_sample = harness.now
+    elapsed = TICK_SECONDS
+    history = []
+    bounds = (0, 0, harness.width, harness.height)
+    while harness.now < end:
+        elapsed = harness.advance(workload.actions(elapsed)) or TICK_SECONDS
+        if harness.now >= next_sample:
+            while next_sample <= harness.now:
+                next_sample += every  # A suspend can jump past several sample points
+            sample = harness.sample()
+            sample['time'] = harness.now
+            sample['rss_kb'] = rss_kb()
+            sample['outside'] = sum(not (bounds[0] <= sim.x <= bounds[2] and
+                                         bounds[1] <= sim.y <= bounds[3])
+                                    for sim in harness.sims)
+            history.append(sample)
+            if progress:
+                progress(sample)
+    return history
+
+
+def find_growth(history, slack=None):
+    """Problems in a soak's samples: metrics still climbing after warm-up, pets outside"""
+    slack = dict(GROWTH_SLACK, **(slack or {}))
+    problems = []
+    if any(sample['outside'] for sample in history):
+        problems.append("a pet left the container")
+    for name, limit in LIMITS.items():
+        peak = max((sample[name] for sample in history if sample.get(name) is not None),
+                   default=0)
+        if peak > limit:
+            problems.append(f"{name} reached {peak}, over its limit of {limit}")
+    settled = history[int(len(history) * WARM_UP):]
+    half = len(settled) // 2
+    if half == 0:
+        return problems
+    for name, allowed in slack.items():
+        values = [sample[name] for sample in settled if sample.get(name) is not None]
+        if len(values) < 2:
+            continue
+        # Bounded metrics level off: the second half of the run should not outgrow the first
+        first, last = max(values[:half]), max(values[half:])
+        if last > first + allowed:
+            problems.append(f"{name} grew from {first} to {last}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running soak test for the desktop pet")
+    parser.add_argument('--days', type=float, default=1.0, help="Virtual days to run")
+    parser.add_argument('--pets', type=int, default=3, help="Pets in the container")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tk', action='store_true', help="Soak a real DesktopPet")
+    parser.add_argument('--xvfb', action='store_true', help="Soak a real DesktopPet under Xvfb")
+    args = parser.parse_args()
+
+    print("=== Desktop Pet Soak ===")
+    xvfb = None
+    if args.xvfb:
+        from benchmark_pet import start_xvfb
+        xvfb = start_xvfb()
+        if xvfb is None:
+            return 1
+    started = time.perf_counter()
+    try:
+        if args.tk or args.xvfb:
+            harness = TkSoak(max(1, args.pets), args.seed)
+        else:
+            harness = HeadlessSoak(max(1, args.pets), args.seed)
+        try:
+            history = soak(harness, args.days, args.seed, progress=lambda sample: print(
+                f"day {sample['time'] / DAY_SECONDS:6.2f}  "
+                + "  ".join(f"{name}={value}" for name, value in sample.items()
+                            if name != 'time'), end="\r"))
+        finally:
+            harness.close()
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    print()
+
+    print(f"{args.days:g} virtual days in {time.perf_counter() - started:.1f}s, "
+          f"{len(history)} samples")
+    problems = find_growth(history)
+    for problem in problems:
+        print(f"✗ {problem}")
+    if problems:
+        return 1
+    print("✓ Nothing grew without bound")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
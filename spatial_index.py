@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Uniform-grid spatial hash over pet positions.
+Answers "which pet is under this click" and "which pets are within radius r"
+by looking only at nearby grid cells, and is updated incrementally as pets
+move (a pet only changes bucket when it crosses a cell boundary).
+"""
+
+import math
+
+
+class SpatialHash:
+    """Buckets of item ids keyed by grid cell"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}      # (column, row) -> set of ids
+        self.entries = {}    # id -> [x, y, cell]
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, x, y):
+        """Add an item, or move it if it's already indexed"""
+        if item in self.entries:
+            self.move(item, x, y)
+            return
+        cell = self.cell_of(x, y)
+        self.entries[item] = [x, y, cell]
+        self.cells.setdefault(cell, set()).add(item)
+
+    def move(self, item, x, y):
+        """Update an item's position, re-bucketing only across cell boundaries"""
+        entry = self.entries[item]
+        entry[0] = x
+        entry[1] = y
+        cell = self.cell_of(x, y)
+        if cell != entry[2]:
+            self.discard_from_cell(item, entry[2])
+            entry[2] = cell
+            self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry:
+            self.discard_from_cell(item, entry[2])
+
+    def discard_from_cell(self, item, cell):
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.discard(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def query_radius(self, x, y, radius):
+        """Ids of items within radius of a point"""
+        found = []
+        size = self.cell_size
+        radius_sq = radius * radius
+        for column in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for row in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for item in self.cells.get((column, row), ()):
+                    entry = self.entries[item]
+                    dx = entry[0] - x
+                    dy = entry[1] - y
+                    if dx * dx + dy * dy <= radius_sq:
+                        found.append(item)
+        return found
+
+    def query_point(self, x, y, radius):
+        """The closest item within radius of a point, or None"""
+        best = None
+        best_distance = math.inf
+        for item in self.query_radius(x, y, radius):
+            entry = self.entries[item]
+            distance = (entry[0] - x) ** 2 + (entry[1] - y) ** 2
+            if distance < best_distance:
+                best, best_distance = item, distance
+        return best
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Sprite cache for the desktop pet.
+Rasterizes each emoji sprite once per size/DPI into a PhotoImage so frame
+changes only swap the image on a canvas item, and loads PNG/GIF sprite
+sheets lazily (the sheet is decoded the first time one of its frames is used).
+"""
+
+import os
+import platform
+import tkinter as tk
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+except ImportError:
+    # Without Pillow emoji can't be rasterized; callers fall back to text items
+    Image = None
+
+# Color emoji fonts by platform (bitmap fonts only render at their native sizes)
+EMOJI_FONTS = {
+    'Darwin': ['/System/Library/Fonts/Apple Color Emoji.ttc'],
+    'Windows': [os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'seguiemj.ttf')],
+    'Linux': ['/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf',
+              '/usr/share/fonts/noto/NotoColorEmoji.ttf',
+              '/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf'],
+}
+NATIVE_EMOJI_SIZES = [160, 137, 128, 109, 96, 64, 48, 40, 32, 20]
+
+
+class SpriteSheet:
+    """A sprite sheet image whose frames are cut out on first use"""
+
+    def __init__(self, path, frame_width=None, frame_height=None):
+        # Frame size defaults to square frames as tall as the sheet (a single row)
+        self.path = path
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.image = None
+
+    def decode(self, master):
+        """Read the image file, once"""
+        if self.image is None:
+            self.image = tk.PhotoImage(master=master, file=self.path)
+            self.frame_height = self.frame_height or self.image.height()
+            self.frame_width = self.frame_width or self.frame_height
+        return self.image
+
+    def frame_region(self, index, sheet_width):
+        """Pixel box (x1, y1, x2, y2) of a frame, reading left-to-right, top-to-bottom"""
+        columns = max(1, sheet_width // self.frame_width)
+        x = (index % columns) * self.frame_width
+        y = (index // columns) * self.frame_height
+        return x, y, x + self.frame_width, y + self.frame_height
+
+    def frame(self, master, index):
+        """Decode the sheet if needed and copy out one frame"""
+        image = self.decode(master)
+        frame = tk.PhotoImage(master=master, width=self.frame_width, height=self.frame_height)
+        frame.tk.call(frame, 'copy', image, '-from', *self.frame_region(index, image.width()))
+        return frame
+
+
+class SpriteCache:
+    """PhotoImages for the pet's sprites, created once and reused every frame"""
+
+    def __init__(self, root, sprites, size=32):
+        self.root = root
+        self.sprites = sprites  # Sprite name -> emoji text
+        self.size = size        # Font size in points, like the text item it replaces
+        self.images = {}
+        self.sheet_frames = {}  # Sprite name -> (SpriteSheet, frame index)
+        self.fonts = {}
+        self.font_path = self.find_emoji_font() if Image else None
+
+        # Points to pixels for this display, so sprites stay sharp on high-DPI screens
+        try:
+            self.scale = root.winfo_fpixels('1i') / 72.0
+        except tk.TclError:
+            self.scale = 1.0
+
+    @staticmethod
+    def find_emoji_font():
+        """Locate a color emoji font for this platform"""
+        for path in EMOJI_FONTS.get(platform.system(), []):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def available(self):
+        """True if every sprite can be drawn as an image
+
+        Emoji sprites are rasterized here, once; sheet frames stay lazy.
+        """
+        return all(name in self.sheet_frames or self.get(name) is not None
+                   for name in self.sprites)
+
+    def load_sheet(self, path, names, frame_width=None, frame_height=None):
+        """Use frames from a PNG/GIF sheet for the given sprite names, in order"""
+        sheet = SpriteSheet(path, frame_width, frame_height)
+        for index, name in enumerate(names):
+            self.sheet_frames[name] = (sheet, index)
+            self.images.pop(self.key(name), None)
+
+    def key(self, name):
+        return name, round(self.size * self.scale)
+
+    def get(self, name):
+        """PhotoImage for a sprite, or None if it can't be rasterized"""
+        key = self.key(name)
+        if key not in self.images:
+            if name in self.sheet_frames:
+                sheet, index = self.sheet_frames[name]
+                self.images[key] = sheet.frame(self.root, index)
+            else:
+                self.images[key] = self.rasterize(self.sprites[name], key[1])
+        return self.images[key]
+
+    def emoji_font(self, pixels):
+        """Load the emoji font at the requested or nearest native size"""
+        if pixels not in self.fonts:
+            self.fonts[pixels] = None
+            for size in [pixels] + NATIVE_EMOJI_SIZES:
+                try:
+                    self.fonts[pixels] = ImageFont.truetype(self.font_path, size)
+                    break
+                except OSError:
+                    continue
+        return self.fonts[pixels]
+
+    def rasterize(self, text, pixels):
+        """Render emoji text once into a transparent PhotoImage"""
+        if self.font_path is None:
+            return None
+        font = self.emoji_font(pixels)
+        if font is None:
+            return None
+
+        probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        left, top, right, bottom = probe.textbbox((0, 0), text, font=font, embedded_color=True)
+        image = Image.new('RGBA', (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((-left, -top), text, font=font, embedded_color=True)
+
+        # Bitmap emoji fonts render at a fixed size; scale to the requested height
+        if image.height != pixels:
+            width = max(1, round(image.width * pixels / image.height))
+            image = image.resize((width, pixels), Image.LANCZOS)
+        return ImageTk.PhotoImage(image, master=self.root)
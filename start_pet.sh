@@ -23,6 +23,12 @@ if [ ! -f "$PET_SCRIPT" ]; then
     exit 1
 fi
 
+# Only one pet at a time: leave a running pet alone
+if $PYTHON_CMD "$SCRIPT_DIR/petctl.py" status &> /dev/null; then
+    echo "Desktop Pet is already running. Stop it with: $PYTHON_CMD petctl.py quit"
+    exit 0
+fi
+
 # Run the desktop pet
 echo "Starting Desktop Pet..."
 cd "$SCRIPT_DIR"
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the desktop-level strategies, using stand-ins for the platform APIs
+"""
+
+from desktop_level import NullDesktopLevel, WindowsDesktopLevel, was_raised
+
+
+class FakeRoot:
+    """Only what the strategies ask of a Tk root"""
+
+    def wm_frame(self):
+        return '0x2a'
+
+
+class FakeWin32:
+    """Stand-in for win32gui and win32con with a window stack to play with"""
+
+    SWP_NOMOVE, SWP_NOSIZE, SWP_NOACTIVATE = 2, 1, 16
+    HWND_BOTTOM = 1
+    GW_HWNDNEXT = 2
+
+    def __init__(self):
+        self.below = 0          # Window currently under ours (0: none)
+        self.set_calls = 0
+        self.get_calls = 0
+
+    def SetWindowPos(self, hwnd, after, x, y, cx, cy, flags):
+        self.set_calls += 1
+        self.below = 0
+
+    def GetWindow(self, hwnd, relation):
+        self.get_calls += 1
+        return self.below
+
+
+def test_relevels_only_after_a_stacking_event():
+    """Event-driven backends do nothing until an event marks them dirty"""
+    level = NullDesktopLevel(FakeRoot())
+    assert not level.check()
+    level.mark_dirty()
+    assert level.check()
+    assert not level.check()
+    assert level.applied == 1
+
+
+def test_windows_polls_z_order_without_relevelling():
+    """SetWindowPos is only re-issued once something slipped under the window"""
+    win32 = FakeWin32()
+    level = WindowsDesktopLevel(FakeRoot(), win32gui=win32, win32con=win32)
+    assert level.hwnd == 42
+    level.lower()
+    for _ in range(100):
+        assert not level.check()
+    assert win32.set_calls == 1
+
+    win32.below = 99  # Another window went behind ours
+    assert level.check()
+    assert win32.set_calls == 2 and not level.check()
+
+
+def test_visibility_raise_detection():
+    """Becoming less covered counts as a possible raise, more covered doesn't"""
+    assert was_raised('VisibilityFullyObscured', 'VisibilityUnobscured')
+    assert was_raised('VisibilityPartiallyObscured', 'VisibilityUnobscured')
+    assert not was_raised('VisibilityUnobscured', 'VisibilityFullyObscured')
+    assert not was_raised('VisibilityUnobscured', 'VisibilityUnobscured')
+
+
+def main():
+    """Run all tests"""
+    print("=== Desktop Level Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for DesktopPet's event handlers - no display needed: the pet is
+assembled around a stand-in root, a null renderer and a fake-clock scheduler
+"""
+
+import random
+
+from desktop_level import NullDesktopLevel
+from desktop_pet import DesktopPet, PetView
+from pet_core import (PetSimulation, Animation, WakeDetector, DESKTOP_PROFILE, ANIMATIONS,
+                      TICK_SECONDS, FRAME_SECONDS, HIDDEN_TICK_SECONDS)
+from pet_metrics import TickMetrics
+from pet_navigation import NavGrid
+from pet_renderers import NullRenderer
+from pet_scheduler import TickScheduler
+from spatial_index import SpatialHash
+from test_pet_scheduler import FakeLoop
+
+
+class FakeEvent:
+    """Just enough of a Tk event for the handlers"""
+
+    def __init__(self, widget=None, x=0, y=0, state=None):
+        self.widget = widget
+        self.x = x
+        self.y = y
+        self.state = state
+
+
+def make_desktop_pet(pet_count=2, seed=1):
+    """A DesktopPet with the state __init__ sets up, minus the Tk window"""
+    loop = FakeLoop()
+    pet = DesktopPet.__new__(DesktopPet)
+    pet.root = object()  # Only compared against event.widget
+    pet.clock = loop.clock
+    pet.container_width, pet.container_height, pet.pet_radius = 400, 300, 16
+    pet.navigator = NavGrid(400, 300, 16)
+    pet.renderer = NullRenderer()
+    pet.desktop_level = NullDesktopLevel(pet.root)
+    pet.get_cursor_position = lambda: None
+    pet.rng = random.Random(seed)
+    pet.pets = []
+    for index in range(pet_count):
+        sim = PetSimulation(400, 300, 16, DESKTOP_PROFILE, pet.rng)
+        sim.navigator = pet.navigator
+        sim.place(100 + 150 * index, 150)
+        pet.pets.append(PetView(index, sim, Animation(animations=dict(ANIMATIONS))))
+    pet.sim = pet.pets[0].sim
+    pet.sims = [view.sim for view in pet.pets]
+    pet.recorder = pet.worker = pet.hud = pet.control = None
+    pet.pet_index = SpatialHash(pet.pet_radius * 4)
+    for view in pet.pets:
+        pet.pet_index.insert(view.index, view.sim.x, view.sim.y)
+    pet.dragged = None
+    pet.pointer_inside = False
+    pet.drag_start_x = pet.drag_start_y = 0
+    pet.drag_pointer = None
+    pet.drag_pointer_time = pet.last_drag_draw = 0.0
+    pet.last_step_time = pet.last_frame_time = loop.clock()
+    pet.wake_detector = WakeDetector(loop.clock)
+    pet.rendering = False
+    pet.mapped, pet.obscured, pet.visible = True, False, True
+    pet.visibility_state = 'VisibilityUnobscured'
+    pet.metrics = TickMetrics()
+    pet.scheduler = TickScheduler(loop.after, loop.after_cancel, loop.clock, pet.metrics)
+    pet.scheduler.register('animate', 0.5, pet.animate)
+    pet.scheduler.register('behavior', TICK_SECONDS, pet.update_behavior)
+    return loop, pet
+
+
+def behavior_runs(pet):
+    return len(pet.metrics.lateness['behavior'])
+
+
+def assert_caught_up(loop, pet):
+    """The pets have been stepped through all the time that passed"""
+    assert pet.last_step_time == loop.now
+    for sim in pet.sims:
+        assert sim.accumulator < TICK_SECONDS
+
+
+def test_hidden_pets_slow_down_and_catch_up():
+    """Unmapping or full obscuring stretches the tick; showing again resumes and catches up at once"""
+    for hide, show in (
+            (lambda pet: pet.on_unmap(FakeEvent(pet.root)),
+             lambda pet: pet.on_map(FakeEvent(pet.root))),
+            (lambda pet: pet.on_visibility(FakeEvent(pet.root, state='VisibilityFullyObscured')),
+             lambda pet: pet.on_visibility(FakeEvent(pet.root, state='VisibilityUnobscured')))):
+        loop, pet = make_desktop_pet()
+        loop.run_until(1.0)
+        hide(pet)
+        assert not pet.visible and not pet.rendering
+        assert 'animate' not in pet.scheduler.jobs and 'render' not in pet.scheduler.jobs
+        assert pet.scheduler.jobs['behavior'].deadline == 1.0 + HIDDEN_TICK_SECONDS
+
+        runs, moves = behavior_runs(pet), pet.renderer.moves
+        loop.run_until(26.0)
+        assert behavior_runs(pet) - runs == 2  # At 11s and 21s only
+        assert pet.renderer.moves == moves  # Nothing drawn while hidden
+
+        show(pet)
+        assert pet.visible
+        assert pet.scheduler.next_deadline() == 26.0  # Not after the hidden interval
+        assert 'animate' in pet.scheduler.jobs
+        runs = behavior_runs(pet)
+        loop.run_until(26.0)
+        assert behavior_runs(pet) - runs == 1  # One catch-up tick, not one per missed tick
+        assert_caught_up(loop, pet)
+
+
+def test_partial_obscuring_keeps_drawing():
+    """A partly covered window stays visible, and a map of a child widget is ignored"""
+    loop, pet = make_desktop_pet()
+    pet.on_visibility(FakeEvent(pet.root, state='VisibilityPartiallyObscured'))
+    pet.on_unmap(FakeEvent(object()))
+    assert pet.visible and 'animate' in pet.scheduler.jobs
+    loop.run_until(5.0)
+    assert behavior_runs(pet) > 2  # Not backed off to the hidden interval
+    assert pet.renderer.flushes >= 10  # Still animating twice a second
+
+
+def test_drag_motion_is_coalesced():
+    """A burst of <B1-Motion> in one frame moves the pet once; release flushes the last one"""
+    loop, pet = make_desktop_pet(pet_count=1)
+    loop.run_until(1.0)
+    sim = pet.sim
+    x, y = round(sim.x), round(sim.y)
+    pet.start_drag(FakeEvent(x=x, y=y))
+    assert pet.dragged is pet.pets[0]
+    start_x, start_y = sim.x, sim.y
+
+    for step in range(1, 11):
+        pet.drag_pet(FakeEvent(x=x + 3 * step, y=y + step))
+    assert (sim.x, sim.y) == (start_x, start_y)  # Nothing applied until the 'drag' job runs
+    loop.run_until(1.0)  # First update after a pause goes out right away
+    assert len(pet.metrics.lateness['drag']) == 1
+    assert (sim.x, sim.y) == (start_x + 30, start_y + 10)  # Only the latest pointer counts
+    assert 'drag' not in pet.scheduler.jobs and pet.drag_pointer is None
+    assert len(pet.metrics.lateness['drag_latency']) == 1
+
+    # More motion inside the next frame, then release before that frame comes round
+    for step in range(1, 6):
+        pet.drag_pet(FakeEvent(x=x + 30 - step, y=y + 10))
+    assert pet.scheduler.jobs['drag'].deadline == 1.0 + FRAME_SECONDS
+    pet.end_drag(FakeEvent(x=x + 25, y=y + 10))
+    assert (sim.x, sim.y) == (start_x + 25, start_y + 10)  # The last motion wasn't dropped
+    assert pet.dragged is None and not sim.is_dragging
+    assert 'drag' not in pet.scheduler.jobs
+    assert len(pet.metrics.lateness['drag_latency']) == 2
+    loop.run_until(2.0)
+    assert len(pet.metrics.lateness['drag']) == 1
+
+
+def main():
+    """Run all tests"""
+    print("=== Desktop Pet Handlers Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,17 @@ This allows you to test all pet behaviors without desktop-level positioning.
 
 import tkinter as tk
 from tkinter import PhotoImage
-import random
-import math
+import os
 import platform
 import sys
+import time
+
+from pet_scheduler import TickScheduler
+from sprite_cache import SpriteCache
+from pet_renderers import TkCanvasRenderer
+from pet_navigation import NavGrid
+from pet_core import (PetSimulation, Animation, WakeDetector, INTERACTIVE_PROFILE,
+                      PET_SPRITES, ANIMATIONS, TICK_SECONDS, FRAME_SECONDS)
 
 class TestDesktopPet:
     def __init__(self):
@@ -23,26 +30,29 @@ class TestDesktopPet:
         self.setup_pet()
         self.setup_animations()
         
-        # Pet state
-        self.target_x = self.container_width // 2
-        self.target_y = self.container_height // 2
-        self.current_x = self.container_width // 2
-        self.current_y = self.container_height // 2
-        self.is_dragging = False
+        # Pet state lives in the shared headless simulation
+        self.sim = PetSimulation(self.container_width, self.container_height,
+                                 self.pet_radius, INTERACTIVE_PROFILE)
+        self.sim.navigator = self.navigator
         self.drag_start_x = 0
         self.drag_start_y = 0
-        self.animation_frame = 0
-        self.idle_counter = 0
-        self.state = "idle"  # idle, walking, sleeping, playing
+        self.drag_pointer = None  # Latest motion not yet applied to the pet
+        self.last_drag_draw = 0.0
+        self.animation = Animation(0.4, 1.0, 1, self.animations)
+        self.drawn_position = None
+        self.last_step_time = self.last_frame_time = time.monotonic()
+        self.wake_detector = WakeDetector()
+        self.rendering = False
         
         # Test mode variables
         self.mouse_in_window = False
         self.last_cursor_x = 0
         self.last_cursor_y = 0
         
-        # Start the main loops
-        self.animate()
-        self.update_behavior()
+        # Start the main loops, all serviced by one scheduler timer
+        self.scheduler = TickScheduler(self.root.after, self.root.after_cancel)
+        self.scheduler.register('animate', 0.4, self.animate)
+        self.scheduler.register('behavior', TICK_SECONDS, self.update_behavior)
         
     def setup_test_window(self):
         """Configure the test window"""
@@ -91,36 +101,42 @@ class TestDesktopPet:
                                    fill='#fcfcfc', outline='#e0e0e0', width=2)
         
         # Add corner decorations
-        self.canvas.create_text(self.container_width-15, 15, text='🏠', 
-                              font=('Arial', 12), anchor='ne', fill='#c0c0c0')
+        house = self.canvas.create_text(self.container_width-15, 15, text='🏠', 
+                                        font=('Arial', 12), anchor='ne', fill='#c0c0c0')
         
-        self.canvas.create_text(15, self.container_height-15, 
-                              text=f'{self.container_width}x{self.container_height}',
-                              font=('Arial', 8), anchor='sw', fill='#999')
+        size_label = self.canvas.create_text(15, self.container_height-15, 
+                                             text=f'{self.container_width}x{self.container_height}',
+                                             font=('Arial', 8), anchor='sw', fill='#999')
         
         # Create simple pet sprite
-        self.pet_sprites = {
-            'idle1': '🐱',
-            'idle2': '😺', 
-            'walk1': '🐾',
-            'walk2': '🐱',
-            'sleep': '😴',
-            'play': '😸'
-        }
+        self.pet_sprites = dict(PET_SPRITES)
         
         # Create the pet on canvas (start in center)
         pet_size = 32
         self.pet_start_x = self.container_width // 2
         self.pet_start_y = self.container_height // 2
         
-        self.pet = self.canvas.create_text(self.pet_start_x, self.pet_start_y, 
-                                         text=self.pet_sprites['idle1'], 
-                                         font=('Arial', pet_size), anchor='center')
+        # Rasterize each sprite once when possible instead of drawing emoji text every frame
+        self.sprite_cache = SpriteCache(self.root, self.pet_sprites, pet_size)
+        sheet_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sprites.png')
+        if os.path.exists(sheet_path):
+            # One row of square frames, in the same order as pet_sprites
+            self.sprite_cache.load_sheet(sheet_path, list(self.pet_sprites))
+        self.renderer = TkCanvasRenderer(self.canvas, self.pet_sprites, self.sprite_cache, pet_size)
+        self.use_images = self.renderer.use_images
+        self.pet = self.renderer.add_pet(0, self.pet_start_x, self.pet_start_y, 'idle1')
         
         # Store pet bounds for collision detection
         self.pet_size = pet_size
         self.pet_radius = pet_size // 2
         
+        # The pet walks around the corner decorations
+        self.navigator = NavGrid(self.container_width, self.container_height, self.pet_radius)
+        for name, item in (('house', house), ('size', size_label)):
+            bbox = self.canvas.bbox(item)
+            if bbox:
+                self.navigator.set_obstacle(name, *bbox)
+        
         # Bind mouse events
         self.canvas.bind('<Button-1>', self.start_drag)
         self.canvas.bind('<B1-Motion>', self.drag_pet)
@@ -149,214 +165,149 @@ class TestDesktopPet:
         
     def setup_animations(self):
         """Setup animation sequences"""
-        self.animations = {
-            'idle': ['idle1', 'idle2', 'idle1', 'idle1'],
-            'walking': ['walk1', 'walk2', 'walk1', 'walk2'],
-            'sleep': ['sleep', 'sleep', 'sleep', 'sleep'],
-            'play': ['play', 'idle1', 'play', 'idle2']
-        }
+        self.animations = dict(ANIMATIONS)
+        
+    @property
+    def state(self):
+        """Current pet state (idle, walking, sleep, play)"""
+        return self.sim.state
+        
+    def draw(self):
+        """Draw the pet at its simulated position"""
+        x, y = self.sim.render_position(time.monotonic() - self.last_step_time)
+        position = (x, y + self.animation.bounce)  # Bounce is layered on at draw time only
+        if position != self.drawn_position:
+            self.drawn_position = position
+            self.renderer.move_pet(0, *position)
+        self.renderer.flush()
+        
+    def render(self):
+        """Redraw at frame rate while the pet walks, then stop"""
+        self.draw()
+        if not self.sim.is_moving():
+            self.rendering = False
+            self.scheduler.unregister('render')
         
     def track_mouse(self, event):
         """Track mouse movement for following behavior"""
         self.mouse_in_window = True
         self.last_cursor_x = event.x
         self.last_cursor_y = event.y
+        self.sim.set_cursor(event.x, event.y)
         
     def mouse_enter(self, event):
         """Mouse entered the canvas"""
         self.mouse_in_window = True
+        self.sim.set_cursor(event.x, event.y)
+        self.wake()
         
     def mouse_leave(self, event):
         """Mouse left the canvas"""
         self.mouse_in_window = False
+        self.sim.set_cursor(None, None)
         
     def start_drag(self, event):
         """Start dragging the pet"""
-        pet_coords = self.canvas.coords(self.pet)
-        if pet_coords:
-            pet_x, pet_y = pet_coords[0], pet_coords[1]
-            distance = ((event.x - pet_x)**2 + (event.y - pet_y)**2)**0.5
-            
-            if distance <= self.pet_radius + 10:
-                self.is_dragging = True
-                self.drag_start_x = event.x
-                self.drag_start_y = event.y
-                self.state = "idle"  # Stop other behaviors while dragging
+        if self.sim.start_drag(event.x, event.y):
+            self.drag_start_x = event.x
+            self.drag_start_y = event.y
+            self.sim.state = "idle"  # Stop other behaviors while dragging
+            self.wake()
                 
     def drag_pet(self, event):
         """Handle pet dragging"""
-        if self.is_dragging:
-            dx = event.x - self.drag_start_x
-            dy = event.y - self.drag_start_y
+        if self.sim.is_dragging:
+            if self.drag_pointer is None:
+                # Coalesce motion to one pet update per display frame
+                delay = self.last_drag_draw + FRAME_SECONDS - time.monotonic()
+                self.scheduler.register('drag', FRAME_SECONDS, self.apply_drag,
+                                        delay=max(0.0, delay))
+            self.drag_pointer = (event.x, event.y)
             
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords:
-                new_x = pet_coords[0] + dx
-                new_y = pet_coords[1] + dy
-                
-                # Keep pet within container bounds
-                margin = self.pet_radius + 5
-                new_x = max(margin, min(new_x, self.container_width - margin))
-                new_y = max(margin, min(new_y, self.container_height - margin))
-                
-                # Move the pet
-                self.canvas.coords(self.pet, new_x, new_y)
-                
-                # Update drag start position for smooth dragging
-                self.drag_start_x = event.x
-                self.drag_start_y = event.y
+    def apply_drag(self):
+        """Move the pet to the latest pointer position"""
+        self.scheduler.unregister('drag')
+        if self.drag_pointer is None or not self.sim.is_dragging:
+            return
+        x, y = self.drag_pointer
+        self.drag_pointer = None
+        self.sim.drag_by(x - self.drag_start_x, y - self.drag_start_y)
+        self.draw()
+        self.last_drag_draw = time.monotonic()
+        
+        # Update drag start position for smooth dragging
+        self.drag_start_x = x
+        self.drag_start_y = y
                 
     def end_drag(self, event):
         """End dragging"""
-        self.is_dragging = False
+        self.apply_drag()  # Don't drop the last motion
+        self.sim.end_drag()
         
     def pet_interaction(self, event):
         """Handle double-click interaction"""
-        pet_coords = self.canvas.coords(self.pet)
-        if pet_coords:
-            pet_x, pet_y = pet_coords[0], pet_coords[1]
-            distance = ((event.x - pet_x)**2 + (event.y - pet_y)**2)**0.5
-            
-            if distance <= self.pet_radius + 15:
-                self.trigger_play()
+        if self.sim.hit_test(event.x, event.y, 15):
+            self.trigger_play()
                 
     def trigger_play(self):
         """Trigger play state"""
-        self.state = "play"
-        self.idle_counter = 0
+        self.sim.trigger("play")
+        self.wake()
         
     def trigger_sleep(self):
         """Trigger sleep state"""
-        self.state = "sleep"
-        self.idle_counter = 0
+        self.sim.trigger("sleep")
+        self.wake()
         
     def trigger_walk(self):
         """Trigger walking to cursor or random spot"""
         if self.mouse_in_window:
-            self.set_target(self.last_cursor_x, self.last_cursor_y)
+            self.sim.set_target(self.last_cursor_x, self.last_cursor_y)
+            self.wake()
         else:
             self.random_target()
             
     def random_target(self):
         """Set random target within container"""
-        margin = self.pet_radius + 20
-        self.target_x = random.randint(margin, self.container_width - margin)
-        self.target_y = random.randint(margin, self.container_height - margin)
-        self.state = "walking"
-        
-    def set_target(self, x, y):
-        """Set specific target coordinates"""
-        margin = self.pet_radius + 10
-        self.target_x = max(margin, min(x, self.container_width - margin))
-        self.target_y = max(margin, min(y, self.container_height - margin))
-        self.state = "walking"
-        
-    def follow_cursor(self):
-        """Make pet follow cursor when idle"""
-        if (self.is_dragging or self.state not in ["idle", "walking"] or 
-            not self.mouse_in_window):
-            return
-            
-        pet_coords = self.canvas.coords(self.pet)
-        if pet_coords:
-            pet_x, pet_y = pet_coords[0], pet_coords[1]
-            cursor_x, cursor_y = self.last_cursor_x, self.last_cursor_y
-            
-            # Calculate distance to cursor
-            distance = math.sqrt((cursor_x - pet_x)**2 + (cursor_y - pet_y)**2)
-            
-            # Follow if cursor is close but not too close
-            if 30 < distance < 100:
-                self.set_target(cursor_x, cursor_y)
-                
-    def update_position(self):
-        """Smoothly move pet towards target"""
-        if self.state == "walking" and not self.is_dragging:
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords:
-                current_pet_x, current_pet_y = pet_coords[0], pet_coords[1]
-                
-                # Move towards target
-                dx = self.target_x - current_pet_x
-                dy = self.target_y - current_pet_y
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                if distance > 3:
-                    # Move step by step
-                    step_size = min(2, distance / 6)
-                    new_x = current_pet_x + (dx / distance) * step_size
-                    new_y = current_pet_y + (dy / distance) * step_size
-                    
-                    # Keep within container bounds
-                    margin = self.pet_radius + 5
-                    new_x = max(margin, min(new_x, self.container_width - margin))
-                    new_y = max(margin, min(new_y, self.container_height - margin))
-                    
-                    # Move the pet
-                    self.canvas.coords(self.pet, new_x, new_y)
-                else:
-                    self.state = "idle"
-                    
-    def wander_randomly(self):
-        """Make pet wander to a random spot in the container"""
-        if not self.is_dragging:
-            self.random_target()
+        self.sim.wander_randomly()
+        self.wake()
             
     def update_behavior(self):
         """Update pet behavior and state"""
-        self.idle_counter += 1
+        # Advance the simulation by the time elapsed since the last update
+        now = time.monotonic()
+        dt = now - self.last_step_time
+        self.sim.step(dt + self.wake_detector.missed(dt))
+        self.last_step_time = now
+        
+        # Interpolate between ticks at frame rate while walking
+        if self.sim.is_moving() and not self.rendering:
+            self.rendering = True
+            self.scheduler.register('render', FRAME_SECONDS, self.render)
         
         # Update status
         self.status_label.config(text=f"State: {self.state}")
         
-        # Random behavior changes
-        if self.idle_counter > 80:  # About 8 seconds in test mode
-            if self.state == "idle":
-                rand = random.random()
-                if rand < 0.15:
-                    self.state = random.choice(["sleep", "play"])
-                elif rand < 0.3:  # Random wandering
-                    self.wander_randomly()
-            elif self.state in ["sleep", "play"]:
-                # Return to idle after a while
-                if random.random() < 0.2:
-                    self.state = "idle"
-            self.idle_counter = 0
-            
-        # Follow cursor behavior
-        self.follow_cursor()
-        
-        # Update position
-        self.update_position()
+        # Back off while sleeping or while the cursor is outside the window
+        return self.sim.tick_interval()
         
-        # Schedule next behavior update
-        self.root.after(100, self.update_behavior)
+    def wake(self):
+        """Return to the full behavior tick rate right away"""
+        self.scheduler.reschedule('behavior')
         
     def animate(self):
         """Animate the pet sprite"""
-        # Get current animation sequence
-        current_animation = self.animations.get(self.state, self.animations['idle'])
-        
-        # Update animation frame
-        sprite_name = current_animation[self.animation_frame % len(current_animation)]
-        sprite = self.pet_sprites[sprite_name]
-        
-        # Update pet display
-        self.canvas.itemconfig(self.pet, text=sprite)
-        
-        # Add a subtle bounce effect when walking
-        if self.state == "walking" and self.animation_frame % 4 < 2:
-            pet_coords = self.canvas.coords(self.pet)
-            if pet_coords and len(pet_coords) >= 2:
-                bounce_offset = 1 if self.animation_frame % 4 == 0 else -1
-                self.canvas.coords(self.pet, pet_coords[0], pet_coords[1] + bounce_offset)
+        # Pick the frame from elapsed time so a stalled loop doesn't slow the animation
+        now = time.monotonic()
+        elapsed = now - self.last_frame_time
+        self.last_frame_time = now
         
-        # Advance animation frame
-        self.animation_frame += 1
+        # Update pet display only when the sprite actually changes
+        if self.animation.advance(self.state, elapsed):
+            self.renderer.set_sprite(0, self.animation.sprite)
+        self.draw()
         
-        # Schedule next frame (slower for sleep)
-        delay = 1000 if self.state == "sleep" else 400
-        self.root.after(delay, self.animate)
+        return self.animation.frame_duration(self.state)
         
     def run(self):
         """Start the test application"""
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio main loop - a stand-in root, no display needed
+"""
+
+import asyncio
+import time
+
+from pet_async import pump_interval, run_async, POINTER_PUMP_SECONDS, IDLE_PUMP_SECONDS, \
+    HIDDEN_PUMP_SECONDS
+from pet_core import FRAME_SECONDS
+from pet_scheduler import TickScheduler
+
+
+class FakeTk:
+    """Counts dooneevent calls; never has a pending event"""
+
+    def __init__(self):
+        self.pumps = 0
+
+    def dooneevent(self, flags):
+        self.pumps += 1
+        return False
+
+
+class FakeRoot:
+    """Just enough of a Tk root for run_async"""
+
+    def __init__(self):
+        self.tk = FakeTk()
+        self.bindings = {}
+        self.timers = set()
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func):
+        timer_id = object()
+        self.timers.add(timer_id)
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self.timers.discard(timer_id)
+
+    def destroy(self):
+        event = type('Event', (), {'widget': self})()
+        self.bindings['<Destroy>'](event)
+
+
+class FakePet:
+    """The parts of DesktopPet that run_async and pump_interval use"""
+
+    def __init__(self, visible=True, pointer_inside=False, dragged=None):
+        self.root = FakeRoot()
+        self.scheduler = TickScheduler(self.root.after, self.root.after_cancel)
+        self.visible = visible
+        self.pointer_inside = pointer_inside
+        self.dragged = dragged
+        self.worker = None
+        self.recorder = None
+
+
+def test_pump_interval_follows_the_pointer():
+    """Frame rate under the pointer or a drag, a short poll otherwise, and never seconds"""
+    assert pump_interval(FakePet(pointer_inside=True)) == POINTER_PUMP_SECONDS == FRAME_SECONDS
+    assert pump_interval(FakePet(dragged=object())) == POINTER_PUMP_SECONDS
+    assert pump_interval(FakePet(visible=False, dragged=object())) == POINTER_PUMP_SECONDS
+    assert pump_interval(FakePet()) == IDLE_PUMP_SECONDS
+    assert pump_interval(FakePet(visible=False)) == HIDDEN_PUMP_SECONDS
+    for pet in (FakePet(), FakePet(visible=False)):
+        assert 0.1 <= pump_interval(pet) <= 0.25  # A click or Map is never left waiting
+
+
+def test_run_async_pumps_and_closes():
+    """Scheduler jobs run on the asyncio loop, Tk is pumped, and Destroy ends the run"""
+    pet = FakePet(pointer_inside=True)
+    runs = []
+    pet.scheduler.register('job', 0.05, lambda: runs.append(time.monotonic()))
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.4, pet.root.destroy)
+        await run_async(pet, serve_control=False)
+
+    started = time.monotonic()
+    asyncio.run(main())
+    elapsed = time.monotonic() - started
+    assert 0.35 <= elapsed < 2.0
+    assert len(runs) >= 4
+    # Polled at frame rate while the pointer is inside, plus a pump after every job
+    assert pet.root.tk.pumps >= len(runs) + 4
+    assert not pet.root.timers  # The scheduler moved off Tk's after()
+    assert pet.scheduler.next_deadline() is None  # Cleared once the window is gone
+
+
+def main():
+    """Run all tests"""
+    print("=== Asyncio Loop Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the table-driven behavior model
+"""
+
+import random
+
+from pet_behavior import BehaviorModel, alias_table, mean_rectangle_distance
+from pet_core import PetSimulation, DESKTOP_PROFILE, INTERACTIVE_PROFILE
+
+
+def test_alias_sampling_matches_probabilities():
+    """Sampling the compiled tables reproduces the configured row"""
+    model = DESKTOP_PROFILE['behavior']
+    rng = random.Random(1)
+    counts = {}
+    draws = 100000
+    for _ in range(draws):
+        state = model.sample('idle', rng.random())
+        counts[state] = counts.get(state, 0) + 1
+    for state, p in model.transitions['idle'].items():
+        assert abs(counts[state] / draws - p) < 0.01
+
+
+def test_alias_table_is_exact():
+    """Every outcome keeps exactly its share of the probability mass"""
+    weights = [0.5, 0.3, 0.15, 0.05]
+    probability, alias = alias_table(weights)
+    mass = [0.0] * len(weights)
+    for i, p in enumerate(probability):
+        mass[i] += p / len(weights)
+        mass[alias[i]] += (1 - p) / len(weights)
+    assert all(abs(m - w) < 1e-12 for m, w in zip(mass, weights))
+
+
+def test_stationary_distribution_balances():
+    """The analytic stationary distribution is unchanged by one more step"""
+    for profile in (DESKTOP_PROFILE, INTERACTIVE_PROFILE):
+        model = profile['behavior']
+        pi = model.stationary()
+        matrix = model.jump_matrix()
+        for j, state in enumerate(model.states):
+            inflow = sum(pi[other] * matrix[i][j] for i, other in enumerate(model.states))
+            assert abs(inflow - pi[state]) < 1e-12
+        assert abs(sum(pi.values()) - 1) < 1e-12
+
+
+def test_time_fractions_match_a_simulated_chain():
+    """Long-run time in each state matches a direct simulation of the chain"""
+    model = DESKTOP_PROFILE['behavior']
+    walk_time = 9.0
+    rng = random.Random(2)
+    spent = dict.fromkeys(model.states, 0.0)
+    state = 'idle'
+    for _ in range(200000):
+        if state == 'walking':
+            spent[state] += walk_time
+            state = 'idle'
+        else:
+            spent[state] += model.dwell_seconds[state]
+            state = model.sample(state, rng.random())
+    total = sum(spent.values())
+    for state, fraction in model.time_fractions(walk_time).items():
+        assert abs(spent[state] / total - fraction) < 0.02
+
+
+def test_outlook_matches_a_simulated_chain():
+    """The closed-form chance of never walking matches stepping the chain"""
+    model = DESKTOP_PROFILE['behavior']
+    rng = random.Random(4)
+    runs = 50000
+    stayed = 0
+    for _ in range(runs):
+        state = 'sleep'
+        for _ in range(6):
+            state = model.sample(state, rng.random())
+            if state == 'walking':
+                break
+        else:
+            stayed += 1
+    _, never_walked = model.outlook('sleep', 6, 9.0)
+    assert abs(stayed / runs - never_walked) < 0.01
+
+
+def test_long_outlook_settles_on_time_fractions():
+    """After many jumps the outlook no longer depends on where it started"""
+    model = DESKTOP_PROFILE['behavior']
+    fractions = model.time_fractions(9.0)
+    for start in ('idle', 'sleep', 'play'):
+        chances, never_walked = model.outlook(start, 5000, 9.0)
+        assert never_walked < 1e-6
+        for state, fraction in fractions.items():
+            assert abs(chances[state] - fraction) < 1e-9
+
+
+def test_pet_idles_for_the_expected_time():
+    """The simulation's idle visits last as long as the model predicts"""
+    pet = PetSimulation(400, 300, 16, DESKTOP_PROFILE, random.Random(3))
+    visits = []
+    length = 0
+    for _ in range(200000):
+        pet.tick()
+        if pet.state == 'idle':
+            length += 1
+        elif length:
+            visits.append(length * 0.1)
+            length = 0
+    expected = DESKTOP_PROFILE['behavior'].expected_visit_seconds('idle')
+    assert abs(sum(visits) / len(visits) - expected) < expected * 0.2
+
+
+def test_bad_rows_are_rejected():
+    """Rows must sum to one and only name known states"""
+    for transitions in ({'idle': {'idle': 0.5}},
+                        {'idle': {'idle': 0.5, 'dance': 0.5}}):
+        try:
+            BehaviorModel({'idle': 1.0}, transitions)
+        except ValueError:
+            continue
+        assert False, f"accepted {transitions}"
+
+
+def test_mean_rectangle_distance():
+    """The closed form matches the known value for a unit square"""
+    assert abs(mean_rectangle_distance(1, 1) - 0.5214054) < 1e-6
+
+
+def main():
+    """Run all tests"""
+    print("=== Behavior Model Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-instance lock and the control socket
+"""
+
+import asyncio
+import os
+import select
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from pet_control import AsyncControlServer, InstanceLock, UnixControlServer, send_command
+
+
+class FakeTk:
+    """Records the file handler the server registers with Tk"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def createfilehandler(self, file, mask, callback):
+        self.handlers[file] = callback
+
+    def deletefilehandler(self, file):
+        self.handlers.pop(file)
+
+
+class FakeRoot:
+    def __init__(self):
+        self.tk = FakeTk()
+        self.timers = {}
+
+    def after(self, ms, callback):
+        self.timers[len(self.timers) + 1] = callback
+        return len(self.timers)
+
+    def after_cancel(self, timer):
+        self.timers[timer] = None
+
+
+def dispatch(root, timeout):
+    """Stand in for Tk's event loop: hand readiness to the registered handlers"""
+    ready = select.select(list(root.tk.handlers), [], [], timeout)[0]
+    for file in ready:
+        if file in root.tk.handlers:
+            root.tk.handlers[file](file, 0)
+    return ready
+
+
+def test_second_lock_is_refused():
+    """Only one holder of the instance lock at a time"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pet.lock')
+        first, second = InstanceLock(path), InstanceLock(path)
+        assert first.acquire()
+        assert not second.acquire()
+        first.release()
+        assert second.acquire()
+        second.release()
+
+
+def test_commands_round_trip_through_the_socket():
+    """Commands reach the handler and replies come back as JSON"""
+    if sys.platform == 'win32':
+        return  # Windows uses the named pipe server instead
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pet.sock')
+        root = FakeRoot()
+        seen = []
+
+        def handler(command):
+            seen.append(command)
+            if command == 'status':
+                return {'pets': [{'state': 'idle'}]}
+            return {'error': f"unknown command: {command}"}
+
+        server = UnixControlServer(root, handler, path)
+        replies = {}
+
+        def client():
+            replies['status'] = send_command('status', path)
+            replies['dance'] = send_command('dance', path)
+
+        thread = threading.Thread(target=client)
+        thread.start()
+        while thread.is_alive() or dispatch(root, 0):
+            dispatch(root, 0.05)
+        thread.join()
+        server.close()
+
+        assert seen == ['status', 'dance']
+        assert replies['status'] == {'pets': [{'state': 'idle'}]}
+        assert 'error' in replies['dance']
+        assert not os.path.exists(path) and not root.tk.handlers
+
+
+def test_silent_client_does_not_block():
+    """A client that connects and says nothing is dropped later, not waited on"""
+    if sys.platform == 'win32':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pet.sock')
+        root = FakeRoot()
+        server = UnixControlServer(root, lambda command: {'echo': command}, path)
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        silent.connect(path)
+        started = time.perf_counter()
+        dispatch(root, 1.0)  # Accepts it
+        dispatch(root, 0.05)  # Nothing to read yet, and nothing blocks
+        assert time.perf_counter() - started < 0.5
+        assert len(server.clients) == 1
+
+        replies = []
+        thread = threading.Thread(target=lambda: replies.append(send_command('play', path)))
+        thread.start()
+        while thread.is_alive():
+            dispatch(root, 0.05)
+        thread.join()
+        assert replies == [{'echo': 'play'}]
+
+        for timer in list(root.timers.values()):
+            if timer is not None:
+                timer()  # Time runs out for the silent one
+        assert not server.clients and silent.recv(16) == b''
+        silent.close()
+        server.close()
+        assert not root.tk.handlers
+
+
+def test_unusable_lock_path_is_reported():
+    """A lock file that can't be opened doesn't stop the pet"""
+    with tempfile.TemporaryDirectory() as directory:
+        lock = InstanceLock(os.path.join(directory, 'missing', 'pet.lock'))
+        assert lock.acquire()
+        lock.release()
+
+
+def test_live_socket_is_not_taken_over():
+    """A second server refuses a socket someone still listens on, and replaces a stale one"""
+    if sys.platform == 'win32':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pet.sock')
+        first = UnixControlServer(FakeRoot(), lambda command: {'from': 'first'}, path)
+        try:
+            UnixControlServer(FakeRoot(), lambda command: {'from': 'second'}, path)
+        except OSError:
+            pass
+        else:
+            assert False, "expected OSError"
+        try:
+            asyncio.run(AsyncControlServer(lambda command: {}, path).start())
+        except OSError:
+            pass
+        else:
+            assert False, "expected OSError"
+        assert os.path.exists(path)  # The first pet is still reachable
+
+        # A crashed pet leaves its socket file behind with nobody listening
+        first.sock.close()
+        second = UnixControlServer(FakeRoot(), lambda command: {'from': 'second'}, path)
+        assert os.path.exists(path)
+        second.close()
+
+
+def test_asyncio_server_answers_commands():
+    """The asyncio control server answers while other tasks keep running"""
+    if sys.platform == 'win32':
+        return
+
+    async def scenario(path):
+        server = await AsyncControlServer(lambda command: {'echo': command}, path).start()
+        ticks = []
+
+        async def other_task():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.001)
+
+        task = asyncio.ensure_future(other_task())
+        reply = await asyncio.get_running_loop().run_in_executor(None, send_command, 'stats', path)
+        task.cancel()
+        server.close()
+        return reply, len(ticks)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pet.sock')
+        reply, ticks = asyncio.run(scenario(path))
+        assert reply == {'echo': 'stats'}
+        assert ticks > 0 and not os.path.exists(path)
+
+
+def test_no_pet_running():
+    """Clients get an OSError when nothing is listening"""
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            send_command('status', os.path.join(directory, 'missing.sock'))
+        except OSError:
+            return
+        assert False, "expected OSError"
+
+
+def main():
+    """Run all tests"""
+    print("=== Control Socket Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
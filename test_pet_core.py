@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Headless tests for the pet simulation core - no display needed
+"""
+
+import random
+import tracemalloc
+
+from pet_core import (PetSimulation, WakeDetector, DESKTOP_PROFILE, INTERACTIVE_PROFILE,
+                      TICK_SECONDS, RESTING_TICK_SECONDS, CATCH_UP_SECONDS, WALKING,
+                      bounce_offset)
+from pet_headless import HeadlessPets
+from pet_navigation import NavGrid
+from pet_renderers import NullRenderer
+
+
+def make_pet(profile=DESKTOP_PROFILE, seed=1):
+    """Create a 400x300 pet with a seeded random source"""
+    return PetSimulation(400, 300, 16, profile, random.Random(seed))
+
+
+def test_fixed_timestep():
+    """step(dt) runs whole ticks and carries the remainder"""
+    pet = make_pet()
+    assert pet.step(TICK_SECONDS * 0.5) == 0
+    assert pet.step(TICK_SECONDS * 0.5) == 1
+    assert pet.step(TICK_SECONDS * 10) == 10
+    assert pet.ticks == 11
+
+
+def test_walks_to_target():
+    """A walking pet reaches its target and goes idle"""
+    pet = make_pet()
+    pet.set_target(100, 100)
+    for _ in range(1000):
+        pet.tick()
+        if pet.state != "walking":
+            break
+    assert pet.state == "idle"
+    assert abs(pet.x - 100) <= 3 and abs(pet.y - 100) <= 3
+
+
+def test_follows_nearby_cursor():
+    """Pet starts walking toward a cursor that is close but not too close"""
+    pet = make_pet()
+    pet.set_cursor(pet.x + 80, pet.y)
+    pet.tick()
+    assert pet.state == "walking"
+    assert pet.target_x == 280
+
+    far = make_pet()
+    far.set_cursor(far.x + 1000, far.y)
+    far.tick()
+    assert far.state == "idle"
+
+
+def test_interactive_profile_follow_range():
+    """The interactive window only follows within 100 pixels"""
+    pet = make_pet(INTERACTIVE_PROFILE)
+    pet.set_cursor(pet.x + 120, pet.y)
+    pet.tick()
+    assert pet.state == "idle"
+
+
+def test_drag_stays_in_container():
+    """Dragging clamps the pet to the container margin"""
+    pet = make_pet()
+    assert not pet.start_drag(0, 0)
+    assert pet.start_drag(pet.x, pet.y)
+    pet.drag_by(-10000, 10000)
+    pet.end_drag()
+    assert pet.x == pet.pet_radius + 5
+    assert pet.y == 300 - pet.pet_radius - 5
+
+
+def test_random_behavior_is_reproducible():
+    """Seeded simulations make identical decisions"""
+    a, b = make_pet(seed=7), make_pet(seed=7)
+    for _ in range(5000):
+        a.tick()
+        b.tick()
+    assert (a.state, a.x, a.y) == (b.state, b.x, b.y)
+
+
+def test_wants_cursor_only_when_it_could_follow():
+    """Only pets in a following state and not being dragged need the cursor"""
+    pet = make_pet()
+    assert pet.wants_cursor()
+    pet.trigger("sleep")
+    assert not pet.wants_cursor()
+    walker = make_pet(INTERACTIVE_PROFILE)
+    walker.set_target(100, 100)
+    assert walker.wants_cursor()
+    walker.start_drag(walker.x, walker.y)
+    assert not walker.wants_cursor()
+
+
+def test_backs_off_while_resting():
+    """Tick interval backs off when asleep or the cursor is far, and snaps back"""
+    pet = make_pet()
+    pet.set_cursor(pet.x + 50, pet.y + 1000)
+    pet.step(TICK_SECONDS)
+    assert pet.tick_interval() == RESTING_TICK_SECONDS
+
+    # Cursor approaches during a backed-off gap: follow starts without replaying the gap
+    pet.set_cursor(pet.x + 80, pet.y)
+    start_x = pet.x
+    assert pet.step(RESTING_TICK_SECONDS) == 1
+    assert pet.state == "walking"
+    assert pet.x - start_x <= DESKTOP_PROFILE['walk_speed'] * TICK_SECONDS
+    assert pet.tick_interval() == TICK_SECONDS
+
+    asleep = make_pet()
+    asleep.trigger("sleep")
+    asleep.step(TICK_SECONDS)
+    assert asleep.tick_interval() == RESTING_TICK_SECONDS
+
+
+def test_long_gap_is_skipped_not_replayed():
+    """A gap like a night's suspend runs no ticks and leaves the pet somewhere sensible"""
+    pet = make_pet()
+    pet.set_target(350, 250)
+    assert pet.step(8 * 3600) == 0
+    assert pet.ticks == 0 and pet.accumulator == 0.0
+    assert 16 <= pet.x <= 384 and 16 <= pet.y <= 284
+    assert pet.state in ('idle', 'walking', 'sleep', 'play')
+    assert pet.render_position(0.0) == (pet.x, pet.y)
+    assert pet.step(TICK_SECONDS) == 1  # Carries on normally afterwards
+
+
+def test_fast_forward_finishes_the_walk():
+    """A walk in progress ends at its target when the gap is too short for a decision"""
+    pet = make_pet()
+    pet.set_target(300, 100)
+    pet.fast_forward(5.0)
+    assert (pet.x, pet.y) == (300, 100)
+    assert pet.state == "idle"
+
+
+def test_long_gaps_settle_on_time_fractions():
+    """Over many pets, states after a day away follow the model's time fractions"""
+    pets = [make_pet(seed=seed) for seed in range(4000)]
+    for pet in pets:
+        pet.fast_forward(24 * 3600)
+    expected = DESKTOP_PROFILE['behavior'].time_fractions(1.0)
+    for state in ('sleep', 'play'):
+        share = sum(pet.state == state for pet in pets) / len(pets)
+        assert abs(share - expected[state]) < 0.03, (state, share, expected[state])
+
+
+def test_wake_detector_sees_suspend():
+    """Wall time running ahead of monotonic time counts as missed, small drift doesn't"""
+    now = [1000.0]
+    detector = WakeDetector(lambda: now[0])
+    now[0] += 0.1
+    assert detector.missed(0.1) == 0.0
+    now[0] += 5.0  # Clock adjustment, not a suspend
+    assert detector.missed(0.1) == 0.0
+    now[0] += 3600.0
+    assert detector.missed(0.1) > CATCH_UP_SECONDS
+
+
+def test_state_is_an_integer_code():
+    """State is stored as a code in a slot; the name still reads and writes the same"""
+    pet = make_pet()
+    assert not hasattr(pet, '__dict__')
+    pet.set_target(100, 100)
+    assert pet.code == WALKING and pet.state == "walking"
+    pet.state = "sleep"
+    assert pet.state == "sleep" and pet.state_names[pet.code] == "sleep"
+
+
+def test_steady_state_ticks_do_not_allocate():
+    """Warmed-up walking, following and routing allocate nothing per tick beyond a counter
+
+    tracemalloc can't count short-lived blocks, so each step's peak above
+    the memory in use beforehand is checked instead. Reading the traced
+    memory and bumping the tick counter (an int past 256) cost 32 bytes
+    each; a tuple, float-to-int edge, list or re-planned route would show
+    up on top. The growth allowance covers routes to cells the warm-up
+    happened not to visit.
+    """
+    grid = NavGrid(400, 300, 16)
+    grid.set_obstacle('house', 360, 10, 390, 30)
+    pets = [PetSimulation(400, 300, 16, INTERACTIVE_PROFILE, random.Random(seed))
+            for seed in range(3)]
+    for pet in pets:
+        pet.navigator = grid
+
+    def run(rounds, measure=False):
+        worst = 0
+        for t in range(rounds):
+            for pet in pets:
+                # A cursor going round a loop keeps the pets walking and following
+                pet.set_cursor(200 + (t * 7) % 150, 150 + (t * 3) % 100)
+                if not measure:
+                    pet.step(TICK_SECONDS)
+                    continue
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                pet.step(TICK_SECONDS)
+                worst = max(worst, tracemalloc.get_traced_memory()[1] - before)
+        return worst
+
+    run(3000)  # Fill the route cache for every cell the cursor visits
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        worst = run(3000, measure=True)
+        growth = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert any(pet.state == "walking" for pet in pets)
+    assert worst <= 64, worst
+    assert growth <= 512, growth
+
+
+def test_speed_is_per_second():
+    """Walking covers the same distance per second whatever the step size"""
+    coarse, fine = make_pet(), make_pet()
+    for pet in (coarse, fine):
+        pet.state = "walking"
+        pet.target_x, pet.target_y = 350, pet.y
+    for _ in range(10):
+        coarse.update_position(0.1)
+    for _ in range(100):
+        fine.update_position(0.01)
+    assert abs(coarse.x - fine.x) < 0.5
+    assert abs(coarse.x - 200 - DESKTOP_PROFILE['walk_speed']) < 0.5
+
+
+def test_render_position_interpolates():
+    """Rendering blends between the last two ticks"""
+    pet = make_pet()
+    pet.set_target(350, pet.y)
+    pet.step(TICK_SECONDS)
+    mid_x, _ = pet.render_position(TICK_SECONDS / 2)
+    assert pet.prev_x < mid_x < pet.x
+    assert pet.render_position(TICK_SECONDS)[0] == pet.x
+
+
+def test_bounce_is_drawn_but_never_moves_the_pet():
+    """The walking bounce shifts only the drawn position, never the simulated one"""
+    assert {bounce_offset("walking", frame, 2) for frame in range(1000)} == {-2, 0, 2}
+    assert bounce_offset("idle", 0, 2) == 0
+
+    class DrawnPositions(NullRenderer):
+        def move_pet(self, pet_id, x, y):
+            super().move_pet(pet_id, x, y)
+            self.drawn = (x, y)
+
+    renderer = DrawnPositions()
+    pets = HeadlessPets(renderer, seed=3)
+    sim, animation = pets.sims[0], pets.animations[0]
+    plain = make_pet(seed=3)  # Same seed, never drawn
+    sim.set_target(380, 20)
+    plain.set_target(380, 20)
+    bounces = set()
+    for _ in range(40):
+        pets.advance(0.5)
+        plain.step(0.5)
+        assert (sim.x, sim.y, sim.prev_x, sim.prev_y) == (plain.x, plain.y,
+                                                          plain.prev_x, plain.prev_y)
+        x, y = sim.render_position(0.0)
+        assert renderer.drawn == (x, y + animation.bounce)
+        if sim.state == "walking":
+            bounces.add(animation.bounce)
+    assert bounces == {-2, 0, 2}
+
+
+def main():
+    """Run all tests"""
+    print("=== Pet Simulation Core Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
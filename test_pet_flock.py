@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Headless tests for the flock steering engines
+"""
+
+from pet_flock import make_flock, np
+
+
+def engines():
+    """Engines available here (NumPy only if installed)"""
+    available = [False]
+    if np is not None:
+        available.append(True)
+    return available
+
+
+def test_pets_stay_in_container():
+    """Every pet stays inside the clamp margin"""
+    for use_numpy in engines():
+        flock = make_flock(60, 300, 200, seed=3, use_numpy=use_numpy)
+        for _ in range(300):
+            flock.step(0.1)
+        for index in range(flock.count):
+            x, y = flock.position(index)
+            assert flock.margin <= x <= 300 - flock.margin
+            assert flock.margin <= y <= 200 - flock.margin
+
+
+def test_seek_reaches_target():
+    """A lone pet walks to its target and stops"""
+    for use_numpy in engines():
+        flock = make_flock(1, 400, 300, seed=1, use_numpy=use_numpy)
+        flock.wander_chance = 0.0
+        flock.set_target(0, 100, 100)
+        for _ in range(400):
+            flock.step(0.1)
+        x, y = flock.position(0)
+        assert abs(x - 100) <= 3 and abs(y - 100) <= 3
+        assert not flock.walking[0]
+
+
+def test_separation_pushes_pets_apart():
+    """Two overlapping pets drift apart"""
+    for use_numpy in engines():
+        flock = make_flock(2, 400, 300, seed=1, use_numpy=use_numpy)
+        flock.wander_chance = 0.0
+        flock.positions[0][0], flock.positions[0][1] = 200.0, 150.0
+        flock.positions[1][0], flock.positions[1][1] = 205.0, 150.0
+        for _ in range(20):
+            flock.step(0.1)
+        (ax, _), (bx, _) = flock.position(0), flock.position(1)
+        assert bx - ax > 20
+
+
+def main():
+    """Run all tests"""
+    print("=== Flock Engine Test ===")
+    if np is None:
+        print("! NumPy not installed, testing the pure-Python engine only")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
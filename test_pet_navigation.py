@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the navigation grid and obstacle-aware walking
+"""
+
+import random
+
+from pet_core import PetSimulation, DESKTOP_PROFILE
+from pet_navigation import NavGrid, FLOW_FIELD_AFTER
+
+
+def make_wall():
+    """A 400x300 grid with a wall across the middle, open at the bottom"""
+    grid = NavGrid(400, 300, 16)
+    grid.set_obstacle('wall', 190, 0, 210, 200)
+    return grid
+
+
+def blocked(grid, x, y):
+    return not grid.passable(grid.cell_of(x, y))
+
+
+def test_clear_line_walks_straight():
+    """With nothing in the way the route is just the target"""
+    grid = make_wall()
+    assert grid.find_path(50, 250, 350, 260) == [(350, 260)]
+    assert grid.searches == 0
+
+
+def test_routes_around_obstacle():
+    """A blocked line gets corner waypoints that never cross the obstacle"""
+    grid = make_wall()
+    path = grid.find_path(100, 100, 300, 100)
+    assert len(path) > 1 and path[-1] == (300, 100)
+    points = [(100, 100)] + path
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        for i in range(21):
+            t = i / 20
+            x, y = x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+            assert not (190 - 16 < x < 210 + 16 and y < 200 + 16), (x, y)
+
+
+def test_routes_are_cached_until_obstacles_change():
+    """Repeat queries reuse the route; only a real obstacle change drops it"""
+    grid = make_wall()
+    grid.find_path(100, 100, 300, 100)
+    grid.find_path(101, 99, 302, 101)  # Same cells
+    assert grid.searches == 1
+
+    grid.set_obstacle('wall', 190, 0, 210, 200)  # Unchanged
+    grid.find_path(100, 100, 300, 100)
+    assert grid.searches == 1
+
+    grid.remove_obstacle('wall')
+    assert grid.find_path(100, 100, 300, 100) == [(300, 100)]
+
+
+def test_popular_goal_gets_distance_field():
+    """After a few starts toward one goal, routes come from a distance field"""
+    grid = make_wall()
+    starts = [(60, 40), (80, 120), (120, 60), (40, 160), (100, 30)]
+    lengths = {}
+    for x, y in starts:
+        path = grid.find_path(x, y, 300, 100)
+        lengths[x, y] = sum(((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+                            for (ax, ay), (bx, by) in zip([(x, y)] + path, path))
+    assert len(grid.fields) == 1
+    assert grid.searches == FLOW_FIELD_AFTER  # A* twice, then one field for the rest
+
+    # Field routes are as short as A* ones
+    fresh = make_wall()
+    for (x, y), length in lengths.items():
+        path = fresh.find_path(x, y, 300, 100)
+        astar = sum(((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+                    for (ax, ay), (bx, by) in zip([(x, y)] + path, path))
+        assert abs(length - astar) < 16, (length, astar)
+
+
+def test_goal_inside_obstacle_moves_to_free_cell():
+    """A target on top of an obstacle is replaced by the nearest free spot"""
+    grid = make_wall()
+    path = grid.find_path(100, 250, 200, 100)
+    assert not blocked(grid, *path[-1])
+
+
+def test_pet_can_leave_its_own_footprint():
+    """A pet standing inside an obstacle can still walk out of it"""
+    grid = make_wall()
+    grid.set_obstacle('pet', 84, 84, 116, 116)
+    path = grid.find_path(100, 100, 300, 250)
+    assert path[-1] == (300, 250)
+
+
+def test_pet_walks_around_obstacle():
+    """A simulated pet with a navigator reaches its target without crossing the wall"""
+    pet = PetSimulation(400, 300, 16, DESKTOP_PROFILE, random.Random(1))
+    pet.navigator = make_wall()
+    pet.place(100, 100)
+    pet.set_target(300, 100)
+    for _ in range(2000):
+        pet.tick()
+        assert not (190 - 16 < pet.x < 210 + 16 and pet.y < 200 + 16), (pet.x, pet.y)
+        if pet.state != "walking":
+            break
+    assert pet.state == "idle"
+    assert abs(pet.x - 300) <= 3 and abs(pet.y - 100) <= 3
+
+
+def test_same_target_keeps_route():
+    """Setting the target it is already walking to doesn't re-plan"""
+    pet = PetSimulation(400, 300, 16, DESKTOP_PROFILE, random.Random(1))
+    pet.navigator = make_wall()
+    pet.place(100, 100)
+    pet.set_target(300, 100)
+    pet.tick()
+    request, route = pet.route_request, list(pet.waypoints)
+
+    grid = pet.navigator
+    calls = []
+    find_path = grid.find_path
+    grid.find_path = lambda *args: calls.append(args) or find_path(*args)
+    pet.set_target(300, 100)
+    assert calls == []
+    assert pet.route_request == request and pet.waypoints == route
+    pet.set_target(300, 150)  # A new target does re-plan
+    assert len(calls) == 1
+
+
+def test_target_moving_within_goal_cell_keeps_corners():
+    """Following a cursor inside the same cell only moves the route's end"""
+    pet = PetSimulation(400, 300, 16, DESKTOP_PROFILE, random.Random(1))
+    pet.navigator = make_wall()
+    pet.place(100, 100)
+    pet.set_target(300, 100)
+    corners = pet.waypoints[:-1]
+    calls = []
+    find_path = pet.navigator.find_path
+    pet.navigator.find_path = lambda *args: calls.append(args) or find_path(*args)
+    pet.set_target(302, 103)
+    assert calls == []
+    assert pet.waypoints[:-1] == corners and pet.waypoints[-1] == (302, 103)
+    assert (pet.target_x, pet.target_y) == (302, 103)
+    pet.set_target(340, 103)  # Another cell: a real re-plan
+    assert len(calls) == 1
+
+
+def main():
+    """Run all tests"""
+    print("=== Navigation Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the renderer backends and the headless driver
+"""
+
+import io
+import tkinter
+
+from canvas_batch import CanvasBatch
+from pet_core import Animation, PET_SPRITES
+from pet_headless import HeadlessPets
+from pet_renderers import NullRenderer, TerminalRenderer
+
+
+def test_terminal_rewrites_only_changed_cells():
+    """The terminal backend writes nothing when the frame is unchanged"""
+    out = io.StringIO()
+    renderer = TerminalRenderer(400, 300, PET_SPRITES, columns=40, rows=15, stream=out)
+    renderer.add_pet(0, 200, 150, 'idle1')
+    renderer.flush()
+    assert "🐱" in out.getvalue()
+
+    # Sub-cell movement doesn't touch the screen
+    out.seek(0)
+    out.truncate()
+    renderer.move_pet(0, 202, 151)
+    renderer.flush()
+    assert out.getvalue() == ""
+
+    # Crossing into a new cell blanks the old one and draws the new one, nothing else
+    renderer.move_pet(0, 230, 151)
+    renderer.set_sprite(0, 'walk1')
+    renderer.flush()
+    written = out.getvalue()
+    assert written.count("\x1b[") == 3  # Blank, draw, park the cursor
+    assert "  " in written and "🐾" in written
+
+
+def test_terminal_cells_stay_inside_the_grid():
+    """Positions outside the container clamp to the edge cells"""
+    renderer = TerminalRenderer(400, 300, PET_SPRITES, columns=40, rows=15, stream=io.StringIO())
+    assert renderer.cell(-5, -5) == (0, 0)
+    assert renderer.cell(400, 300) == (14, 39)
+
+
+def test_headless_driver_with_null_renderer():
+    """The null backend sees every move and only real sprite changes"""
+    renderer = NullRenderer()
+    pets = HeadlessPets(renderer, pet_count=3, seed=2)
+    for _ in range(300):
+        pets.advance(0.1)
+    assert renderer.flushes == 300
+    assert renderer.moves == 900
+    assert 0 < renderer.sprite_changes < 900
+
+
+class FakeTk:
+    """Records the Tcl calls a canvas would make"""
+
+    def __init__(self):
+        self.evals = []
+        self.calls = []
+
+    def eval(self, script):
+        self.evals.append(script)
+
+    def call(self, *args):
+        self.calls.append(args)
+
+
+class FakeCanvas:
+    """A canvas widget as CanvasBatch sees it: a Tcl command name and an interpreter"""
+
+    def __init__(self, tk=None, path='.canvas'):
+        self.tk = tk or FakeTk()
+        self.path = path
+
+    def __str__(self):
+        return self.path
+
+
+def test_batch_flushes_in_one_call():
+    """Queued coords and itemconfigs go out as one Tcl call with flat lists"""
+    canvas = FakeCanvas()
+    batch = CanvasBatch(canvas)
+    assert len(canvas.tk.evals) == 1  # The proc is defined once, up front
+    batch.flush()
+    assert canvas.tk.calls == []  # Nothing queued, no call
+
+    batch.coords(3, 10, 20)
+    batch.coords(4, 30.5, 40)
+    batch.itemconfig(3, 'text', '🐾')
+    batch.itemconfig(4, 'image', 'pyimage2')
+    batch.flush()
+    assert canvas.tk.calls == [('::desktop_pet_batch', '.canvas',
+                                (3, 10, 20, 4, 30.5, 40),
+                                (3, '-text', '🐾', 4, '-image', 'pyimage2'))]
+
+    # The queues start over after each flush
+    batch.flush()
+    batch.coords(3, 11, 21)
+    batch.flush()
+    assert canvas.tk.calls[1:] == [('::desktop_pet_batch', '.canvas', (3, 11, 21), ())]
+
+
+def test_batch_proc_applies_each_change():
+    """The Tcl side walks the flat lists into one coords/itemconfigure per item"""
+    interp = tkinter.Tcl()  # Tcl only, no display
+    interp.eval("proc ::fake_canvas {args} { lappend ::applied $args }")
+    batch = CanvasBatch(FakeCanvas(interp.tk, '::fake_canvas'))
+    batch.coords(3, 10, 20)
+    batch.coords(4, 30, 40)
+    batch.itemconfig(4, 'text', 'two words')
+    batch.flush()
+    applied = [tuple(str(arg) for arg in interp.tk.splitlist(args))
+               for args in interp.tk.splitlist(interp.getvar('applied'))]
+    assert applied == [('coords', '3', '10', '20'), ('coords', '4', '30', '40'),
+                       ('itemconfigure', '4', '-text', 'two words')]
+
+
+def test_animation_follows_elapsed_time():
+    """Frames advance with elapsed time and sleep animates slower"""
+    animation = Animation(frame_seconds=0.5, sleep_frame_seconds=1.0)
+    assert animation.advance("idle", 0.5) and animation.sprite == 'idle2'
+    assert animation.frame_duration("sleep") == 1.0
+    animation.advance("walking", 0.5)
+    assert animation.frame == 2 and animation.bounce == 0
+    animation.advance("walking", 1.0)
+    assert animation.frame == 4 and animation.bounce == 2
+
+
+def main():
+    """Run all tests"""
+    print("=== Renderer Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Headless tests for the single tick scheduler - uses a fake clock and after()
+"""
+
+from pet_scheduler import TickScheduler
+from pet_metrics import TickMetrics, RingBuffer
+
+
+class FakeLoop:
+    """Minimal stand-in for root.after with a controllable clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = {}
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now + ms / 1000, func)
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def run_until(self, end):
+        """Fire timers in order until the clock reaches end"""
+        while self.timers:
+            timer_id = min(self.timers, key=lambda i: self.timers[i][0])
+            when, func = self.timers[timer_id]
+            if when > end:
+                break
+            del self.timers[timer_id]
+            self.now = max(self.now, when)
+            func()
+        self.now = end
+
+
+def make_scheduler():
+    loop = FakeLoop()
+    return loop, TickScheduler(loop.after, loop.after_cancel, loop.clock)
+
+
+def test_single_timer_services_all_jobs():
+    """All jobs share one pending after() timer"""
+    loop, scheduler = make_scheduler()
+    runs = {'fast': 0, 'slow': 0}
+    scheduler.register('fast', 0.1, lambda: runs.__setitem__('fast', runs['fast'] + 1))
+    scheduler.register('slow', 0.5, lambda: runs.__setitem__('slow', runs['slow'] + 1))
+    assert len(loop.timers) == 1
+    loop.run_until(1.0)
+    assert len(loop.timers) == 1
+    assert runs == {'fast': 11, 'slow': 3}
+
+
+def test_timer_moves_to_another_loop():
+    """set_timer cancels the old timer and keeps the same deadlines on the new loop"""
+    loop, scheduler = make_scheduler()
+    other = FakeLoop()
+    scheduler.clock = other.clock  # Both loops start at 0 and share time
+    runs = []
+    scheduler.register('tick', 0.1, lambda: runs.append(other.now), delay=0.3)
+    scheduler.set_timer(other.after, other.after_cancel)
+    assert not loop.timers and len(other.timers) == 1
+    other.run_until(0.5)
+    assert [round(t, 3) for t in runs] == [0.3, 0.4, 0.5]
+
+
+def test_callback_can_change_interval():
+    """A callback's return value sets its next interval"""
+    loop, scheduler = make_scheduler()
+    times = []
+
+    def job():
+        times.append(round(loop.now, 3))
+        return 0.8 if len(times) > 1 else 0.5
+
+    scheduler.register('animate', 0.5, job)
+    loop.run_until(2.2)
+    assert times == [0.0, 0.5, 1.3, 2.1]
+
+
+def test_late_timer_does_not_burst():
+    """A stalled loop runs each job once, then resumes its cadence"""
+    loop, scheduler = make_scheduler()
+    times = []
+    scheduler.register('behavior', 0.1, lambda: times.append(round(loop.now, 3)))
+    loop.run_until(0.0)
+    loop.now = 3.0  # Event loop stalled for three seconds
+    loop.run_until(3.25)
+    assert times == [0.0, 3.0, 3.1, 3.2]
+
+
+def test_unregister_and_reschedule():
+    """Removed jobs stop and rescheduled jobs run early"""
+    loop, scheduler = make_scheduler()
+    runs = []
+    scheduler.register('a', 1.0, lambda: runs.append('a'), delay=1.0)
+    scheduler.register('b', 1.0, lambda: runs.append('b'), delay=5.0)
+    scheduler.unregister('a')
+    scheduler.reschedule('b', 0.2)
+    loop.run_until(0.5)
+    assert runs == ['b']
+
+
+def test_metrics_record_lateness_and_duration():
+    """Each callback's lateness and run time land in the job's percentiles"""
+    loop = FakeLoop()
+    metrics = TickMetrics(size=8)
+    scheduler = TickScheduler(loop.after, loop.after_cancel, loop.clock, metrics)
+
+    def slow_job():
+        loop.now += 0.004  # Callback takes 4 ms
+
+    scheduler.register('behavior', 0.1, slow_job)
+    loop.run_until(0.0)
+    loop.now = 0.13  # Timer fires 30 ms late
+    loop.run_until(0.13)
+    stats = metrics.percentiles('behavior')
+    assert round(stats['duration']['p50'], 3) == 4.0
+    assert round(stats['late']['p99'], 3) == 30.0
+    assert 'behavior' in metrics.hud_text()
+
+
+def test_ring_buffer_keeps_newest():
+    """The ring buffer holds a fixed number of the newest samples"""
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(float(value))
+    assert buffer.values() == [2.0, 3.0, 4.0]
+    assert len(buffer) == 3
+
+
+def main():
+    """Run all tests"""
+    print("=== Tick Scheduler Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
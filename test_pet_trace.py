@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for recording pet sessions and replaying them headless
+"""
+
+import os
+import random
+import tempfile
+
+from pet_trace import (TraceRecorder, TraceReplay, read_trace, replay,
+                       STEP, PRESS, DRAG, RELEASE, DOUBLE, OBSTACLE, CURSOR, NO_CURSOR, COMMAND,
+                       FLUSH_SECONDS)
+
+
+def record_session(path, seed=7):
+    """Record a made-up session while driving a live colony with the same inputs"""
+    live = TraceReplay(400, 300, 3, 16, seed)
+    recorder = TraceRecorder(path, 400, 300, 3, 16, seed)
+    rng = random.Random(1)
+
+    def feed(kind, *values):
+        recorder.record(kind, *values)
+        live.apply(kind, values)
+
+    feed(OBSTACLE, 370, 10, 390, 30)
+    for second in range(300):
+        for _ in range(10):
+            feed(STEP, rng.uniform(0.05, 0.15))
+        x, y = rng.randint(-50, 450), rng.randint(-50, 350)
+        recorder.cursor(x, y)
+        live.apply(CURSOR, (x, y))
+        if second % 20 == 5:
+            sim = live.sims[0]
+            feed(PRESS, int(sim.x), int(sim.y))
+            feed(DRAG, int(sim.x) + 30, int(sim.y) + 10)
+            feed(RELEASE, int(sim.x) + 30, int(sim.y) + 10)
+        if second % 45 == 0:
+            feed(DOUBLE, int(live.sims[1].x), int(live.sims[1].y))
+        if second % 100 == 50:
+            recorder.command('sleep')
+            live.apply(COMMAND, (1,))
+    recorder.close()
+    return live
+
+
+def test_records_round_trip():
+    """Records read back exactly as written, with the header"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.trace')
+        recorder = TraceRecorder(path, 600, 400, 2, 16, 2**63 + 5)
+        recorder.record(STEP, 0.1000001)
+        recorder.cursor(5, -7)
+        recorder.cursor(5, -7)  # Repeat, skipped
+        recorder.cursor(None, None)
+        recorder.record(PRESS, 100, 200)
+        recorder.command('play')
+        recorder.close()
+
+        header, records = read_trace(path)
+    assert header == {'width': 600, 'height': 400, 'pet_count': 2, 'pet_radius': 16,
+                      'seed': 2**63 + 5, 'truncated': 0}
+    assert records == [(STEP, (0.1000001,)), (CURSOR, (5, -7)), (NO_CURSOR, ()),
+                       (PRESS, (100, 200)), (COMMAND, (0,))]
+
+
+def test_replay_matches_live_session():
+    """Replaying a trace ends with every pet exactly where the live session left it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.trace')
+        live = record_session(path)
+        pets, records, _ = replay(path)
+        again, _, _ = replay(path)
+    assert records > 3000
+    expected = [(sim.state, sim.x, sim.y, sim.ticks) for sim in live.sims]
+    assert [(sim.state, sim.x, sim.y, sim.ticks) for sim in pets.sims] == expected
+    assert [(sim.state, sim.x, sim.y, sim.ticks) for sim in again.sims] == expected
+    assert pets.ticks == live.ticks
+
+
+def test_different_seed_diverges():
+    """The seed in the header is what makes the replay reproducible"""
+    first = TraceReplay(400, 300, 3, 16, 1)
+    second = TraceReplay(400, 300, 3, 16, 2)
+    for _ in range(3000):
+        first.apply(STEP, (0.1,))
+        second.apply(STEP, (0.1,))
+    assert ([(sim.x, sim.y) for sim in first.sims] !=
+            [(sim.x, sim.y) for sim in second.sims])
+
+
+def test_rejects_other_files():
+    """Files that aren't traces are refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'not.trace')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        try:
+            read_trace(path)
+        except ValueError:
+            pass
+        else:
+            assert False, "expected ValueError"
+
+
+def test_killed_recording_still_reads():
+    """A trace cut off mid-record reads up to its last whole record; junk kinds are refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.trace')
+        recorder = TraceRecorder(path, 400, 300, 1, 16, 3)
+        recorder.record(STEP, 0.1)
+        recorder.record(PRESS, 10, 20)
+        recorder.close()
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-3])
+        header, records = read_trace(path)
+        assert records == [(STEP, (0.1,))]
+        assert header['truncated'] == 6
+
+        with open(path, 'wb') as f:
+            f.write(data + bytes((200,)))
+        try:
+            read_trace(path)
+        except ValueError as e:
+            assert "unknown record kind 200" in str(e)
+        else:
+            assert False, "expected ValueError"
+
+
+def test_recorder_flushes_while_running():
+    """Records reach the file without a clean close"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.trace')
+        recorder = TraceRecorder(path, 400, 300, 1, 16, 3)
+        recorder.flushed -= FLUSH_SECONDS  # As if the last flush was a while ago
+        recorder.record(STEP, 0.1)
+        _, records = read_trace(path)
+        recorder.close()
+    assert records == [(STEP, (0.1,))]
+
+
+def main():
+    """Run all tests"""
+    print("=== Trace Record/Replay Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for making behavior decisions off the UI thread
+"""
+
+import random
+import threading
+
+from pet_core import PetSimulation, DESKTOP_PROFILE, TICK_SECONDS
+from pet_worker import DecisionWorker, decide_batch
+
+
+def make_pets(count=3):
+    pets = [PetSimulation(400, 300, 16, DESKTOP_PROFILE, random.Random(i)) for i in range(count)]
+    for pet in pets:
+        pet.decide_inline = False
+    return pets
+
+
+def test_worker_decisions_match_inline_rules():
+    """A worker-made decision follows the cursor just like the inline tick would"""
+    pets = make_pets(1)
+    pets[0].set_cursor(pets[0].x + 80, pets[0].y)
+    worker = DecisionWorker(400, 300, 16, DESKTOP_PROFILE)
+    assert worker.submit(pets, seed=1)
+    assert worker.wait(timeout=5)
+    assert worker.collect(pets)
+    assert pets[0].state == "walking" and pets[0].target_x == pets[0].x + 80
+    worker.close()
+
+
+def test_stale_decisions_are_dropped():
+    """A decision made before the user intervened doesn't override them"""
+    pets = make_pets(1)
+    pets[0].set_cursor(pets[0].x + 80, pets[0].y)
+    worker = DecisionWorker(400, 300, 16, DESKTOP_PROFILE)
+    worker.submit(pets, seed=1)
+    pets[0].trigger("sleep")  # Happens while the worker is thinking
+    assert worker.wait(timeout=5)
+    assert not worker.collect(pets)
+    assert pets[0].state == "sleep"
+    worker.close()
+
+
+def test_slow_worker_never_blocks_the_caller():
+    """While a batch is in flight new submits are skipped, not queued"""
+    release = threading.Event()
+    worker = DecisionWorker(400, 300, 16, DESKTOP_PROFILE)
+    worker.executor.submit(release.wait)  # Occupy the worker thread
+    pets = make_pets()
+    assert worker.submit(pets, seed=1)
+    assert not worker.submit(pets, seed=2)
+    for pet in pets:
+        pet.step(TICK_SECONDS)  # The UI keeps stepping motion meanwhile
+    assert not worker.collect(pets)
+    release.set()
+    assert worker.wait(timeout=5)
+    worker.close()
+
+
+def test_decisions_are_reproducible():
+    """The same snapshots and seed always give the same decisions"""
+    snapshots = [pet.snapshot(i) for i, pet in enumerate(make_pets())]
+    snapshots = [s[:6] + (500,) + s[7:] for s in snapshots]  # Decision interval has passed
+    first = decide_batch(400, 300, 16, DESKTOP_PROFILE, snapshots, 42)
+    assert first == decide_batch(400, 300, 16, DESKTOP_PROFILE, snapshots, 42)
+    assert all(decision[-1] for decision in first)
+
+
+def test_process_worker():
+    """Decisions can also be made in a separate process"""
+    pets = make_pets(2)
+    pets[1].set_cursor(pets[1].x - 60, pets[1].y)
+    worker = DecisionWorker(400, 300, 16, DESKTOP_PROFILE, use_processes=True)
+    worker.submit(pets, seed=3)
+    assert worker.wait(timeout=30)
+    assert worker.collect(pets)
+    assert pets[1].state == "walking"
+    worker.close()
+
+
+def main():
+    """Run all tests"""
+    print("=== Decision Worker Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the soak harness: a short headless soak, and its growth check
+"""
+
+from soak_pet import HeadlessSoak, soak, find_growth, DAY_SECONDS
+
+
+def series(values, **fixed):
+    """Soak samples with one changing metric"""
+    return [dict(fixed, time=index * 60.0, objects=value, outside=0)
+            for index, value in enumerate(values)]
+
+
+def test_short_soak_stays_bounded():
+    """Six virtual hours of three busy pets leave nothing growing and every pet inside"""
+    harness = HeadlessSoak(3, 11)
+    history = soak(harness, 0.25, seed=11, samples=40)
+    assert len(history) >= 20  # Fewer if a suspend skipped some
+    assert history[-1]['time'] >= 0.25 * DAY_SECONDS
+    assert all(sample['objects'] > 0 and 'nav_routes' in sample for sample in history)
+    assert find_growth(history) == []
+
+
+def test_growth_is_flagged():
+    """A metric still climbing after warm-up is reported; a noisy flat one is not"""
+    leaking = series([5000 + 100 * index for index in range(100)])
+    assert any(problem.startswith("objects grew") for problem in find_growth(leaking))
+    flat = series([5000 + (index * 37) % 500 for index in range(100)])
+    assert find_growth(flat) == []
+    # Warm-up growth (caches filling) doesn't count
+    warming = series([1000 * min(index, 20) for index in range(100)])
+    assert find_growth(warming) == []
+
+
+def test_escapes_and_limits_are_flagged():
+    """A pet outside the container, or a cache over its cap, fails at once"""
+    history = series([5000] * 100, nav_routes=10)
+    history[60]['outside'] = 1
+    history[70]['nav_routes'] = 10**6
+    problems = find_growth(history)
+    assert "a pet left the container" in problems
+    assert any(problem.startswith("nav_routes reached") for problem in problems)
+
+
+def main():
+    """Run all tests"""
+    print("=== Soak Harness Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the spatial hash used for hit-testing and pet-pet collisions
+"""
+
+import random
+
+from spatial_index import SpatialHash
+
+
+def test_radius_query_matches_linear_scan():
+    """Radius queries find exactly the points a linear scan finds"""
+    rng = random.Random(5)
+    index = SpatialHash(40)
+    points = {}
+    for item in range(300):
+        points[item] = (rng.uniform(0, 600), rng.uniform(0, 400))
+        index.insert(item, *points[item])
+
+    for _ in range(50):
+        x, y, radius = rng.uniform(0, 600), rng.uniform(0, 400), rng.uniform(5, 120)
+        expected = {item for item, (px, py) in points.items()
+                    if (px - x) ** 2 + (py - y) ** 2 <= radius ** 2}
+        assert set(index.query_radius(x, y, radius)) == expected
+
+
+def test_move_rebuckets_only_across_cells():
+    """Moving within a cell keeps the bucket; crossing a boundary changes it"""
+    index = SpatialHash(50)
+    index.insert('cat', 10, 10)
+    index.move('cat', 40, 40)
+    assert index.cells == {(0, 0): {'cat'}}
+    index.move('cat', 60, 10)
+    assert index.cells == {(1, 0): {'cat'}}
+    assert index.query_point(58, 12, 5) == 'cat'
+    assert index.query_point(10, 10, 5) is None
+
+
+def test_remove():
+    """Removed items are no longer found"""
+    index = SpatialHash(50)
+    index.insert(1, 100, 100)
+    index.remove(1)
+    assert index.query_radius(100, 100, 10) == []
+    assert len(index) == 0 and not index.cells
+
+
+def main():
+    """Run all tests"""
+    print("=== Spatial Index Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the sprite cache - headless: frames and rasterized emoji are
+counted instead of drawn, so neither a display nor Pillow is needed
+"""
+
+import tkinter as tk
+
+import sprite_cache
+from pet_core import PET_SPRITES
+from pet_renderers import TkCanvasRenderer
+from sprite_cache import SpriteCache, SpriteSheet
+from test_pet_renderers import FakeCanvas
+
+
+class FakeRoot:
+    """A root whose display has the given dots per inch, or none at all"""
+
+    def __init__(self, dpi=72.0):
+        self.dpi = dpi
+
+    def winfo_fpixels(self, distance):
+        assert distance == '1i'
+        if self.dpi is None:
+            raise tk.TclError("no display")
+        return self.dpi
+
+
+class CountingCache(SpriteCache):
+    """Rasterizes to a (text, pixels) tuple and counts each time it has to"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rasterized = []
+
+    def rasterize(self, text, pixels):
+        self.rasterized.append((text, pixels))
+        return (text, pixels)
+
+
+def test_frame_region_reads_rows_left_to_right():
+    """Frames are cut row by row from however many fit across the sheet"""
+    sheet = SpriteSheet('sheet.png', 32, 32)
+    assert sheet.frame_region(0, 128) == (0, 0, 32, 32)
+    assert sheet.frame_region(3, 128) == (96, 0, 128, 32)
+    assert sheet.frame_region(5, 128) == (32, 32, 64, 64)
+    assert sheet.frame_region(5, 100) == (64, 32, 96, 64)  # Only three whole frames fit
+    assert sheet.frame_region(2, 20) == (0, 64, 32, 96)  # Narrower than a frame: one column
+
+    tall = SpriteSheet('sheet.png', 16, 24)
+    assert tall.frame_region(4, 64) == (0, 24, 16, 48)
+    assert tall.frame_region(7, 64) == (48, 24, 64, 48)
+
+
+def test_cache_is_keyed_on_sprite_and_scale():
+    """Each sprite is rasterized once per pixel size; a new scale or sheet misses"""
+    cache = CountingCache(FakeRoot(dpi=144.0), PET_SPRITES, size=32)
+    assert cache.scale == 2.0
+    assert cache.get('idle1') == ('🐱', 64)
+    assert cache.get('idle1') == ('🐱', 64)
+    assert cache.get('walk2') == ('🐱', 64)  # Same emoji, but its own entry
+    assert cache.rasterized == [('🐱', 64), ('🐱', 64)]
+
+    cache.scale = 1.5  # Moved to a screen with another DPI
+    assert cache.get('idle1') == ('🐱', 48)
+    assert cache.get('idle1') == ('🐱', 48)
+    assert len(cache.rasterized) == 3
+
+    # Sheet frames replace the emoji, and are cut once per (sprite, frame) as well
+    cache.load_sheet('sheet.png', ['walk1', 'walk2'])
+    sheet = cache.sheet_frames['walk1'][0]
+    cut = []
+    sheet.frame = lambda master, index: cut.append(index) or ('frame', index)
+    assert cache.get('walk1') == ('frame', 0)
+    assert cache.get('walk2') == ('frame', 1)
+    assert cache.get('walk2') == ('frame', 1)
+    assert cut == [0, 1]
+    assert len(cache.rasterized) == 3
+    assert cache.available()
+
+
+def test_without_pillow_sprites_fall_back_to_text():
+    """With no Pillow (or no display DPI) the cache reports no images and the renderer uses text"""
+    saved = sprite_cache.Image
+    sprite_cache.Image = None
+    try:
+        cache = SpriteCache(FakeRoot(dpi=None), PET_SPRITES)
+    finally:
+        sprite_cache.Image = saved
+    assert cache.scale == 1.0 and cache.font_path is None
+    assert cache.get('idle1') is None
+    assert not cache.available()
+
+    canvas = FakeCanvas()
+    texts = []
+    canvas.create_text = lambda x, y, **options: texts.append(options['text']) or len(texts)
+    renderer = TkCanvasRenderer(canvas, PET_SPRITES, sprite_cache=cache)
+    assert not renderer.use_images
+    renderer.add_pet(0, 10, 10, 'idle1')
+    renderer.set_sprite(0, 'sleep')
+    renderer.flush()
+    assert texts == ['🐱']
+    assert canvas.tk.calls[-1][-1] == (1, '-text', '😴')
+
+
+def main():
+    """Run all tests"""
+    print("=== Sprite Cache Test ===")
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
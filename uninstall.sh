@@ -9,6 +9,7 @@ PLIST_FILE="$LAUNCH_AGENTS_DIR/com.user.desktoppet.plist"
 
 # Stop any running pet processes
 echo "Stopping any running desktop pet processes..."
+python3 "$(dirname "$0")/petctl.py" quit &> /dev/null || true
 pkill -f "desktop_pet.py" 2>/dev/null || true
 
 # Unload the LaunchAgent
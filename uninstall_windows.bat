@@ -6,6 +6,7 @@ echo.
 
 REM Stop any running pet processes
 echo Stopping any running desktop pet processes...
+python "%~dp0petctl.py" quit >nul 2>&1
 taskkill /f /im python.exe /fi "WINDOWTITLE eq Desktop Pet*" >nul 2>&1
 taskkill /f /im pythonw.exe /fi "WINDOWTITLE eq Desktop Pet*" >nul 2>&1
 